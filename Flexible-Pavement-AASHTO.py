@@ -1,173 +1,21 @@
 import streamlit as st
 import numpy as np
-import math
 import pandas as pd
 
-
-# ==========================================
-# ฐานข้อมูลวัสดุชั้นทาง (ตามมาตรฐานกรมทางหลวง)
-# ==========================================
-
-MATERIAL_DATABASE = {
-    # ชั้นผิวทาง (Surface Course)
-    "surface": {
-        "ผิวทางลาดยาง AC": {"a": 0.40, "m": 1.00, "MR_psi": 362500, "MR_MPa": 2500},
-        "ผิวทางลาดยาง PMA": {"a": 0.40, "m": 1.00, "MR_psi": 536500, "MR_MPa": 3700},
-    },
-    # ชั้นพื้นทาง (Base Course)
-    "base": {
-        "พื้นทางซีเมนต์ CTB": {"a": 0.15, "m": 1.00, "MR_psi": 174000, "MR_MPa": 1200},
-        "พื้นทางหินคลุกผสมซีเมนต์ UCS 24.5 ksc": {"a": 0.15, "m": 1.00, "MR_psi": 123250, "MR_MPa": 850},
-        "พื้นทางหินคลุก CBR 80%": {"a": 0.13, "m": 1.00, "MR_psi": 50750, "MR_MPa": 350},
-        "พื้นทางดินซีเมนต์ UCS 17.5 ksc": {"a": 0.13, "m": 1.00, "MR_psi": 50750, "MR_MPa": 350},
-        "พื้นทางวัสดุหมุนเวียน (Recycling)": {"a": 0.15, "m": 1.00, "MR_psi": 123250, "MR_MPa": 850},
-    },
-    # ชั้นรองพื้นทาง (Subbase Course)
-    "subbase": {
-        "รองพื้นทางวัสดุมวลรวม CBR 25%": {"a": 0.10, "m": 1.00, "MR_psi": 21750, "MR_MPa": 150},
-        "วัสดุคัดเลือก ก": {"a": 0.08, "m": 1.00, "MR_psi": 11020, "MR_MPa": 76},
-    },
-    # ดินฐานราก (Subgrade)
-    "subgrade": {
-        "ดินถมคันทาง/ดินเดิม (CBR 6%)": {"MR_psi": 14939, "MR_MPa": 103, "CBR": 6},
-        "ดินเหนียวอ่อน (CBR 3%)": {"MR_psi": 4500, "MR_MPa": 31, "CBR": 3},
-        "ดินเหนียวปานกลาง (CBR 5%)": {"MR_psi": 7500, "MR_MPa": 52, "CBR": 5},
-        "ดินทรายปนดินเหนียว (CBR 10%)": {"MR_psi": 15000, "MR_MPa": 103, "CBR": 10},
-        "ดินทราย (CBR 15%)": {"MR_psi": 19673, "MR_MPa": 136, "CBR": 15},
-        "กรวดปนทราย (CBR 20%)": {"MR_psi": 23604, "MR_MPa": 163, "CBR": 20},
-    }
-}
-
-
-def cm_to_inch(cm):
-    """แปลงเซนติเมตรเป็นนิ้ว"""
-    return cm / 2.54
-
-
-def inch_to_cm(inch):
-    """แปลงนิ้วเป็นเซนติเมตร"""
-    return inch * 2.54
-
-
-def bisection_method(func, a, b, tol=1e-6, max_iter=100):
-    """
-    Bisection Method สำหรับหาค่า root ของฟังก์ชัน
-    """
-    fa = func(a)
-    fb = func(b)
-    
-    if fa * fb > 0:
-        return None
-    
-    for _ in range(max_iter):
-        c = (a + b) / 2
-        fc = func(c)
-        
-        if abs(fc) < tol or (b - a) / 2 < tol:
-            return c
-        
-        if fa * fc < 0:
-            b = c
-            fb = fc
-        else:
-            a = c
-            fa = fc
-    
-    return (a + b) / 2
-
-
-def calculate_MR_from_CBR(CBR):
-    """
-    คำนวณ Resilient Modulus (MR) จากค่า CBR
-    สูตร: MR (psi) = 1500 × CBR (สำหรับ CBR ≤ 10)
-           MR (psi) = 3000 × CBR^0.65 (สำหรับ CBR > 10)
-    """
-    if CBR <= 10:
-        return 1500 * CBR
-    else:
-        return 3000 * (CBR ** 0.65)
-
-
-def calculate_log_W18_flexible(SN, params):
-    """
-    คำนวณ log₁₀(W₁₈) ตามสมการ AASHTO 1993 สำหรับ Flexible Pavement
-    
-    สมการ:
-    log W₁₈ = ZR×S₀ + 9.36×log(SN+1) - 0.20 
-            + log[ΔPSI/(4.2-1.5)] / [0.40 + 1094/(SN+1)^5.19]
-            + 2.32×log(MR) - 8.07
-    """
-    ZR = params['ZR']
-    S0 = params['S0']
-    MR = params['MR']
-    delta_PSI = params['delta_PSI']
-    
-    if SN <= 0:
-        return -999
-    
-    term1 = ZR * S0
-    term2 = 9.36 * math.log10(SN + 1) - 0.20
-    numerator3 = math.log10(delta_PSI / 2.7)
-    denominator3 = 0.40 + 1094 / ((SN + 1) ** 5.19)
-    term3 = numerator3 / denominator3
-    term4 = 2.32 * math.log10(MR) - 8.07
-    
-    log_W18 = term1 + term2 + term3 + term4
-    
-    return log_W18
-
-
-def find_required_SN(W18_design, params, SN_min=1, SN_max=15):
-    """
-    หาค่า Structural Number (SN) ที่ต้องการ
-    """
-    log_W18_design = math.log10(W18_design)
-    
-    def objective(SN):
-        return calculate_log_W18_flexible(SN, params) - log_W18_design
-    
-    try:
-        f_min = objective(SN_min)
-        f_max = objective(SN_max)
-        
-        if f_min > 0:
-            return SN_min
-        if f_max < 0:
-            return SN_max + 1
-        
-        SN_required = bisection_method(objective, SN_min, SN_max)
-        return SN_required
-    except:
-        return None
-
-
-def calculate_SN(layers):
-    """
-    คำนวณ Structural Number จากชั้นโครงสร้าง
-    SN = Σ(aᵢ × Dᵢ × mᵢ)
-    """
-    SN = 0
-    details = []
-    
-    for i, layer in enumerate(layers):
-        a = layer.get('a', 0)
-        D_inch = layer.get('D_inch', 0)
-        m = layer.get('m', 1.0)
-        
-        SN_layer = a * D_inch * m
-        SN += SN_layer
-        
-        details.append({
-            'layer': i + 1,
-            'name': layer.get('name', f'Layer {i+1}'),
-            'a': a,
-            'D_inch': D_inch,
-            'D_cm': D_inch * 2.54,
-            'm': m,
-            'SN_layer': SN_layer,
-        })
-    
-    return SN, details
+from flexible_engine import (
+    MATERIAL_DATABASE,
+    cm_to_inch,
+    calculate_MR_from_CBR,
+    calculate_log_W18_flexible,
+    calculate_log_W18_flexible_array,
+    find_required_SN,
+    calculate_SN,
+    generate_capacity_curve,
+    DRAINAGE_QUALITIES,
+    get_drainage_coefficient_array,
+)
+from flexible_layered import check_layered_design, enumerate_material_combinations
+from flexible_seasonal import calculate_effective_MR_array
 
 
 # ==========================================
@@ -254,6 +102,27 @@ pt = st.sidebar.slider(
 )
 delta_PSI = Pi - pt
 
+# Drainage Coefficient
+st.sidebar.subheader("💧 Drainage Coefficient (m)")
+use_drainage_table = st.sidebar.checkbox(
+    "คำนวณ m₂, m₃ จากคุณภาพการระบายน้ำ",
+    value=False,
+    help="AASHTO 1993 Table 2.4: คุณภาพการระบายน้ำ × % เวลาที่โครงสร้างชั้นทางมีความชื้นใกล้อิ่มตัว"
+)
+if use_drainage_table:
+    drainage_quality = st.sidebar.selectbox(
+        "คุณภาพการระบายน้ำ (Quality of Drainage)",
+        options=list(DRAINAGE_QUALITIES),
+        index=1
+    )
+    percent_saturation = st.sidebar.slider(
+        "% เวลาที่ใกล้อิ่มตัว",
+        min_value=0.0, max_value=50.0, value=5.0, step=0.5,
+        help="ร้อยละของเวลาในหนึ่งปีที่โครงสร้างชั้นทางมีความชื้นใกล้ภาวะอิ่มตัว"
+    )
+    m_drainage = float(get_drainage_coefficient_array(drainage_quality, percent_saturation))
+    st.sidebar.caption(f"m₂ = m₃ = {m_drainage:.3f}")
+
 # ==========================================
 # Main Content
 # ==========================================
@@ -380,12 +249,19 @@ with base_col3:
     )
 
 with base_col4:
-    m2 = st.number_input(
-        "m₂",
-        min_value=0.50, max_value=1.50, value=base_props["m"], step=0.05,
-        key="m2",
-        help="Drainage Coefficient"
-    )
+    if use_drainage_table:
+        m2 = st.number_input(
+            "m₂",
+            value=m_drainage, format="%.3f", disabled=True,
+            help="Drainage Coefficient จาก AASHTO Table 2.4"
+        )
+    else:
+        m2 = st.number_input(
+            "m₂",
+            min_value=0.50, max_value=1.50, value=base_props["m"], step=0.05,
+            key="m2",
+            help="Drainage Coefficient"
+        )
 
 st.caption(f"📋 {base_material}: a = {base_props['a']}, MR = {base_props['MR_psi']:,} psi ({base_props['MR_MPa']:,} MPa)")
 
@@ -424,12 +300,19 @@ with subbase_col3:
     )
 
 with subbase_col4:
-    m3 = st.number_input(
-        "m₃",
-        min_value=0.50, max_value=1.50, value=subbase_props["m"], step=0.05,
-        key="m3",
-        help="Drainage Coefficient"
-    )
+    if use_drainage_table:
+        m3 = st.number_input(
+            "m₃",
+            value=m_drainage, format="%.3f", disabled=True,
+            help="Drainage Coefficient จาก AASHTO Table 2.4"
+        )
+    else:
+        m3 = st.number_input(
+            "m₃",
+            min_value=0.50, max_value=1.50, value=subbase_props["m"], step=0.05,
+            key="m3",
+            help="Drainage Coefficient"
+        )
 
 st.caption(f"📋 {subbase_material}: a = {subbase_props['a']}, MR = {subbase_props['MR_psi']:,} psi ({subbase_props['MR_MPa']:,} MPa)")
 
@@ -443,7 +326,7 @@ subgrade_col1, subgrade_col2 = st.columns([2, 2])
 with subgrade_col1:
     subgrade_method = st.radio(
         "วิธีการกำหนดค่า MR",
-        ["เลือกจากฐานข้อมูล", "กรอกค่า CBR", "กรอก MR โดยตรง"],
+        ["เลือกจากฐานข้อมูล", "กรอกค่า CBR", "กรอก MR โดยตรง", "MR รายเดือน (Effective MR)"],
         horizontal=True
     )
 
@@ -467,6 +350,21 @@ with subgrade_col2:
         )
         MR_subgrade = calculate_MR_from_CBR(CBR_display)
         
+    elif subgrade_method == "MR รายเดือน (Effective MR)":
+        df_monthly = st.data_editor(
+            pd.DataFrame({
+                "เดือน": [f"{i+1}" for i in range(12)],
+                "MR (psi)": [14939.0] * 12,
+            }),
+            hide_index=True,
+            disabled=["เดือน"],
+            key="MR_monthly"
+        )
+        MR_subgrade, u_f_mean = calculate_effective_MR_array(df_monthly["MR (psi)"].to_numpy())
+        MR_subgrade = float(MR_subgrade)
+        st.caption(f"ū_f = {u_f_mean:.4f} → Effective MR = {MR_subgrade:,.0f} psi")
+        CBR_display = MR_subgrade / 1500 if MR_subgrade <= 15000 else (MR_subgrade / 3000) ** (1/0.65)
+        
     else:  # กรอก MR โดยตรง
         MR_subgrade = st.number_input(
             "Resilient Modulus - MR (psi)",
@@ -600,47 +498,86 @@ if st.button("🔢 คำนวณ Structural Number และตรวจสอ
             st.warning(f"⚠️ ต้องเพิ่ม SN อีก **{SN_deficit:.3f}** โดยการเพิ่มความหนาหรือเปลี่ยนวัสดุ")
         
         # ========================
-        # ตารางเปรียบเทียบ SN ต่างๆ
+        # ตรวจสอบตามลำดับชั้น (Layered Design)
         # ========================
         st.markdown("---")
-        st.subheader("📊 วิเคราะห์เปรียบเทียบ W₁₈ สำหรับค่า SN ต่างๆ")
+        st.subheader("🧮 ตรวจสอบตามลำดับชั้น (Layered Design: SN₁ / SN₂ / SN₃)")
         
-        SN_options = [3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+        layer_checks = check_layered_design(
+            W18_input, params, layers, base_props["MR_psi"], subbase_props["MR_psi"]
+        )
         
-        comparison_data = []
-        for SN_test in SN_options:
-            log_W18_test = calculate_log_W18_flexible(SN_test, params)
-            W18_test = 10 ** log_W18_test
-            ratio = W18_test / W18_input
-            margin_pct = (ratio - 1) * 100
-            status = "✅ เพียงพอ" if W18_test >= W18_input else "❌ ไม่เพียงพอ"
-            
-            comparison_data.append({
-                "SN": SN_test,
-                "log₁₀(W₁₈)": f"{log_W18_test:.4f}",
-                "W₁₈ รองรับได้ (ESAL)": f"{W18_test:,.0f}",
-                "W₁₈ (ล้าน)": f"{W18_test/1e6:.2f}",
-                "อัตราส่วน": f"{ratio:.2f}",
-                "ส่วนเผื่อ (%)": f"{margin_pct:+.1f}%",
-                "สถานะ": status,
-                "W18_raw": W18_test,
+        layered_data = []
+        for c in layer_checks:
+            layered_data.append({
+                "ตรวจสอบ": f"SN{c['layer']} เหนือชั้นที่ MR = {c['MR_below']:,.0f} psi",
+                "SN ที่ต้องการ": f"{c['SN_required']:.3f}" if c['SN_required'] is not None else "-",
+                "SN สะสมที่ได้": f"{c['SN_provided']:.3f}",
+                "สถานะ": "✅ ผ่าน" if c['passed'] else "❌ ไม่ผ่าน",
             })
+        st.dataframe(pd.DataFrame(layered_data), use_container_width=True, hide_index=True)
+        
+        with st.expander("📋 ความหนาต่ำสุดตามลำดับชั้น สำหรับทุกชุดวัสดุในฐานข้อมูล"):
+            # ใช้ m₂, m₃ จากตารางการระบายน้ำกับทุกชุดวัสดุ เมื่อเลือกคำนวณจากคุณภาพการระบายน้ำ
+            df_catalogue = enumerate_material_combinations(
+                W18_input, params, m=(None, m_drainage, m_drainage) if use_drainage_table else None
+            )
+            st.dataframe(
+                df_catalogue[["surface", "base", "subbase", "SN1", "SN2", "SN3",
+                              "D1_cm", "D2_cm", "D3_cm", "total_cm"]],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "surface": st.column_config.TextColumn("ผิวทาง"),
+                    "base": st.column_config.TextColumn("พื้นทาง"),
+                    "subbase": st.column_config.TextColumn("รองพื้นทาง"),
+                    "SN1": st.column_config.NumberColumn("SN₁", format="%.3f"),
+                    "SN2": st.column_config.NumberColumn("SN₂", format="%.3f"),
+                    "SN3": st.column_config.NumberColumn("SN₃", format="%.3f"),
+                    "D1_cm": st.column_config.NumberColumn("D₁ (ซม.)", format="%.0f"),
+                    "D2_cm": st.column_config.NumberColumn("D₂ (ซม.)", format="%.0f"),
+                    "D3_cm": st.column_config.NumberColumn("D₃ (ซม.)", format="%.0f"),
+                    "total_cm": st.column_config.NumberColumn("รวม (ซม.)", format="%.0f"),
+                }
+            )
         
-        df_comparison = pd.DataFrame(comparison_data)
-        df_display = df_comparison[["SN", "log₁₀(W₁₈)", "W₁₈ รองรับได้ (ESAL)", "W₁₈ (ล้าน)", "อัตราส่วน", "ส่วนเผื่อ (%)", "สถานะ"]]
+        # ========================
+        # ตารางเปรียบเทียบ SN ต่างๆ
+        # ========================
+        st.markdown("---")
+        st.subheader("📊 วิเคราะห์เปรียบเทียบ W₁₈ สำหรับค่า SN ต่างๆ")
+        
+        SN_options = np.array([3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+        log_W18_options = calculate_log_W18_flexible_array(SN_options, ZR, S0, MR_subgrade, delta_PSI)
+        W18_options = 10 ** log_W18_options
+        ratio_options = W18_options / W18_input
+        
+        df_display = pd.DataFrame({
+            "SN": SN_options,
+            "log₁₀(W₁₈)": [f"{v:.4f}" for v in log_W18_options],
+            "W₁₈ รองรับได้ (ESAL)": [f"{v:,.0f}" for v in W18_options],
+            "W₁₈ (ล้าน)": [f"{v/1e6:.2f}" for v in W18_options],
+            "อัตราส่วน": [f"{v:.2f}" for v in ratio_options],
+            "ส่วนเผื่อ (%)": [f"{(v - 1) * 100:+.1f}%" for v in ratio_options],
+            "สถานะ": np.where(W18_options >= W18_input, "✅ เพียงพอ", "❌ ไม่เพียงพอ"),
+        })
         
         st.dataframe(df_display, use_container_width=True, hide_index=True)
         
-        # กราฟ
+        # กราฟเส้นโค้ง SN - W₁₈
         chart_col1, chart_col2 = st.columns([2, 1])
         
         with chart_col1:
+            curve = generate_capacity_curve(
+                W18_input, params, SN_range=(1.0, max(10.0, SN_provided + 1.0))
+            )
             chart_data = pd.DataFrame({
-                "SN": SN_options,
-                "W₁₈ (ล้าน ESAL)": [d["W18_raw"] / 1e6 for d in comparison_data],
+                "SN": curve["SN"],
+                "W₁₈ รองรับได้ (ล้าน ESAL)": curve["W18"] / 1e6,
+                "W₁₈ ออกแบบ (ล้าน ESAL)": W18_input / 1e6,
             })
-            st.bar_chart(chart_data.set_index("SN"), use_container_width=True)
-            st.caption(f"🔴 W₁₈ ออกแบบ = {W18_input/1e6:.2f} ล้าน ESAL | SN ที่ได้ = {SN_provided:.3f}")
+            st.line_chart(chart_data.set_index("SN"), use_container_width=True)
+            st.caption(f"🔴 W₁₈ ออกแบบ = {W18_input/1e6:.2f} ล้าน ESAL ตัดเส้นโค้งที่ SN = {SN_required:.3f} | SN ที่ได้ = {SN_provided:.3f}")
         
         with chart_col2:
             st.markdown("**สรุปผล:**")
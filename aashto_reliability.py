@@ -0,0 +1,28 @@
+"""
+AASHTO 1993 Pavement Design - Reliability
+ค่า ZR (Standard Normal Deviate) ตามระดับความเชื่อมั่น ใช้ร่วมกันทั้ง Flexible และ Rigid Pavement
+"""
+
+import numpy as np
+
+
+# ==========================================
+# ตารางค่า ZR (Standard Normal Deviate) ตามระดับความเชื่อมั่น
+# ==========================================
+
+ZR_TABLE = {
+    50: -0.000, 60: -0.253, 70: -0.524, 75: -0.674,
+    80: -0.841, 85: -1.037, 90: -1.282, 91: -1.340,
+    92: -1.405, 93: -1.476, 94: -1.555, 95: -1.645,
+    96: -1.751, 97: -1.881, 98: -2.054, 99: -2.327
+}
+
+
+def get_ZR_array(reliability):
+    """
+    หาค่า ZR จากระดับความเชื่อมั่น (%) แบบ Vectorized
+    ใช้ linear interpolation ระหว่างค่าในตาราง ZR_TABLE (ระดับที่อยู่ในตารางได้ค่าในตารางพอดี)
+    """
+    levels = np.array(sorted(ZR_TABLE), dtype=float)
+    values = np.array([ZR_TABLE[level] for level in sorted(ZR_TABLE)])
+    return np.interp(np.asarray(reliability, dtype=float), levels, values)
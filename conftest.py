@@ -0,0 +1 @@
+"""pytest: ให้ tests/ import โมดูลในโฟลเดอร์หลักของโปรแกรมได้"""
@@ -0,0 +1,208 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Batch CLI
+ตรวจสอบโครงสร้างชั้นทางแบบยืดหยุ่นของสายทางจำนวนมากจากไฟล์ CSV
+
+คอลัมน์ที่ต้องมีในไฟล์ input:
+    W18, reliability (%), S0, Pi, pt, MR (psi)
+    a1, D1_cm, m1, a2, D2_cm, m2, ... (m_i ไม่บังคับ ค่าเริ่มต้น 1.00)
+    แทน m_i ด้วย drainage_i (Excellent ... Very Poor) และ saturation_i (% เวลาที่ใกล้อิ่มตัว)
+    เพื่อคำนวณ m_i จากตาราง AASHTO ได้
+    สามารถใช้คอลัมน์ ZR แทน reliability ได้
+    แทนคอลัมน์ MR ด้วยค่าตามฤดูกาล MR_1 ... MR_12 (หรือ CBR_1 ... CBR_24) ได้
+    โปรแกรมจะคำนวณ MR ประสิทธิผลให้ (คอลัมน์ MR_eff)
+
+โหมดออกแบบชั้นเสริมผิว (--overlay): ข้อมูลสำรวจสภาพทางเดิม
+    W18 คือจราจรในอนาคต, ชั้นทางเดิม a1, D1_cm, m1, CF1, ... (CF_i = ตัวคูณลดค่า a ตามสภาพ
+    ไม่บังคับ ค่าเริ่มต้น 1.00) และคอลัมน์ a_ol (ไม่บังคับ ค่าเริ่มต้น 0.40)
+
+ตัวอย่าง:
+    python flexible_batch.py sections.csv results.csv --chunksize 200000
+    python flexible_batch.py survey.csv overlay.csv --overlay
+"""
+
+import argparse
+import re
+
+import numpy as np
+import pandas as pd
+
+from flexible_engine import (
+    cm_to_inch,
+    get_ZR_array,
+    find_required_SN_array,
+    lookup_required_SN_array,
+    calculate_SN_array,
+    get_drainage_coefficient_array,
+)
+from flexible_overlay import DEFAULT_OVERLAY_A, calculate_effective_SN_array, design_overlay_array
+from flexible_seasonal import calculate_effective_MR_frame
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def get_layer_numbers(columns):
+    """หาหมายเลขชั้นทางจากคอลัมน์ D1_cm, D2_cm, ..."""
+    numbers = [int(m.group(1)) for m in (re.fullmatch(r"D(\d+)_cm", c) for c in columns) if m]
+    return sorted(numbers)
+
+
+def _get_optional_column(df, name, default):
+    """คอลัมน์ที่ไม่บังคับ (ใช้ค่า default เมื่อไม่มีคอลัมน์)"""
+    return df[name].to_numpy(dtype=float) if name in df.columns else np.full(len(df), default)
+
+
+def _get_drainage_coefficient(df, i):
+    """m ของชั้นที่ i: คอลัมน์ m{i} หรือคำนวณจาก drainage_{i} และ saturation_{i}"""
+    if f"m{i}" not in df.columns and f"drainage_{i}" in df.columns:
+        return get_drainage_coefficient_array(
+            df[f"drainage_{i}"].to_numpy(), _get_optional_column(df, f"saturation_{i}", 0.0)
+        )
+    return _get_optional_column(df, f"m{i}", 1.0)
+
+
+def _get_layer_arrays(df):
+    """อ่าน a, D (นิ้ว), m และ CF ของทุกชั้นเป็น array รูปร่าง (แถว, ชั้น)"""
+    layer_numbers = get_layer_numbers(df.columns)
+    if not layer_numbers:
+        raise ValueError("ไม่พบคอลัมน์ความหนาชั้นทาง (D1_cm, D2_cm, ...)")
+
+    a = np.column_stack([df[f"a{i}"].to_numpy(dtype=float) for i in layer_numbers])
+    D_inch = cm_to_inch(np.column_stack([df[f"D{i}_cm"].to_numpy(dtype=float) for i in layer_numbers]))
+    m = np.column_stack([_get_drainage_coefficient(df, i) for i in layer_numbers])
+    CF = np.column_stack([_get_optional_column(df, f"CF{i}", 1.0) for i in layer_numbers])
+    return a, D_inch, m, CF
+
+
+def _get_design_inputs(df, result):
+    """อ่าน W18, ZR, S0, MR, ΔPSI (เพิ่มคอลัมน์ MR_eff ใน result เมื่อใช้ MR ตามฤดูกาล)"""
+    if "ZR" in df.columns:
+        ZR = df["ZR"].to_numpy(dtype=float)
+    else:
+        ZR = get_ZR_array(df["reliability"].to_numpy(dtype=float))
+
+    delta_PSI = df["Pi"].to_numpy(dtype=float) - df["pt"].to_numpy(dtype=float)
+
+    if "MR" in df.columns:
+        MR = df["MR"].to_numpy(dtype=float)
+    else:
+        MR, _ = calculate_effective_MR_frame(df)
+        result["MR_eff"] = MR
+
+    return (
+        df["W18"].to_numpy(dtype=float),
+        ZR,
+        df["S0"].to_numpy(dtype=float),
+        MR,
+        delta_PSI,
+    )
+
+
+def evaluate_sections(df, use_grid=False):
+    """
+    คำนวณ SN ที่ต้องการ, SN ที่ได้ และผลการตรวจสอบของทุกแถวใน DataFrame
+    use_grid = True ใช้ตาราง SN ที่คำนวณไว้ล่วงหน้าแทนการแก้สมการโดยตรง
+
+    Returns:
+        DataFrame ใหม่ที่เพิ่มคอลัมน์ SN_required, SN_provided, converged, passed
+    """
+    a, D_inch, m, _ = _get_layer_arrays(df)
+
+    result = df.copy()
+    design_inputs = _get_design_inputs(df, result)
+    if use_grid:
+        SN_required, converged = lookup_required_SN_array(*design_inputs)
+    else:
+        SN_required, converged, _ = find_required_SN_array(*design_inputs)
+
+    SN_provided = calculate_SN_array(a, D_inch, m)
+
+    result["SN_required"] = SN_required
+    result["SN_provided"] = SN_provided
+    result["converged"] = converged
+    result["passed"] = converged & (SN_provided >= SN_required)
+    return result
+
+
+def evaluate_overlay_sections(df, use_grid=False):
+    """
+    ออกแบบชั้นเสริมผิว AC ของทุกแถวใน DataFrame (ข้อมูลสำรวจสภาพทางเดิม)
+
+    Returns:
+        DataFrame ใหม่ที่เพิ่มคอลัมน์ SN_f, SN_eff, SN_ol, D_ol_cm, converged
+    """
+    a, D_inch, m, CF = _get_layer_arrays(df)
+
+    result = df.copy()
+    design_inputs = _get_design_inputs(df, result)
+    SN_eff = calculate_effective_SN_array(a, D_inch, m, CF)
+    overlay = design_overlay_array(
+        *design_inputs, SN_eff, a_ol=_get_optional_column(df, "a_ol", DEFAULT_OVERLAY_A),
+        use_grid=use_grid
+    )
+
+    result["SN_f"] = overlay["SN_f"]
+    result["SN_eff"] = SN_eff
+    result["SN_ol"] = overlay["SN_ol"]
+    result["D_ol_cm"] = overlay["D_ol_cm"]
+    result["converged"] = overlay["converged"]
+    return result
+
+
+def run_batch(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, use_grid=False, overlay=False):
+    """
+    อ่านไฟล์ CSV ทีละ chunk คำนวณ และเขียนผลต่อท้ายไฟล์ output
+    ใช้หน่วยความจำตามขนาด chunk ไม่ขึ้นกับจำนวนแถวทั้งหมด
+    overlay = True ออกแบบชั้นเสริมผิวแทนการตรวจสอบโครงสร้าง
+
+    Returns:
+        tuple: (จำนวนแถวทั้งหมด, จำนวนแถวที่ผ่าน, จำนวนแถวที่หา SN ที่ต้องการไม่ได้)
+        โหมด overlay นับแถวที่โครงสร้างเดิมเพียงพอ (SN_ol = 0) เป็นแถวที่ผ่าน
+        แถวที่หา SN ไม่ได้ (converged = False) ไม่นับเป็นแถวที่ผ่านหรือแถวที่ต้องเสริมผิว
+    """
+    n_rows = 0
+    n_passed = 0
+    n_unconverged = 0
+
+    for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+        if overlay:
+            result = evaluate_overlay_sections(chunk, use_grid=use_grid)
+            passed = result["converged"] & (result["SN_ol"] == 0)
+        else:
+            result = evaluate_sections(chunk, use_grid=use_grid)
+            passed = result["passed"]
+        result.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        n_rows += len(result)
+        n_passed += int(passed.sum())
+        n_unconverged += int((~result["converged"]).sum())
+
+    return n_rows, n_passed, n_unconverged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AASHTO 1993 Flexible Pavement - batch SN check from CSV"
+    )
+    parser.add_argument("input", help="ไฟล์ CSV ข้อมูลสายทาง")
+    parser.add_argument("output", help="ไฟล์ CSV ผลการคำนวณ")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="จำนวนแถวต่อ chunk (ค่าเริ่มต้น %(default)s)")
+    parser.add_argument("--grid", action="store_true",
+                        help="ใช้ตาราง SN ที่คำนวณไว้ล่วงหน้า (เร็วกว่า คลาดเคลื่อน ≤ 3×10⁻⁴)")
+    parser.add_argument("--overlay", action="store_true",
+                        help="ออกแบบความหนาชั้นเสริมผิว AC จากข้อมูลสำรวจสภาพทางเดิม")
+    args = parser.parse_args(argv)
+
+    n_rows, n_passed, n_unconverged = run_batch(args.input, args.output, chunksize=args.chunksize,
+                                                use_grid=args.grid, overlay=args.overlay)
+    n_failed = n_rows - n_passed - n_unconverged
+    if args.overlay:
+        print(f"{n_rows:,} sections: {n_failed:,} need overlay, {n_passed:,} adequate, "
+              f"{n_unconverged:,} not converged -> {args.output}")
+    else:
+        print(f"{n_rows:,} sections: {n_passed:,} passed, {n_failed:,} failed, "
+              f"{n_unconverged:,} not converged -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Engine
+ฟังก์ชันคำนวณสำหรับการออกแบบโครงสร้างชั้นทางแบบยืดหยุ่น (ไม่ต้องใช้ Streamlit)
+
+ใช้ร่วมกันระหว่าง Flexible-Pavement-AASHTO.py และงานคำนวณแบบ batch
+"""
+
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# ตาราง ZR ใช้ร่วมกับ Rigid Pavement (import จาก flexible_engine ได้เช่นเดิม)
+from aashto_reliability import ZR_TABLE, get_ZR_array
+
+
+# ==========================================
+# ฐานข้อมูลวัสดุชั้นทาง (ตามมาตรฐานกรมทางหลวง)
+# ==========================================
+
+MATERIAL_DATABASE = {
+    # ชั้นผิวทาง (Surface Course)
+    "surface": {
+        "ผิวทางลาดยาง AC": {"a": 0.40, "m": 1.00, "MR_psi": 362500, "MR_MPa": 2500},
+        "ผิวทางลาดยาง PMA": {"a": 0.40, "m": 1.00, "MR_psi": 536500, "MR_MPa": 3700},
+    },
+    # ชั้นพื้นทาง (Base Course)
+    "base": {
+        "พื้นทางซีเมนต์ CTB": {"a": 0.15, "m": 1.00, "MR_psi": 174000, "MR_MPa": 1200},
+        "พื้นทางหินคลุกผสมซีเมนต์ UCS 24.5 ksc": {"a": 0.15, "m": 1.00, "MR_psi": 123250, "MR_MPa": 850},
+        "พื้นทางหินคลุก CBR 80%": {"a": 0.13, "m": 1.00, "MR_psi": 50750, "MR_MPa": 350},
+        "พื้นทางดินซีเมนต์ UCS 17.5 ksc": {"a": 0.13, "m": 1.00, "MR_psi": 50750, "MR_MPa": 350},
+        "พื้นทางวัสดุหมุนเวียน (Recycling)": {"a": 0.15, "m": 1.00, "MR_psi": 123250, "MR_MPa": 850},
+    },
+    # ชั้นรองพื้นทาง (Subbase Course)
+    "subbase": {
+        "รองพื้นทางวัสดุมวลรวม CBR 25%": {"a": 0.10, "m": 1.00, "MR_psi": 21750, "MR_MPa": 150},
+        "วัสดุคัดเลือก ก": {"a": 0.08, "m": 1.00, "MR_psi": 11020, "MR_MPa": 76},
+    },
+    # ดินฐานราก (Subgrade)
+    "subgrade": {
+        "ดินถมคันทาง/ดินเดิม (CBR 6%)": {"MR_psi": 14939, "MR_MPa": 103, "CBR": 6},
+        "ดินเหนียวอ่อน (CBR 3%)": {"MR_psi": 4500, "MR_MPa": 31, "CBR": 3},
+        "ดินเหนียวปานกลาง (CBR 5%)": {"MR_psi": 7500, "MR_MPa": 52, "CBR": 5},
+        "ดินทรายปนดินเหนียว (CBR 10%)": {"MR_psi": 15000, "MR_MPa": 103, "CBR": 10},
+        "ดินทราย (CBR 15%)": {"MR_psi": 19673, "MR_MPa": 136, "CBR": 15},
+        "กรวดปนทราย (CBR 20%)": {"MR_psi": 23604, "MR_MPa": 163, "CBR": 20},
+    }
+}
+
+
+# ==========================================
+# ค่าสัมประสิทธิ์การระบายน้ำ m (AASHTO 1993 Table 2.4)
+# ==========================================
+#
+# แถว: คุณภาพการระบายน้ำ, คอลัมน์: % เวลาที่โครงสร้างชั้นทางมีความชื้นใกล้อิ่มตัว
+# ค่าในตารางเป็นขอบของช่วงที่ AASHTO กำหนด (< 1%, 1-5%, 5-25%, > 25%) จึงประมาณค่าต่อเนื่องได้
+# ยกเว้นระดับ Fair ที่ 5% (ช่วงติดกันคือ 1.05 และ 1.00) ซึ่งใช้ค่าเฉลี่ย 1.025
+
+DRAINAGE_QUALITIES = ("Excellent", "Good", "Fair", "Poor", "Very Poor")
+
+DRAINAGE_SATURATION_PERCENT = np.array([0.0, 1.0, 5.0, 25.0])
+
+DRAINAGE_COEFFICIENT_TABLE = np.array([
+    [1.40, 1.35, 1.30, 1.20],   # Excellent
+    [1.35, 1.25, 1.15, 1.00],   # Good
+    [1.25, 1.15, 1.025, 0.80],  # Fair
+    [1.15, 1.05, 0.80, 0.60],   # Poor
+    [1.05, 0.95, 0.75, 0.40],   # Very Poor
+])
+
+
+def cm_to_inch(cm):
+    """แปลงเซนติเมตรเป็นนิ้ว"""
+    return cm / 2.54
+
+
+def inch_to_cm(inch):
+    """แปลงนิ้วเป็นเซนติเมตร"""
+    return inch * 2.54
+
+
+def bisection_method(func, a, b, tol=1e-6, max_iter=100):
+    """
+    Bisection Method สำหรับหาค่า root ของฟังก์ชัน
+    """
+    fa = func(a)
+    fb = func(b)
+    
+    if fa * fb > 0:
+        return None
+    
+    for _ in range(max_iter):
+        c = (a + b) / 2
+        fc = func(c)
+        
+        if abs(fc) < tol or (b - a) / 2 < tol:
+            return c
+        
+        if fa * fc < 0:
+            b = c
+            fb = fc
+        else:
+            a = c
+            fa = fc
+    
+    return (a + b) / 2
+
+
+def get_drainage_quality_index(drainage_quality):
+    """
+    แปลงคุณภาพการระบายน้ำเป็นดัชนีแถวของตาราง (0 = Excellent ... 4 = Very Poor)
+    รับชื่อตาม DRAINAGE_QUALITIES หรือตัวเลขดัชนี (ทศนิยมได้ เพื่อประมาณค่าระหว่างระดับ)
+    """
+    quality = np.asarray(drainage_quality)
+    if quality.dtype.kind not in "USO":
+        return quality.astype(float)
+
+    names, inverse = np.unique(quality, return_inverse=True)
+    unknown = set(names.tolist()) - set(DRAINAGE_QUALITIES)
+    if unknown:
+        raise ValueError(f"ไม่รู้จักคุณภาพการระบายน้ำ {sorted(unknown)}")
+    index = np.array([DRAINAGE_QUALITIES.index(name) for name in names], dtype=float)
+    return index[inverse].reshape(quality.shape)
+
+
+def get_drainage_coefficient_array(drainage_quality, percent_saturation):
+    """
+    หาค่า Drainage Coefficient (m) แบบ Vectorized จากตาราง DRAINAGE_COEFFICIENT_TABLE
+    ใช้ bilinear interpolation ตามคุณภาพการระบายน้ำและ % เวลาที่ใกล้อิ่มตัว (> 25% ใช้ค่าที่ 25%)
+    """
+    row = np.clip(get_drainage_quality_index(drainage_quality), 0, len(DRAINAGE_QUALITIES) - 1)
+    col = np.interp(np.asarray(percent_saturation, dtype=float), DRAINAGE_SATURATION_PERCENT,
+                    np.arange(DRAINAGE_SATURATION_PERCENT.size, dtype=float))
+    row, col = np.broadcast_arrays(row, col)
+
+    r0 = np.minimum(np.floor(row).astype(int), DRAINAGE_COEFFICIENT_TABLE.shape[0] - 2)
+    c0 = np.minimum(np.floor(col).astype(int), DRAINAGE_COEFFICIENT_TABLE.shape[1] - 2)
+    tr, tc = row - r0, col - c0
+    table = DRAINAGE_COEFFICIENT_TABLE
+    return ((1 - tr) * (1 - tc) * table[r0, c0] + (1 - tr) * tc * table[r0, c0 + 1]
+            + tr * (1 - tc) * table[r0 + 1, c0] + tr * tc * table[r0 + 1, c0 + 1])
+
+
+def calculate_MR_from_CBR(CBR):
+    """
+    คำนวณ Resilient Modulus (MR) จากค่า CBR
+    สูตร: MR (psi) = 1500 × CBR (สำหรับ CBR ≤ 10)
+           MR (psi) = 3000 × CBR^0.65 (สำหรับ CBR > 10)
+    """
+    if CBR <= 10:
+        return 1500 * CBR
+    else:
+        return 3000 * (CBR ** 0.65)
+
+
+def calculate_MR_from_CBR_array(CBR):
+    """คำนวณ MR (psi) จาก CBR แบบ Vectorized (สูตรเดียวกับ calculate_MR_from_CBR)"""
+    CBR = np.asarray(CBR, dtype=float)
+    with np.errstate(invalid='ignore'):
+        return np.where(CBR <= 10, 1500 * CBR, 3000 * np.abs(CBR) ** 0.65)
+
+
+def calculate_log_W18_flexible_array(SN, ZR, S0, MR, delta_PSI):
+    """
+    คำนวณ log₁₀(W₁₈) แบบ Vectorized (NumPy) ตามสมการ AASHTO 1993
+    
+    รับค่า SN, ZR, S0, MR, ΔPSI เป็น array หรือ scalar ที่ broadcast กันได้
+    ตำแหน่งที่อยู่นอกโดเมนของสมการ (SN ≤ 0, MR ≤ 0, ΔPSI ≤ 0) จะได้ค่า NaN
+    """
+    SN, ZR, S0, MR, delta_PSI = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (SN, ZR, S0, MR, delta_PSI))
+    )
+    valid = (SN > 0) & (MR > 0) & (delta_PSI > 0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        SN_plus_1 = SN + 1
+        term1 = ZR * S0
+        term2 = 9.36 * np.log10(SN_plus_1) - 0.20
+        term3 = np.log10(delta_PSI / 2.7) / (0.40 + 1094 / SN_plus_1 ** 5.19)
+        term4 = 2.32 * np.log10(MR) - 8.07
+        log_W18 = term1 + term2 + term3 + term4
+    
+    return np.where(valid, log_W18, np.nan)
+
+
+def calculate_log_W18_flexible(SN, params):
+    """
+    คำนวณ log₁₀(W₁₈) ตามสมการ AASHTO 1993 สำหรับ Flexible Pavement
+    
+    สมการ:
+    log W₁₈ = ZR×S₀ + 9.36×log(SN+1) - 0.20 
+            + log[ΔPSI/(4.2-1.5)] / [0.40 + 1094/(SN+1)^5.19]
+            + 2.32×log(MR) - 8.07
+    
+    เป็น wrapper ของ calculate_log_W18_flexible_array สำหรับค่าเดี่ยว
+    คืนค่า -999 เมื่ออยู่นอกโดเมนของสมการ
+    """
+    log_W18 = float(calculate_log_W18_flexible_array(
+        SN, params['ZR'], params['S0'], params['MR'], params['delta_PSI']
+    ))
+    
+    if math.isnan(log_W18):
+        return -999
+    
+    return log_W18
+
+
+def calculate_dlog_W18_dSN_flexible_array(SN, delta_PSI):
+    """
+    อนุพันธ์ d(log₁₀W₁₈)/d(SN) ของสมการ Flexible แบบ Vectorized
+    
+    ZR×S₀ และ MR เป็นค่าคงที่เทียบกับ SN จึงไม่อยู่ในอนุพันธ์
+    d/dSN = 9.36/[(SN+1)·ln10] + log[ΔPSI/2.7] × 5677.86·(SN+1)^-6.19 / [0.40 + 1094/(SN+1)^5.19]²
+    """
+    SN, delta_PSI = np.broadcast_arrays(
+        np.asarray(SN, dtype=float), np.asarray(delta_PSI, dtype=float)
+    )
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        SN_plus_1 = SN + 1
+        denominator3 = 0.40 + 1094 / SN_plus_1 ** 5.19
+        d_term2 = 9.36 / (SN_plus_1 * math.log(10))
+        d_term3 = np.log10(delta_PSI / 2.7) * (5.19 * 1094) / (SN_plus_1 ** 6.19 * denominator3 ** 2)
+    
+    return d_term2 + d_term3
+
+
+def find_required_SN_array(W18_design, ZR, S0, MR, delta_PSI, SN_min=1, SN_max=15,
+                           tol=1e-6, max_iter=50):
+    """
+    หาค่า SN ที่ต้องการสำหรับหลายกรณีพร้อมกัน (Safeguarded Newton + Bisection)
+    
+    ใช้อนุพันธ์เชิงวิเคราะห์ของสมการ Flexible ทำ Newton step ภายในช่วง [SN_lo, SN_hi]
+    ที่คร่อมราก ถ้า step ออกนอกช่วงจะใช้จุดกึ่งกลางแทน
+    
+    Returns:
+        tuple: (SN, converged, iterations)
+        - SN ที่ต้องการ (ถ้า W₁₈ ต่ำกว่าที่ SN_min รองรับได้จะได้ SN_min)
+        - converged = False เมื่อต้องการ SN เกิน SN_max หรือพารามิเตอร์ไม่ถูกต้อง (SN = NaN)
+        - จำนวนรอบที่ใช้ของแต่ละกรณี
+    """
+    W18_design, ZR, S0, MR, delta_PSI = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (W18_design, ZR, S0, MR, delta_PSI))
+    )
+    shape = W18_design.shape
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_W18_design = np.log10(W18_design).ravel()
+    ZR_S0 = (ZR * S0).ravel()
+    MR = MR.ravel()
+    delta_PSI = delta_PSI.ravel()
+    
+    def objective(SN, idx):
+        return calculate_log_W18_flexible_array(
+            SN, ZR_S0[idx], 1.0, MR[idx], delta_PSI[idx]
+        ) - log_W18_design[idx]
+    
+    n = log_W18_design.size
+    all_idx = np.arange(n)
+    SN = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=int)
+    
+    f_min = objective(np.full(n, float(SN_min)), all_idx)
+    f_max = objective(np.full(n, float(SN_max)), all_idx)
+    
+    below_range = f_min >= 0
+    SN[below_range] = SN_min
+    converged[below_range] = True
+    
+    # เฉพาะกรณีที่รากอยู่ในช่วง [SN_min, SN_max]
+    idx = np.flatnonzero((f_min < 0) & (f_max >= 0))
+    SN_lo = np.full(idx.size, float(SN_min))
+    SN_hi = np.full(idx.size, float(SN_max))
+    # จุดเริ่มต้นจาก linear interpolation ระหว่างขอบช่วง
+    SN_k = SN_min - f_min[idx] * (SN_max - SN_min) / (f_max[idx] - f_min[idx])
+    
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        
+        f_k = objective(SN_k, idx)
+        df_k = calculate_dlog_W18_dSN_flexible_array(SN_k, delta_PSI[idx])
+        iterations[idx] += 1
+        
+        SN_lo = np.where(f_k < 0, SN_k, SN_lo)
+        SN_hi = np.where(f_k < 0, SN_hi, SN_k)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            SN_next = SN_k - f_k / df_k
+        use_bisection = ~((SN_next >= SN_lo) & (SN_next <= SN_hi))
+        SN_next = np.where(use_bisection, (SN_lo + SN_hi) / 2, SN_next)
+        SN_next = np.where(f_k == 0, SN_k, SN_next)
+        
+        done = (np.abs(SN_next - SN_k) < tol) | (SN_hi - SN_lo < tol) | (f_k == 0)
+        SN[idx[done]] = SN_next[done]
+        converged[idx[done]] = True
+        
+        keep = ~done
+        idx, SN_k, SN_lo, SN_hi = idx[keep], SN_next[keep], SN_lo[keep], SN_hi[keep]
+    
+    return SN.reshape(shape), converged.reshape(shape), iterations.reshape(shape)
+
+
+# ==========================================
+# ตาราง SN ที่ต้องการซึ่งคำนวณไว้ล่วงหน้า (Precomputed SN Grid)
+# ==========================================
+#
+# สมการ Flexible เขียนใหม่ได้เป็น
+#     g(SN, L) = log W₁₈ - ZR×S₀ - 2.32×log(MR) + 8.07 = y
+# โดย L = log[ΔPSI/2.7] ดังนั้น SN ที่ต้องการขึ้นกับตัวแปร 2 ตัว (y, L) เท่านั้น
+# ตาราง 2 มิติบนแกน y และ L จึงครอบคลุมทุกชุดของ log W₁₈, ZR×S₀, ΔPSI และ log MR
+#
+# ช่วงตาราง: y = 0 ถึง 12, ΔPSI = 0.5 ถึง 3.5 (SN ประมาณ 0.05 ถึง 20)
+# ความคลาดเคลื่อนของ bilinear interpolation เทียบกับการแก้สมการโดยตรง ≤ 3×10⁻⁴ (SN)
+# ค่าที่วัดได้จริงตอนสร้างตารางเก็บไว้ใน grid['max_error']
+#
+# สร้างไฟล์ใหม่: save_SN_grid(build_SN_grid())
+
+SN_GRID_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flexible_sn_grid.npz")
+
+# SN สูงสุดที่เก็บในตาราง (ค่าที่เกินกว่านี้เก็บเป็น NaN และใช้การแก้สมการโดยตรงแทน)
+SN_GRID_CAP = 20.0
+
+
+def _reduced_log_W18(W18_design, ZR, S0, MR):
+    """y = log W₁₈ - ZR×S₀ - 2.32×log(MR) + 8.07"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log10(W18_design) - ZR * S0 - 2.32 * np.log10(MR) + 8.07
+
+
+def build_SN_grid(y_range=(0.0, 12.0), delta_PSI_range=(0.5, 3.5), n_y=1201, n_L=81):
+    """
+    สร้างตาราง SN บนแกน y และ L = log[ΔPSI/2.7] ด้วย find_required_SN_array
+    และวัดความคลาดเคลื่อนสูงสุดของ bilinear interpolation ที่จุดกึ่งกลางของทุก cell
+    """
+    y = np.linspace(y_range[0], y_range[1], n_y)
+    L = np.linspace(math.log10(delta_PSI_range[0] / 2.7), math.log10(delta_PSI_range[1] / 2.7), n_L)
+    
+    # MR ที่ทำให้ 2.32×log(MR) - 8.07 = 0 เพื่อให้ W₁₈ = 10^y
+    MR_ref = 10 ** (8.07 / 2.32)
+    
+    def solve(y_nodes, L_nodes):
+        SN, _, _ = find_required_SN_array(
+            10 ** y_nodes, 0.0, 0.0, MR_ref, 2.7 * 10 ** L_nodes,
+            SN_min=0.01, SN_max=2 * SN_GRID_CAP, tol=1e-12
+        )
+        return np.where(SN <= SN_GRID_CAP, SN, np.nan)
+    
+    SN = solve(y[:, None], L[None, :]).astype(np.float32)
+    grid = {'y': y, 'L': L, 'SN': SN}
+    
+    # ตรวจสอบที่จุดกึ่งกลาง cell, กึ่งกลางขอบ และจุด 1/4 ในแต่ละแกน
+    offsets = np.array([0.25, 0.5, 0.75])
+    y_check = (y[:-1, None] + offsets * (y[1] - y[0])).ravel()
+    L_check = (L[:-1, None] + offsets * (L[1] - L[0])).ravel()
+    exact = solve(y_check[:, None], L_check[None, :])
+    approx = _interpolate_SN_grid(grid, y_check[:, None], L_check[None, :])
+    grid['max_error'] = np.float64(np.nanmax(np.abs(approx - exact)))
+    
+    return grid
+
+
+def save_SN_grid(grid, path=SN_GRID_PATH):
+    """บันทึกตาราง SN เป็นไฟล์ .npz แบบบีบอัด"""
+    np.savez_compressed(path, **grid)
+
+
+@lru_cache(maxsize=None)
+def load_SN_grid(path=SN_GRID_PATH):
+    """โหลดตาราง SN (ถ้าไม่มีไฟล์จะสร้างตารางในหน่วยความจำแทน)"""
+    if not os.path.exists(path):
+        return build_SN_grid()
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def _interpolate_SN_grid(grid, y, L):
+    """Bilinear interpolation บนตาราง SN (นอกตาราง = NaN)"""
+    y_nodes, L_nodes, SN_nodes = grid['y'], grid['L'], grid['SN']
+    y, L = np.broadcast_arrays(np.asarray(y, dtype=float), np.asarray(L, dtype=float))
+    
+    with np.errstate(invalid='ignore'):
+        inside = (y >= y_nodes[0]) & (y <= y_nodes[-1]) & (L >= L_nodes[0]) & (L <= L_nodes[-1])
+    fy = np.where(inside, (y - y_nodes[0]) / (y_nodes[1] - y_nodes[0]), 0.0)
+    fL = np.where(inside, (L - L_nodes[0]) / (L_nodes[1] - L_nodes[0]), 0.0)
+    iy = np.minimum(fy.astype(int), y_nodes.size - 2)
+    iL = np.minimum(fL.astype(int), L_nodes.size - 2)
+    ty = fy - iy
+    tL = fL - iL
+    
+    SN = (SN_nodes[iy, iL] * (1 - ty) * (1 - tL)
+          + SN_nodes[iy + 1, iL] * ty * (1 - tL)
+          + SN_nodes[iy, iL + 1] * (1 - ty) * tL
+          + SN_nodes[iy + 1, iL + 1] * ty * tL)
+    
+    return np.where(inside, SN, np.nan)
+
+
+def lookup_required_SN_array(W18_design, ZR, S0, MR, delta_PSI, SN_min=1, SN_max=15, grid=None):
+    """
+    หาค่า SN ที่ต้องการจากตาราง SN ที่คำนวณไว้ล่วงหน้า (O(1) ต่อกรณี)
+    กรณีที่อยู่นอกตาราง หรือ SN ≥ SN_max จะแก้สมการโดยตรงด้วย find_required_SN_array
+    
+    Returns:
+        tuple: (SN, converged) ความหมายเดียวกับ find_required_SN_array
+    """
+    grid = load_SN_grid() if grid is None else grid
+    W18_design, ZR, S0, MR, delta_PSI = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (W18_design, ZR, S0, MR, delta_PSI))
+    )
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        L = np.log10(delta_PSI / 2.7)
+    SN = _interpolate_SN_grid(grid, _reduced_log_W18(W18_design, ZR, S0, MR), L)
+    SN = np.array(np.maximum(SN, SN_min), dtype=float)
+    converged = np.array(np.isfinite(SN) & (SN < SN_max))
+    
+    exact = ~converged
+    if exact.any():
+        SN_exact, converged_exact, _ = find_required_SN_array(
+            W18_design[exact], ZR[exact], S0[exact], MR[exact], delta_PSI[exact],
+            SN_min=SN_min, SN_max=SN_max
+        )
+        SN[exact] = SN_exact
+        converged[exact] = converged_exact
+    
+    return SN, converged
+
+
+def find_required_SN(W18_design, params, SN_min=1, SN_max=15):
+    """
+    หาค่า Structural Number (SN) ที่ต้องการ
+    ใช้ตาราง SN ที่คำนวณไว้ล่วงหน้า และแก้สมการโดยตรงเมื่ออยู่นอกตาราง
+    คืนค่า None เมื่อหาคำตอบไม่ได้ภายในช่วง SN_min ถึง SN_max
+    """
+    SN, converged = lookup_required_SN_array(
+        W18_design, params['ZR'], params['S0'], params['MR'], params['delta_PSI'],
+        SN_min=SN_min, SN_max=SN_max
+    )
+    
+    if not converged:
+        return None
+    
+    return float(SN)
+
+
+def calculate_SN(layers):
+    """
+    คำนวณ Structural Number จากชั้นโครงสร้าง
+    SN = Σ(aᵢ × Dᵢ × mᵢ)
+    ชั้นที่ไม่กำหนด m แต่มี drainage_quality และ percent_saturation จะคำนวณ m จากตาราง AASHTO
+    """
+    SN = 0
+    details = []
+    
+    for i, layer in enumerate(layers):
+        a = layer.get('a', 0)
+        D_inch = layer.get('D_inch', 0)
+        if 'm' not in layer and 'drainage_quality' in layer:
+            m = float(get_drainage_coefficient_array(
+                layer['drainage_quality'], layer.get('percent_saturation', 0)
+            ))
+        else:
+            m = layer.get('m', 1.0)
+        
+        SN_layer = a * D_inch * m
+        SN += SN_layer
+        
+        details.append({
+            'layer': i + 1,
+            'name': layer.get('name', f'Layer {i+1}'),
+            'a': a,
+            'D_inch': D_inch,
+            'D_cm': D_inch * 2.54,
+            'm': m,
+            'SN_layer': SN_layer,
+        })
+    
+    return SN, details
+
+
+def calculate_SN_array(a, D_inch, m=1.0):
+    """
+    คำนวณ Structural Number แบบ Vectorized
+    SN = Σ(aᵢ × Dᵢ × mᵢ) รวมตามแกนสุดท้าย (แกนของชั้นทาง)
+    """
+    a, D_inch, m = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (a, D_inch, m))
+    )
+    return np.sum(a * D_inch * m, axis=-1)
+
+
+# ==========================================
+# เส้นโค้งความสามารถรับน้ำหนัก SN - W₁₈ (Capacity Curve)
+# ==========================================
+
+def generate_capacity_curve(W18_design, params, SN_range=(1.0, 10.0), n_points=200, n_pilot=257):
+    """
+    สร้างเส้นโค้ง log₁₀(W₁₈) เทียบกับ SN แบบ Adaptive
+    
+    กระจายจุดตามความหนาแน่นที่แปรตาม √(ความโค้งของเส้น) และเพิ่มความหนาแน่นรอบ SN ออกแบบ
+    (คำนวณจาก pilot grid ในการเรียก Vectorized ครั้งเดียว) แล้วคำนวณทุกจุดในการเรียกครั้งเดียว
+    จุดตัดที่ W₁₈ ออกแบบ (SN ที่ต้องการ) ถูกแทรกลงในเส้นโค้งด้วยค่าที่แก้สมการโดยตรง
+    
+    Returns:
+        dict: SN, log_W18, W18 (array เรียงตาม SN), SN_design และ W18_design
+        SN_design = None เมื่อ W₁₈ ออกแบบอยู่นอกช่วง SN_range
+    """
+    SN_lo, SN_hi = SN_range
+    kernel_args = (params['ZR'], params['S0'], params['MR'], params['delta_PSI'])
+    SN_design, converged, _ = find_required_SN_array(
+        W18_design, *kernel_args, SN_min=SN_lo, SN_max=SN_hi
+    )
+    SN_design = float(SN_design) if converged and SN_design > SN_lo else None
+    
+    # Pilot grid สำหรับประมาณความโค้ง κ = |y''| / (1 + y'²)^1.5
+    SN_pilot = np.linspace(SN_lo, SN_hi, n_pilot)
+    log_W18_pilot = calculate_log_W18_flexible_array(SN_pilot, *kernel_args)
+    dy = np.gradient(log_W18_pilot, SN_pilot)
+    curvature = np.abs(np.gradient(dy, SN_pilot)) / (1 + dy ** 2) ** 1.5
+    
+    density = np.sqrt(curvature)
+    density = density / density.mean() + 0.5
+    if SN_design is not None:
+        width = 0.05 * (SN_hi - SN_lo)
+        density += 2.0 * np.exp(-0.5 * ((SN_pilot - SN_design) / width) ** 2)
+    
+    # กระจายจุดให้แต่ละช่วงมีพื้นที่ใต้ density เท่ากัน
+    cumulative = np.concatenate(([0.0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(SN_pilot))))
+    SN = np.interp(np.linspace(0, cumulative[-1], n_points), cumulative, SN_pilot)
+    
+    if SN_design is not None:
+        SN = np.sort(np.append(SN, SN_design))
+    log_W18 = calculate_log_W18_flexible_array(SN, *kernel_args)
+    
+    return {
+        'SN': SN,
+        'log_W18': log_W18,
+        'W18': 10 ** log_W18,
+        'SN_design': SN_design,
+        'W18_design': W18_design,
+    }
@@ -0,0 +1,187 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Environmental Serviceability Loss
+คำนวณอายุการใช้งาน (Performance Period) เมื่อคิดการสูญเสีย PSI จากการบวมตัว (Swelling)
+และการยกตัวจากน้ำแข็ง (Frost Heave) ของดินฐานราก
+
+Swelling    : ΔPSI_SW = 0.00335 × V_R × P_S × (1 - e^(-θ·t))
+Frost heave : ΔPSI_FH = 0.01 × P_F × ΔPSI_MAX × (1 - e^(-0.02·φ·t))
+Traffic     : ΔPSI_TR = ΔPSI_total - ΔPSI_SW - ΔPSI_FH
+
+อายุการใช้งาน t คือค่าที่ W₁₈ สะสมถึงปีที่ t เท่ากับ W₁₈ ที่โครงสร้างรองรับได้ด้วย ΔPSI_TR(t)
+"""
+
+import numpy as np
+
+from flexible_engine import calculate_log_W18_flexible_array, find_required_SN_array
+
+
+def calculate_swelling_PSI_loss_array(t, V_R, P_S, theta):
+    """
+    การสูญเสีย PSI จากการบวมตัวของดิน
+
+    Parameters:
+        t: เวลา (ปี)
+        V_R: Potential Vertical Rise (นิ้ว)
+        P_S: Swell Probability (%)
+        theta: Swell Rate Constant (1/ปี)
+    """
+    t, V_R, P_S, theta = (np.asarray(x, dtype=float) for x in (t, V_R, P_S, theta))
+    return 0.00335 * V_R * P_S * (1 - np.exp(-theta * t))
+
+
+def calculate_frost_heave_PSI_loss_array(t, P_F, delta_PSI_max, phi):
+    """
+    การสูญเสีย PSI จากการยกตัวจากน้ำแข็ง
+
+    Parameters:
+        t: เวลา (ปี)
+        P_F: Frost Heave Probability (%)
+        delta_PSI_max: การสูญเสีย PSI สูงสุดจาก Frost Heave
+        phi: Frost Heave Rate (มม./วัน)
+    """
+    t, P_F, delta_PSI_max, phi = (np.asarray(x, dtype=float) for x in (t, P_F, delta_PSI_max, phi))
+    return 0.01 * P_F * delta_PSI_max * (1 - np.exp(-0.02 * phi * t))
+
+
+def calculate_environmental_PSI_loss_array(t, V_R=0.0, P_S=0.0, theta=0.0, P_F=0.0,
+                                           delta_PSI_max=0.0, phi=0.0):
+    """การสูญเสีย PSI จากสิ่งแวดล้อมรวม ΔPSI_SW + ΔPSI_FH ที่เวลา t (ปี)"""
+    return (calculate_swelling_PSI_loss_array(t, V_R, P_S, theta)
+            + calculate_frost_heave_PSI_loss_array(t, P_F, delta_PSI_max, phi))
+
+
+def calculate_cumulative_W18_array(W18_first_year, growth_rate, t):
+    """
+    W₁₈ สะสมถึงปีที่ t เมื่อจราจรเพิ่มขึ้นแบบทบต้น
+
+    Parameters:
+        W18_first_year: W₁₈ ในปีแรก
+        growth_rate: อัตราการเติบโตของจราจร (% ต่อปี)
+    """
+    W18_first_year, growth_rate, t = (np.asarray(x, dtype=float) for x in (W18_first_year, growth_rate, t))
+    g = growth_rate / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(g == 0, t, np.expm1(np.log1p(g) * t) / g)
+    return W18_first_year * factor
+
+
+def calculate_years_to_W18_array(W18, W18_first_year, growth_rate):
+    """จำนวนปีที่ W₁₈ สะสมถึงค่า W18 (ฟังก์ชันผกผันของ calculate_cumulative_W18_array)"""
+    W18, W18_first_year, growth_rate = (np.asarray(x, dtype=float) for x in (W18, W18_first_year, growth_rate))
+    g = growth_rate / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = W18 / W18_first_year
+        return np.where(g == 0, ratio, np.log1p(g * ratio) / np.log1p(g))
+
+
+def _allowable_W18(SN, ZR_S0, MR, delta_PSI_traffic):
+    """W₁₈ ที่รองรับได้ (0 เมื่อ ΔPSI จากจราจรหมดแล้ว)"""
+    log_W18 = calculate_log_W18_flexible_array(SN, ZR_S0, 1.0, MR, np.maximum(delta_PSI_traffic, 1e-12))
+    return np.where(delta_PSI_traffic > 0, 10 ** log_W18, 0.0)
+
+
+def calculate_performance_period_array(SN, ZR, S0, MR, delta_PSI_total, W18_first_year, growth_rate,
+                                       V_R=0.0, P_S=0.0, theta=0.0, P_F=0.0, delta_PSI_max=0.0,
+                                       phi=0.0, t_max=50.0, tol=0.01, max_iter=60):
+    """
+    หาอายุการใช้งานของหลายสายทางพร้อมกัน โดยวนคำนวณจนจราจรและสิ่งแวดล้อมสอดคล้องกัน
+
+    ขั้นตอนตาม AASHTO: สมมติอายุ t → ΔPSI_SW + ΔPSI_FH → ΔPSI_TR → W₁₈ ที่รองรับได้
+    → จำนวนปีที่จราจรสะสมถึง W₁₈ นั้น แล้วปรับ t จนสองค่าเท่ากัน
+    ผลต่าง (ปีจากจราจร - t) ลดลงตาม t เสมอ จึงใช้ bisection บนช่วงที่คร่อมคำตอบ
+    แทนการเฉลี่ยค่าทีละรอบแบบในแบบฟอร์ม ทำให้ลู่เข้าทุกกรณี
+
+    Returns:
+        dict ของ array:
+        - period: อายุการใช้งาน (ปี) ถ้าเกิน t_max จะได้ t_max และ capped = True
+        - delta_PSI_env, delta_PSI_traffic: ΔPSI จากสิ่งแวดล้อม / จราจร ที่อายุดังกล่าว
+        - W18: W₁₈ สะสมที่อายุดังกล่าว
+        - converged: False เมื่อพารามิเตอร์ไม่ถูกต้อง (period = NaN)
+        - capped, iterations
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        SN, ZR, S0, MR, delta_PSI_total, W18_first_year, growth_rate,
+        V_R, P_S, theta, P_F, delta_PSI_max, phi
+    )))
+    shape = arrays[0].shape
+    (SN, ZR, S0, MR, delta_PSI_total, W18_first_year, growth_rate,
+     V_R, P_S, theta, P_F, delta_PSI_max, phi) = (x.ravel() for x in arrays)
+    ZR_S0 = ZR * S0
+
+    def residual(t, idx):
+        delta_PSI_env = calculate_environmental_PSI_loss_array(
+            t, V_R[idx], P_S[idx], theta[idx], P_F[idx], delta_PSI_max[idx], phi[idx]
+        )
+        W18 = _allowable_W18(SN[idx], ZR_S0[idx], MR[idx], delta_PSI_total[idx] - delta_PSI_env)
+        return calculate_years_to_W18_array(W18, W18_first_year[idx], growth_rate[idx]) - t
+
+    n = SN.size
+    all_idx = np.arange(n)
+    period = np.full(n, np.nan)
+    converged = np.zeros(n, dtype=bool)
+    capped = np.zeros(n, dtype=bool)
+    iterations = np.zeros(n, dtype=int)
+
+    r_0 = residual(np.zeros(n), all_idx)
+    r_max = residual(np.full(n, float(t_max)), all_idx)
+
+    # อายุเกิน t_max (แม้ที่ t_max จราจรยังไม่ถึง W₁₈ ที่รองรับได้)
+    capped = np.isfinite(r_0) & (r_max >= 0)
+    period[capped] = t_max
+    converged[capped] = True
+
+    idx = np.flatnonzero(np.isfinite(r_0) & (r_max < 0))
+    t_lo = np.zeros(idx.size)
+    t_hi = np.full(idx.size, float(t_max))
+
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+
+        t_mid = (t_lo + t_hi) / 2
+        r_mid = residual(t_mid, idx)
+        iterations[idx] += 1
+
+        t_lo = np.where(r_mid >= 0, t_mid, t_lo)
+        t_hi = np.where(r_mid >= 0, t_hi, t_mid)
+
+        done = t_hi - t_lo < tol
+        period[idx[done]] = (t_lo[done] + t_hi[done]) / 2
+        converged[idx[done]] = True
+
+        keep = ~done
+        idx, t_lo, t_hi = idx[keep], t_lo[keep], t_hi[keep]
+
+    delta_PSI_env = calculate_environmental_PSI_loss_array(period, V_R, P_S, theta, P_F, delta_PSI_max, phi)
+    return {
+        "period": period.reshape(shape),
+        "delta_PSI_env": delta_PSI_env.reshape(shape),
+        "delta_PSI_traffic": (delta_PSI_total - delta_PSI_env).reshape(shape),
+        "W18": calculate_cumulative_W18_array(W18_first_year, growth_rate, period).reshape(shape),
+        "converged": converged.reshape(shape),
+        "capped": capped.reshape(shape),
+        "iterations": iterations.reshape(shape),
+    }
+
+
+def find_required_SN_environmental_array(W18_first_year, growth_rate, design_period, ZR, S0, MR,
+                                         delta_PSI_total, V_R=0.0, P_S=0.0, theta=0.0, P_F=0.0,
+                                         delta_PSI_max=0.0, phi=0.0, SN_min=1, SN_max=15):
+    """
+    หา SN ที่ต้องการเพื่อให้อายุการใช้งานไม่น้อยกว่า design_period (ปี)
+
+    เมื่อกำหนดอายุแล้ว ΔPSI_TR และ W₁₈ สะสมเป็นค่าที่ทราบ จึงแก้สมการได้โดยตรงไม่ต้องวนซ้ำ
+
+    Returns:
+        tuple: (SN, converged, delta_PSI_traffic) ตามรูปแบบของ find_required_SN_array
+        (converged = False เมื่อ ΔPSI จากสิ่งแวดล้อมมากกว่าหรือเท่ากับ ΔPSI ทั้งหมด)
+    """
+    delta_PSI_env = calculate_environmental_PSI_loss_array(
+        design_period, V_R, P_S, theta, P_F, delta_PSI_max, phi
+    )
+    delta_PSI_traffic = np.asarray(delta_PSI_total, dtype=float) - delta_PSI_env
+    W18_design = calculate_cumulative_W18_array(W18_first_year, growth_rate, design_period)
+    SN, converged, _ = find_required_SN_array(
+        W18_design, ZR, S0, MR, delta_PSI_traffic, SN_min=SN_min, SN_max=SN_max
+    )
+    return SN, converged, delta_PSI_traffic
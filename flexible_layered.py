@@ -0,0 +1,180 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Layered Design Analysis
+ออกแบบความหนาชั้นทางตามลำดับชั้น (SN1 / SN2 / SN3)
+
+SN1 คำนวณจาก MR ของชั้นพื้นทาง, SN2 จาก MR ของชั้นรองพื้นทาง, SN3 จาก MR ของดินฐานราก
+    D1* ≥ SN1 / (a1·m1)
+    D2* ≥ (SN2 - SN1*) / (a2·m2)
+    D3* ≥ (SN3 - SN1* - SN2*) / (a3·m3)
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from flexible_engine import (
+    MATERIAL_DATABASE,
+    cm_to_inch,
+    inch_to_cm,
+    calculate_SN,
+    find_required_SN_array,
+)
+
+
+# SN ต่ำสุดในการหาค่า SN1 (MR ของพื้นทางสูง ทำให้ SN1 อาจน้อยกว่า 1)
+LAYERED_SN_MIN = 0.1
+
+# ความคลาดเคลื่อนของ floating point ที่ยอมให้ในการเปรียบเทียบ SN ที่ได้กับ SN ที่ต้องการ
+LAYERED_SN_TOLERANCE = 1e-9
+
+
+def round_up_thickness(D_cm, increment_cm):
+    """ปัดความหนาขึ้นตามระยะก่อสร้าง (increment_cm ≤ 0 = ไม่ปัด)"""
+    if increment_cm <= 0:
+        return D_cm
+    # ลบค่าเล็กน้อยก่อนปัดขึ้น เพื่อไม่ให้ความคลาดเคลื่อนของ floating point เพิ่มอีกหนึ่งระยะ
+    # (ความหนา 0 จะได้ -0.0 จึงจำกัดให้ไม่ต่ำกว่า 0)
+    return np.maximum(np.ceil(np.asarray(D_cm) / increment_cm - 1e-9) * increment_cm, 0.0)
+
+
+def find_layered_SN_required(W18_design, ZR, S0, MR_stack, delta_PSI):
+    """
+    SN ที่ต้องการเหนือชั้นที่มี MR ตาม MR_stack (แกนสุดท้าย) ด้วย solver เดียวกันทุกระดับ
+    ใช้ร่วมกันระหว่างการตรวจสอบ การออกแบบ และการหาโครงสร้างราคาต่ำสุด เพื่อให้ได้ค่าเดียวกันเสมอ
+
+    Returns:
+        tuple: (SN ที่ต้องการ รูปร่างเดียวกับ MR_stack, converged)
+    """
+    SN_required, converged, _ = find_required_SN_array(
+        np.asarray(W18_design, dtype=float)[..., None], np.asarray(ZR, dtype=float)[..., None],
+        np.asarray(S0, dtype=float)[..., None], MR_stack, np.asarray(delta_PSI, dtype=float)[..., None],
+        SN_min=LAYERED_SN_MIN
+    )
+    return SN_required, converged
+
+
+def calculate_layered_design_array(W18_design, ZR, S0, delta_PSI, a, m, MR_base, MR_subbase,
+                                   MR_subgrade, increment_cm=1.0):
+    """
+    ออกแบบความหนาต่ำสุดของแต่ละชั้นตามวิธี Layered Design แบบ Vectorized
+
+    Parameters:
+        a, m: Layer Coefficient และ Drainage Coefficient รูปร่าง (..., 3)
+        MR_base, MR_subbase, MR_subgrade: MR ของชั้นใต้ผิวทาง, ใต้พื้นทาง และดินฐานราก (psi)
+        increment_cm: ระยะปัดความหนาขึ้น (ซม.)
+
+    Returns:
+        dict ของ array: SN1, SN2, SN3 (ที่ต้องการ), D1_cm, D2_cm, D3_cm,
+        SN_provided และ converged
+    """
+    a = np.asarray(a, dtype=float)
+    m = np.asarray(m, dtype=float)
+    W18_design, ZR, S0, delta_PSI, MR_base, MR_subbase, MR_subgrade = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in
+          (W18_design, ZR, S0, delta_PSI, MR_base, MR_subbase, MR_subgrade))
+    )
+
+    # แก้สมการทั้งสามระดับในการเรียก solver ครั้งเดียว
+    MR_stack = np.stack([MR_base, MR_subbase, MR_subgrade], axis=-1)
+    SN_stack, converged = find_layered_SN_required(W18_design, ZR, S0, MR_stack, delta_PSI)
+    SN1, SN2, SN3 = np.moveaxis(SN_stack, -1, 0)
+    a1, a2, a3 = np.moveaxis(a, -1, 0)
+    m1, m2, m3 = np.moveaxis(m, -1, 0)
+
+    D1_cm = round_up_thickness(inch_to_cm(SN1 / (a1 * m1)), increment_cm)
+    SN1_provided = a1 * m1 * cm_to_inch(D1_cm)
+
+    D2_cm = round_up_thickness(inch_to_cm(np.maximum(SN2 - SN1_provided, 0) / (a2 * m2)), increment_cm)
+    SN2_provided = a2 * m2 * cm_to_inch(D2_cm)
+
+    D3_cm = round_up_thickness(
+        inch_to_cm(np.maximum(SN3 - SN1_provided - SN2_provided, 0) / (a3 * m3)), increment_cm
+    )
+    SN3_provided = a3 * m3 * cm_to_inch(D3_cm)
+
+    return {
+        "SN1": SN1,
+        "SN2": SN2,
+        "SN3": SN3,
+        "D1_cm": D1_cm,
+        "D2_cm": D2_cm,
+        "D3_cm": D3_cm,
+        "SN_provided": SN1_provided + SN2_provided + SN3_provided,
+        "converged": converged.all(axis=-1),
+    }
+
+
+def check_layered_design(W18_design, params, layers, MR_base, MR_subbase):
+    """
+    ตรวจสอบโครงสร้างที่กำหนดตามวิธี Layered Design
+
+    Parameters:
+        params: dict ของ ZR, S0, MR (ดินฐานราก), delta_PSI
+        layers: รายการชั้นทาง 3 ชั้นในรูปแบบเดียวกับ calculate_SN
+            (m ของแต่ละชั้นหาด้วยวิธีเดียวกับ calculate_SN รวมถึงการคำนวณจากคุณภาพการระบายน้ำ)
+
+    Returns:
+        list ของ dict ต่อชั้น: SN ที่ต้องการ, SN สะสมที่ได้ และผลการตรวจสอบ
+    """
+    MR_stack = np.array([MR_base, MR_subbase, params['MR']], dtype=float)
+    SN_required, converged = find_layered_SN_required(
+        W18_design, params['ZR'], params['S0'], MR_stack, params['delta_PSI']
+    )
+    _, details = calculate_SN(layers)
+    SN_cumulative = np.cumsum([d['SN_layer'] for d in details])
+
+    checks = []
+    for i in range(3):
+        checks.append({
+            'layer': i + 1,
+            'name': layers[i].get('name', f'Layer {i+1}'),
+            'MR_below': float(MR_stack[i]),
+            'SN_required': float(SN_required[i]) if converged[i] else None,
+            'SN_provided': float(SN_cumulative[i]),
+            'passed': bool(converged[i] and SN_cumulative[i] >= SN_required[i] - LAYERED_SN_TOLERANCE),
+        })
+    return checks
+
+
+def enumerate_material_combinations(W18_design, params, increment_cm=1.0,
+                                    material_database=MATERIAL_DATABASE, m=None):
+    """
+    ออกแบบ Layered Design ของทุกชุดวัสดุ ผิวทาง/พื้นทาง/รองพื้นทาง ในฐานข้อมูล
+    คำนวณทุกชุดพร้อมกันในการเรียกแบบ Vectorized ครั้งเดียว
+
+    Parameters:
+        m: Drainage Coefficient ของผิวทาง/พื้นทาง/รองพื้นทาง ใช้แทนค่าในฐานข้อมูล
+            (None หรือสมาชิกที่เป็น None = ใช้ค่าในฐานข้อมูล)
+
+    Returns:
+        DataFrame หนึ่งแถวต่อชุดวัสดุ เรียงตามความหนารวม
+    """
+    names = [list(material_database[key].keys()) for key in ("surface", "base", "subbase")]
+    combinations = list(itertools.product(*names))
+
+    props = [
+        [material_database[key][name] for key, name in zip(("surface", "base", "subbase"), combo)]
+        for combo in combinations
+    ]
+    a = np.array([[p["a"] for p in combo] for combo in props])
+    m_layers = np.array([[p["m"] for p in combo] for combo in props], dtype=float)
+    for i, m_i in enumerate(m if m is not None else ()):
+        if m_i is not None:
+            m_layers[:, i] = m_i
+    MR_base = np.array([combo[1]["MR_psi"] for combo in props], dtype=float)
+    MR_subbase = np.array([combo[2]["MR_psi"] for combo in props], dtype=float)
+
+    result = calculate_layered_design_array(
+        W18_design, params['ZR'], params['S0'], params['delta_PSI'], a, m_layers,
+        MR_base, MR_subbase, params['MR'], increment_cm=increment_cm
+    )
+
+    df = pd.DataFrame({
+        "surface": [c[0] for c in combinations],
+        "base": [c[1] for c in combinations],
+        "subbase": [c[2] for c in combinations],
+        **result,
+    })
+    df["total_cm"] = df["D1_cm"] + df["D2_cm"] + df["D3_cm"]
+    return df.sort_values("total_cm", kind="stable").reset_index(drop=True)
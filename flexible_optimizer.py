@@ -0,0 +1,341 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Minimum-Cost Optimizer
+หาโครงสร้างชั้นทาง (วัสดุ + ความหนา) ที่ราคาต่ำสุดซึ่งผ่านการตรวจสอบตามลำดับชั้น (SN1 / SN2 / SN3)
+
+ราคาวัสดุกำหนดเป็น บาท/ลบ.ม. ค่าก่อสร้างต่อตารางเมตร = Σ ราคาᵢ × Dᵢ(ซม.) / 100
+"""
+
+import numpy as np
+import pandas as pd
+
+from flexible_engine import (
+    MATERIAL_DATABASE,
+    cm_to_inch,
+    calculate_SN_array,
+)
+from flexible_layered import LAYERED_SN_TOLERANCE, find_layered_SN_required, round_up_thickness
+
+
+LAYER_KEYS = ("surface", "base", "subbase")
+
+# ช่วงความหนาเริ่มต้น (ซม.) ตามช่วงที่กรอกได้ในโปรแกรม
+DEFAULT_THICKNESS_LIMITS_CM = {
+    "surface": (5.0, 30.0),
+    "base": (10.0, 50.0),
+    "subbase": (10.0, 60.0),
+}
+
+STRUCTURE_COLUMNS = ["surface", "surface_D_cm", "base", "base_D_cm", "subbase", "subbase_D_cm",
+                     "total_cm", "SN_provided", "cost"]
+
+
+def get_layer_options(layer_key, unit_prices, thickness_limits, increment_cm,
+                      material_database=MATERIAL_DATABASE):
+    """
+    สร้างตัวเลือกทั้งหมดของชั้นหนึ่ง (วัสดุที่มีราคา × ความหนาตามระยะก่อสร้าง)
+
+    Returns:
+        dict ของ array: material, D_cm, SN (= a×D×m), cost (บาท/ตร.ม.)
+    """
+    names = [name for name in material_database[layer_key] if name in unit_prices]
+    if not names:
+        raise ValueError(f"ไม่มีราคาวัสดุสำหรับชั้น {layer_key}")
+
+    D_min, D_max = thickness_limits[layer_key]
+    D_cm = np.arange(D_min, D_max + increment_cm / 2, increment_cm)
+
+    material = np.repeat(np.arange(len(names)), D_cm.size)
+    D_cm = np.tile(D_cm, len(names))
+    a = np.array([material_database[layer_key][n]["a"] for n in names])[material]
+    m = np.array([material_database[layer_key][n]["m"] for n in names])[material]
+    price = np.array([unit_prices[n] for n in names], dtype=float)[material]
+
+    return {
+        "names": names,
+        "material": material,
+        "D_cm": D_cm,
+        "SN": a * cm_to_inch(D_cm) * m,
+        "cost": price * D_cm / 100,
+    }
+
+
+def pareto_front(cost, SN):
+    """
+    ดัชนีของตัวเลือกที่ไม่ถูกครอบงำ (ไม่มีตัวเลือกอื่นที่ถูกกว่าและให้ SN มากกว่าหรือเท่ากัน)
+    เรียงตามราคาจากน้อยไปมาก ซึ่ง SN จะเพิ่มขึ้นตามด้วย
+    """
+    order = np.lexsort((-SN, cost))
+    SN_sorted = SN[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], SN_sorted[:-1])))
+    return order[SN_sorted > best_before]
+
+
+def _structures_to_frame(names, rows, material_database=MATERIAL_DATABASE):
+    """แปลงผลการค้นหาเป็น DataFrame พร้อมคำนวณ SN ด้วย calculate_SN_array"""
+    df = pd.DataFrame({"cost": rows["cost"]})
+    a, m, D_inch = [], [], []
+    for key in LAYER_KEYS:
+        layer_names = np.array(names[key], dtype=object)[rows[f"{key}_material"]]
+        df[key] = layer_names
+        df[f"{key}_D_cm"] = rows[f"{key}_D_cm"]
+        a.append([material_database[key][n]["a"] for n in layer_names])
+        m.append([material_database[key][n]["m"] for n in layer_names])
+        D_inch.append(cm_to_inch(rows[f"{key}_D_cm"]))
+    df["SN_provided"] = calculate_SN_array(
+        np.array(a, dtype=float).T, np.array(D_inch, dtype=float).T, np.array(m, dtype=float).T
+    )
+    df["total_cm"] = sum(df[f"{key}_D_cm"] for key in LAYER_KEYS)
+    return df[STRUCTURE_COLUMNS]
+
+
+def get_structure_candidates(unit_prices, thickness_limits=None, increment_cm=1.0,
+                             material_database=MATERIAL_DATABASE, prune=True):
+    """
+    ตัวเลือกของคู่ (ผิวทาง, พื้นทาง) และวัสดุรองพื้นทางที่มีราคา
+
+    prune = True ตัดผิวทางที่ถูกครอบงำทิ้งด้วย pareto_front (ราคา vs SN) และสร้าง frontiers
+    สำหรับ select_pairs: เมื่อกำหนดวัสดุพื้นทางและผิวทางขั้นต่ำที่ผ่าน SN1 แล้ว D₃ ที่ต้องการ
+    ขึ้นกับ SN_12 เท่านั้น คู่ที่ต้องพิจารณาจึงมีเพียง pareto_front (cost_12 vs SN_12)
+    ของคู่ที่ใช้ผิวทางระดับนั้นขึ้นไป (โครงสร้างที่ราคาต่ำสุดไม่เปลี่ยน)
+
+    Returns:
+        dict: surface, base (ตัวเลือกของแต่ละชั้นจาก get_layer_options), i1, i2 (ดัชนีของคู่),
+        SN_1 และ SN_12 (SN สะสมเหนือพื้นทางและเหนือรองพื้นทาง), cost_12,
+        subbase_names, a3m3, price3, D3_limits
+        และเมื่อ prune = True: SN_1_levels (SN ของผิวทางที่เหลือ เรียงจากน้อยไปมาก)
+        กับ frontiers รูปร่าง (วัสดุพื้นทาง, ระดับผิวทาง + 1, ความยาวสูงสุด) เติมด้วย -1
+    """
+    thickness_limits = thickness_limits or DEFAULT_THICKNESS_LIMITS_CM
+    surface = get_layer_options("surface", unit_prices, thickness_limits, increment_cm, material_database)
+    base = get_layer_options("base", unit_prices, thickness_limits, increment_cm, material_database)
+    subbase_names = [n for n in material_database["subbase"] if n in unit_prices]
+    if not subbase_names:
+        raise ValueError("ไม่มีราคาวัสดุสำหรับชั้น subbase")
+
+    # คู่ผิวทาง × พื้นทาง (ผิวทางที่ถูกครอบงำใช้ผิวทางที่ถูกกว่าและ SN สูงกว่าแทนได้ในทุกคู่)
+    surface_options = pareto_front(surface["cost"], surface["SN"]) if prune else np.arange(surface["cost"].size)
+    i1, i2 = np.meshgrid(surface_options, np.arange(base["cost"].size), indexing="ij")
+    i1, i2 = i1.ravel(), i2.ravel()
+
+    candidates = {
+        "surface": surface,
+        "base": base,
+        "i1": i1,
+        "i2": i2,
+        "SN_1": surface["SN"][i1],
+        "SN_12": surface["SN"][i1] + base["SN"][i2],
+        "cost_12": surface["cost"][i1] + base["cost"][i2],
+        "subbase_names": subbase_names,
+        "a3m3": np.array([material_database["subbase"][n]["a"] * material_database["subbase"][n]["m"]
+                          for n in subbase_names]),
+        "price3": np.array([unit_prices[n] for n in subbase_names], dtype=float),
+        "D3_limits": thickness_limits["subbase"],
+    }
+    if prune:
+        candidates["SN_1_levels"] = surface["SN"][surface_options]
+        candidates["frontiers"] = _pair_frontiers(candidates)
+    return candidates
+
+
+def _pair_frontiers(candidates):
+    """
+    ดัชนีของคู่บน pareto_front (cost_12 vs SN_12) แยกตามวัสดุพื้นทางและระดับผิวทางขั้นต่ำ j
+    (คู่ที่ใช้ผิวทางลำดับที่ j ขึ้นไป) ระดับสุดท้ายว่างสำหรับสายทางที่ไม่มีผิวทางใดผ่าน SN1
+    """
+    n_levels = candidates["SN_1_levels"].size
+    n_base = candidates["base"]["cost"].size
+    base_material = candidates["base"]["material"]
+    cost_12, SN_12 = candidates["cost_12"], candidates["SN_12"]
+
+    fronts = []
+    for material in range(len(candidates["base"]["names"])):
+        base_options = np.flatnonzero(base_material == material)
+        for level in range(n_levels):
+            pairs = (np.arange(level, n_levels)[:, None] * n_base + base_options[None, :]).ravel()
+            fronts.append(pairs[pareto_front(cost_12[pairs], SN_12[pairs])])
+        fronts.append(np.array([], dtype=int))
+
+    frontiers = np.full((len(fronts), max(f.size for f in fronts)), -1)
+    for k, front in enumerate(fronts):
+        frontiers[k, :front.size] = front
+    return frontiers.reshape(len(candidates["base"]["names"]), n_levels + 1, -1)
+
+
+def select_pairs(SN1, candidates):
+    """
+    คู่ (ผิวทาง, พื้นทาง) ที่ต้องคำนวณราคาของแต่ละสายทางจาก frontiers ของ get_structure_candidates
+
+    Parameters:
+        SN1: ผลจาก find_layered_SN_by_material รูปร่าง (N, วัสดุพื้นทาง)
+
+    Returns:
+        ndarray: ดัชนีของคู่ รูปร่าง (N, วัสดุพื้นทาง × ความยาวของ frontier) (-1 = ไม่มีคู่)
+    """
+    level = np.searchsorted(candidates["SN_1_levels"], SN1 - LAYERED_SN_TOLERANCE, side="left")
+    material = np.arange(SN1.shape[1])[None, :]
+    return candidates["frontiers"][material, level].reshape(SN1.shape[0], -1)
+
+
+def find_layered_SN_by_material(W18_design, ZR, S0, MR, delta_PSI, candidates,
+                                material_database=MATERIAL_DATABASE):
+    """
+    SN ที่ต้องการตามลำดับชั้นของแต่ละสายทาง สำหรับวัสดุพื้นทาง/รองพื้นทางทุกชนิดในตัวเลือก
+    (find_layered_SN_required เดียวกับ check_layered_design)
+
+    Returns:
+        tuple: (SN1 รูปร่าง (N, วัสดุพื้นทาง), SN2 รูปร่าง (N, วัสดุรองพื้นทาง), SN3 รูปร่าง (N,), converged (N,))
+    """
+    W18_design, ZR, S0, MR, delta_PSI = (
+        x.ravel() for x in np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (W18_design, ZR, S0, MR, delta_PSI))
+        )
+    )
+    MR_base = [material_database["base"][n]["MR_psi"] for n in candidates["base"]["names"]]
+    MR_subbase = [material_database["subbase"][n]["MR_psi"] for n in candidates["subbase_names"]]
+    n_base, n_subbase = len(MR_base), len(MR_subbase)
+
+    MR_stack = np.concatenate([
+        np.broadcast_to(np.asarray(MR_base, dtype=float), (MR.size, n_base)),
+        np.broadcast_to(np.asarray(MR_subbase, dtype=float), (MR.size, n_subbase)),
+        MR[:, None],
+    ], axis=1)
+    SN, converged = find_layered_SN_required(W18_design, ZR, S0, MR_stack, delta_PSI)
+    return SN[:, :n_base], SN[:, n_base:n_base + n_subbase], SN[:, -1], converged.all(axis=1)
+
+
+def calculate_structure_costs(SN1, SN2, SN3, candidates, pairs, increment_cm=1.0):
+    """
+    ราคาของทุกโครงสร้างที่ผ่านการตรวจสอบตามลำดับชั้น (SN1 / SN2 / SN3) แบบ Vectorized
+
+    สำหรับทุกคู่ (ผิวทาง, พื้นทาง) และวัสดุรองพื้นทาง ความหนารองพื้นทางที่ถูกที่สุดคือค่าต่ำสุด
+    ที่ทำให้ SN รวม ≥ SN3 (SN1 และ SN2 ไม่ขึ้นกับ D₃) จึงคำนวณ D₃ โดยตรงแทนการแจงนับ
+
+    Parameters:
+        SN1, SN2, SN3: ผลจาก find_layered_SN_by_material รูปร่าง (N, ...) และ (N,)
+        pairs: ดัชนีของคู่ที่ต้องคำนวณ รูปร่าง (N, P) หรือ (1, P) จาก select_pairs (-1 = ไม่มีคู่)
+
+    Returns:
+        tuple: (cost, D3_cm) รูปร่าง (N, P, วัสดุรองพื้นทาง)
+        cost = inf เมื่อโครงสร้างไม่ผ่าน
+    """
+    valid = pairs >= 0
+    pairs = np.where(valid, pairs, 0)
+
+    SN_1, SN_12 = candidates["SN_1"][pairs], candidates["SN_12"][pairs]
+    D3_min, D3_max = candidates["D3_limits"]
+    tol = LAYERED_SN_TOLERANCE
+
+    D3_needed = (SN3[:, None, None] - SN_12[:, :, None]) / candidates["a3m3"][None, None, :] * 2.54
+    D3_cm = np.maximum(round_up_thickness(D3_needed, increment_cm), D3_min)
+
+    base_material = candidates["base"]["material"][candidates["i2"][pairs]]
+    feasible = (
+        (D3_cm <= D3_max + 1e-9)
+        & (valid & (SN_1 >= np.take_along_axis(SN1, base_material, axis=1) - tol))[:, :, None]
+        & (SN_12[:, :, None] >= SN2[:, None, :] - tol)
+    )
+    cost = np.where(
+        feasible, candidates["cost_12"][pairs][:, :, None] + candidates["price3"][None, None, :] * D3_cm / 100,
+        np.inf,
+    )
+    return cost, D3_cm
+
+
+def _candidate_rows(candidates, pairs, cost, D3_cm, index):
+    """
+    ข้อมูลโครงสร้างสำหรับ _structures_to_frame จากดัชนี index รูปร่าง (N, k)
+    (ดัชนีของ cost[i] ที่แบนแล้ว) เรียงต่อกันเป็น N×k แถว
+    """
+    column, i3 = np.unravel_index(index, cost.shape[1:])
+    row = np.arange(cost.shape[0])[:, None]
+    pair = pairs[row, column]
+    i1, i2 = candidates["i1"][pair], candidates["i2"][pair]
+    surface, base = candidates["surface"], candidates["base"]
+    rows = {
+        "cost": cost[row, column, i3],
+        "surface_material": surface["material"][i1],
+        "surface_D_cm": surface["D_cm"][i1],
+        "base_material": base["material"][i2],
+        "base_D_cm": base["D_cm"][i2],
+        "subbase_material": i3,
+        "subbase_D_cm": D3_cm[row, column, i3],
+    }
+    return {key: value.ravel() for key, value in rows.items()}
+
+
+def _candidate_names(candidates):
+    """รายชื่อวัสดุของแต่ละชั้นสำหรับ _structures_to_frame"""
+    return {"surface": candidates["surface"]["names"], "base": candidates["base"]["names"],
+            "subbase": candidates["subbase_names"]}
+
+
+def optimize_structure(W18_design, params, unit_prices, thickness_limits=None, increment_cm=1.0,
+                       n_alternatives=5, material_database=MATERIAL_DATABASE):
+    """
+    หาโครงสร้างที่ราคาต่ำสุดและทางเลือกถัดไปอีก n_alternatives แบบ สำหรับการออกแบบเดียว
+
+    ทุกโครงสร้างผ่านการตรวจสอบตามลำดับชั้น (SN1 / SN2 / SN3) เช่นเดียวกับ check_layered_design
+    ใช้ตัวเลือกทุกคู่ (ไม่ตัดคู่ที่ถูกครอบงำ) เพื่อให้ทางเลือกถัดไปครบทุกแบบ
+
+    Returns:
+        DataFrame เรียงตามราคา (แถวแรกคือโครงสร้างที่ถูกที่สุด) หรือ DataFrame ว่างถ้าไม่มีโครงสร้างที่ผ่าน
+    """
+    candidates = get_structure_candidates(unit_prices, thickness_limits, increment_cm, material_database,
+                                          prune=False)
+    SN1, SN2, SN3, converged = find_layered_SN_by_material(
+        W18_design, params['ZR'], params['S0'], params['MR'], params['delta_PSI'], candidates, material_database
+    )
+    if not converged[0]:
+        raise ValueError("ไม่สามารถคำนวณ SN ที่ต้องการได้ กรุณาตรวจสอบพารามิเตอร์")
+
+    pairs = np.arange(candidates["SN_12"].size)[None, :]
+    cost, D3_cm = calculate_structure_costs(SN1, SN2, SN3, candidates, pairs, increment_cm)
+
+    cost_flat = cost[0].ravel()
+    n_feasible = int(np.isfinite(cost_flat).sum())
+    n_keep = min(n_alternatives + 1, n_feasible)
+    if n_keep == 0:
+        return pd.DataFrame(columns=STRUCTURE_COLUMNS)
+
+    best = np.argpartition(cost_flat, n_keep - 1)[:n_keep]
+    best = best[np.argsort(cost_flat[best], kind="stable")]
+
+    rows = _candidate_rows(candidates, pairs, cost, D3_cm, best[None, :])
+    return _structures_to_frame(_candidate_names(candidates), rows, material_database)
+
+
+def optimize_structures_batch(W18_design, ZR, S0, MR, delta_PSI, unit_prices, thickness_limits=None,
+                              increment_cm=1.0, material_database=MATERIAL_DATABASE, chunk_size=None):
+    """
+    หาโครงสร้างที่ราคาต่ำสุดของหลายสายทางพร้อมกัน
+
+    ใช้ SN ที่ต้องการและเงื่อนไขตามลำดับชั้นเดียวกับ optimize_structure แต่คำนวณราคาเฉพาะคู่จาก select_pairs
+    คำนวณทีละกลุ่มของสายทาง (chunk_size = None เลือกให้ใช้หน่วยความจำประมาณ 4 ล้านค่าต่อกลุ่ม)
+
+    Returns:
+        DataFrame หนึ่งแถวต่อสายทาง (คอลัมน์ feasible = False เมื่อไม่มีโครงสร้างที่ผ่าน)
+    """
+    candidates = get_structure_candidates(unit_prices, thickness_limits, increment_cm, material_database)
+    SN1, SN2, SN3, converged = find_layered_SN_by_material(
+        W18_design, ZR, S0, MR, delta_PSI, candidates, material_database
+    )
+
+    pairs = select_pairs(SN1, candidates)
+    n_structures = pairs.shape[1] * len(candidates["subbase_names"])
+    chunk_size = chunk_size or max(1, 4_000_000 // n_structures)
+
+    chunks = []
+    for start in range(0, SN3.size, chunk_size):
+        part = slice(start, start + chunk_size)
+        cost, D3_cm = calculate_structure_costs(SN1[part], SN2[part], SN3[part], candidates, pairs[part],
+                                                increment_cm)
+        best = np.argmin(cost.reshape(cost.shape[0], -1), axis=1)
+        chunks.append(_candidate_rows(candidates, pairs[part], cost, D3_cm, best[:, None]))
+    rows = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+    feasible = converged & np.isfinite(rows["cost"])
+    df = _structures_to_frame(_candidate_names(candidates), rows, material_database)
+    df.insert(0, "SN_required", SN3)
+    df["feasible"] = feasible
+    df.loc[~feasible, df.columns.drop(["SN_required", "feasible"])] = np.nan
+    return df
@@ -0,0 +1,109 @@
+"""
+AASHTO 1993 Flexible Pavement Design - AC Overlay (Structural Deficiency Approach)
+ออกแบบความหนาชั้นเสริมผิว AC บนผิวทางลาดยางเดิม
+
+    SN_ol = SN_f - SN_eff
+    D_ol  = SN_ol / (a_ol × m_ol)
+
+SN_f   : SN ที่ต้องการสำหรับจราจรในอนาคต (find_required_SN)
+SN_eff : SN ประสิทธิผลของโครงสร้างเดิมจาก Component Analysis
+         = Σ(aᵢ × CFᵢ × Dᵢ × mᵢ) โดย CFᵢ คือตัวคูณลดค่าตามสภาพความเสียหาย (0 - 1)
+         เช่น ผิว AC ที่มี Alligator Cracking ระดับปานกลางมากกว่า 10% ใช้ a ≈ 0.14 - 0.20
+         (AASHTO 1993 Table 5.2) คิดเป็น CF ≈ 0.35 - 0.50 ของ a = 0.40
+"""
+
+import numpy as np
+
+from flexible_engine import (
+    MATERIAL_DATABASE,
+    inch_to_cm,
+    find_required_SN,
+    find_required_SN_array,
+    lookup_required_SN_array,
+    calculate_SN,
+    calculate_SN_array,
+)
+from flexible_layered import round_up_thickness
+
+
+# Layer Coefficient ของชั้นเสริมผิว AC
+DEFAULT_OVERLAY_A = MATERIAL_DATABASE["surface"]["ผิวทางลาดยาง AC"]["a"]
+
+
+def calculate_effective_SN(layers):
+    """
+    คำนวณ SN ประสิทธิผลของโครงสร้างเดิมด้วย calculate_SN
+    แต่ละชั้นใช้ a × condition_factor (ค่าเริ่มต้น 1.00 = ไม่ลดค่า)
+    """
+    reduced_layers = [
+        {**layer, 'a': layer.get('a', 0) * layer.get('condition_factor', 1.0)} for layer in layers
+    ]
+    return calculate_SN(reduced_layers)
+
+
+def calculate_effective_SN_array(a, D_inch, m=1.0, condition_factor=1.0):
+    """SN ประสิทธิผลแบบ Vectorized = Σ(aᵢ × CFᵢ × Dᵢ × mᵢ) รวมตามแกนสุดท้าย"""
+    a, condition_factor = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (a, condition_factor))
+    )
+    return calculate_SN_array(a * condition_factor, D_inch, m)
+
+
+def design_overlay_array(W18_future, ZR, S0, MR, delta_PSI, SN_eff, a_ol=DEFAULT_OVERLAY_A, m_ol=1.0,
+                         increment_cm=0.0, use_grid=False):
+    """
+    ออกแบบความหนาชั้นเสริมผิวของหลายสายทางพร้อมกัน
+
+    Parameters:
+        W18_future: W₁₈ ของจราจรในอนาคต (ตลอดอายุชั้นเสริมผิว)
+        SN_eff: SN ประสิทธิผลของโครงสร้างเดิม
+        increment_cm: ระยะปัดความหนาขึ้น (ซม., 0 = ไม่ปัด)
+        use_grid: ใช้ตาราง SN ที่คำนวณไว้ล่วงหน้าแทนการแก้สมการโดยตรง
+
+    Returns:
+        dict ของ array: SN_f, SN_ol, D_ol_cm และ converged
+        (SN_ol = 0 เมื่อโครงสร้างเดิมเพียงพอ, NaN เมื่อหา SN_f ไม่ได้)
+    """
+    if use_grid:
+        SN_f, converged = lookup_required_SN_array(W18_future, ZR, S0, MR, delta_PSI)
+    else:
+        SN_f, converged, _ = find_required_SN_array(W18_future, ZR, S0, MR, delta_PSI)
+
+    SN_ol = np.maximum(SN_f - np.asarray(SN_eff, dtype=float), 0.0)
+    D_ol_cm = round_up_thickness(inch_to_cm(SN_ol / (np.asarray(a_ol, dtype=float) * m_ol)), increment_cm)
+
+    return {
+        "SN_f": SN_f,
+        "SN_ol": SN_ol,
+        "D_ol_cm": D_ol_cm,
+        "converged": converged,
+    }
+
+
+def find_overlay_thickness(W18_future, params, layers, a_ol=DEFAULT_OVERLAY_A, m_ol=1.0):
+    """
+    ออกแบบชั้นเสริมผิวสำหรับสายทางเดียว (คู่กับ find_required_SN)
+
+    Parameters:
+        params: dict ของ ZR, S0, MR, delta_PSI
+        layers: ชั้นทางเดิมในรูปแบบเดียวกับ calculate_SN พร้อม condition_factor (ถ้ามี)
+
+    Returns:
+        dict: SN_f, SN_eff, SN_ol, D_ol_inch, D_ol_cm, details หรือ None เมื่อหา SN_f ไม่ได้
+    """
+    SN_f = find_required_SN(W18_future, params)
+    if SN_f is None:
+        return None
+
+    SN_eff, details = calculate_effective_SN(layers)
+    SN_ol = max(SN_f - SN_eff, 0.0)
+    D_ol_inch = SN_ol / (a_ol * m_ol)
+
+    return {
+        'SN_f': SN_f,
+        'SN_eff': SN_eff,
+        'SN_ol': SN_ol,
+        'D_ol_inch': D_ol_inch,
+        'D_ol_cm': D_ol_inch * 2.54,
+        'details': details,
+    }
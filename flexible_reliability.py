@@ -0,0 +1,256 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Reliability Analysis
+วิเคราะห์ความน่าเชื่อถือของโครงสร้างชั้นทางแบบยืดหยุ่นด้วย Monte Carlo Simulation
+
+ตัวแปรสุ่มกำหนดเป็น dict ของการแจกแจง เช่น
+    {"dist": "normal", "mean": 0.44, "std": 0.02}
+    {"dist": "lognormal", "mean": 10e6, "cov": 0.30}
+    {"dist": "uniform", "low": 0.9, "high": 1.1}
+หรือเป็นตัวเลขเดี่ยว (ค่าคงที่)
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+from scipy.special import ndtr
+
+from flexible_engine import (
+    calculate_log_W18_flexible_array,
+    calculate_dlog_W18_dSN_flexible_array,
+    calculate_SN_array,
+)
+
+
+DEFAULT_CHUNK_SIZE = 500_000
+
+
+def sample_distribution(spec, size, rng):
+    """สุ่มค่าจากการแจกแจงที่กำหนด (ตัวเลขเดี่ยว = ค่าคงที่)"""
+    if not isinstance(spec, dict):
+        return np.full(size, float(spec))
+
+    dist = spec["dist"]
+    if dist == "normal":
+        return rng.normal(spec["mean"], spec["std"], size)
+    if dist == "lognormal":
+        sigma2 = math.log(1 + spec["cov"] ** 2)
+        mu = math.log(spec["mean"]) - sigma2 / 2
+        return rng.lognormal(mu, math.sqrt(sigma2), size)
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    raise ValueError(f"ไม่รองรับการแจกแจง {dist}")
+
+
+def _simulate_chunk(task):
+    """
+    จำลองหนึ่ง chunk และคืนจำนวนตัวอย่างที่โครงสร้างรองรับ W₁₈ ได้
+    (ฟังก์ชันระดับ module เพื่อให้ส่งไปยัง process อื่นได้)
+    """
+    seed_sequence, size, W18, MR, layers, delta_PSI, model_std = task
+    rng = np.random.default_rng(seed_sequence)
+
+    W18_sample = sample_distribution(W18, size, rng)
+    MR_sample = sample_distribution(MR, size, rng)
+    a = np.column_stack([sample_distribution(layer["a"], size, rng) for layer in layers])
+    D_inch = np.column_stack([sample_distribution(layer["D_inch"], size, rng) for layer in layers])
+    m = np.column_stack([sample_distribution(layer.get("m", 1.0), size, rng) for layer in layers])
+
+    SN = calculate_SN_array(a, D_inch, m)
+    log_W18_capacity = calculate_log_W18_flexible_array(SN, 0.0, 0.0, MR_sample, delta_PSI)
+    if model_std > 0:
+        log_W18_capacity = log_W18_capacity + rng.normal(0.0, model_std, size)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        survived = log_W18_capacity >= np.log10(W18_sample)
+    return int(np.count_nonzero(survived))
+
+
+def monte_carlo_reliability(W18, MR, layers, delta_PSI, n_samples=1_000_000,
+                            chunk_size=DEFAULT_CHUNK_SIZE, seed=None, n_workers=1, model_std=0.0):
+    """
+    ประมาณความน่าจะเป็นที่โครงสร้างรองรับปริมาณจราจรออกแบบได้ P[W₁₈ capacity ≥ W₁₈]
+
+    Capacity คำนวณจากสมการ AASHTO 1993 ที่ ZR = 0 (ค่าเฉลี่ย) โดยความไม่แน่นอนมาจาก
+    ตัวแปรที่สุ่มโดยตรง และ model_std (ส่วนเบี่ยงเบนมาตรฐานของ log W₁₈ จากตัวสมการเอง)
+
+    Parameters:
+        W18, MR: การแจกแจงของ W₁₈ ออกแบบ (ESAL) และ MR ดินฐานราก (psi)
+        layers: รายการชั้นทาง [{"a": ..., "D_inch": ..., "m": ...}, ...] แต่ละค่าเป็นการแจกแจง
+        delta_PSI: ΔPSI (ค่าคงที่)
+        chunk_size: จำนวนตัวอย่างต่อ chunk (จำกัดหน่วยความจำที่ใช้)
+        seed: seed ของ random stream (ผลลัพธ์เหมือนเดิมทุกครั้งไม่ขึ้นกับ n_workers)
+        n_workers: จำนวน process ที่ใช้คำนวณ chunk พร้อมกัน
+
+    Returns:
+        dict: reliability, std_error, ci_95 (ช่วงความเชื่อมั่น 95%),
+        beta (reliability index ที่เทียบเท่า = -ZR), n_samples, n_survived
+    """
+    n_samples = int(n_samples)
+    n_chunks = max(1, math.ceil(n_samples / chunk_size))
+    sizes = [chunk_size] * (n_chunks - 1) + [n_samples - chunk_size * (n_chunks - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    tasks = [(s, size, W18, MR, layers, delta_PSI, model_std) for s, size in zip(seeds, sizes)]
+
+    if n_workers > 1 and n_chunks > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            n_survived = sum(executor.map(_simulate_chunk, tasks))
+    else:
+        n_survived = sum(map(_simulate_chunk, tasks))
+
+    reliability = n_survived / n_samples
+    std_error = math.sqrt(reliability * (1 - reliability) / n_samples)
+    if 0 < reliability < 1:
+        beta = NormalDist().inv_cdf(reliability)
+    else:
+        beta = math.copysign(math.inf, reliability - 0.5)
+
+    return {
+        'reliability': reliability,
+        'std_error': std_error,
+        'ci_95': (reliability - 1.96 * std_error, reliability + 1.96 * std_error),
+        'beta': beta,
+        'n_samples': n_samples,
+        'n_survived': n_survived,
+    }
+
+
+# ==========================================
+# First-Order Reliability Method (FORM)
+# ==========================================
+
+def _form_variables(W18, MR, layers, model_std):
+    """
+    รวบรวมตัวแปรสุ่มทั้งหมดเป็นรายการ (ชื่อ, การแจกแจง)
+    ตัวแปรที่เป็นค่าคงที่จะไม่อยู่ในรายการ
+    """
+    variables = [("W18", W18), ("MR", MR)]
+    for i, layer in enumerate(layers):
+        for key, name in (("a", "a"), ("D_inch", "D"), ("m", "m")):
+            variables.append((f"{name}{i+1}", layer.get(key, 1.0)))
+    if model_std > 0:
+        variables.append(("model", {"dist": "normal", "mean": 0.0, "std": model_std}))
+    return variables
+
+
+def _to_physical(spec, u):
+    """
+    แปลงตัวแปรจาก standard normal space (u) เป็นค่าจริง (x)
+
+    Returns:
+        tuple: (x, dx/du)
+    """
+    if not isinstance(spec, dict):
+        x = np.broadcast_to(np.asarray(spec, dtype=float), u.shape)
+        return x, np.zeros_like(u)
+
+    if spec["dist"] == "normal":
+        std = np.asarray(spec["std"], dtype=float)
+        return spec["mean"] + std * u, np.broadcast_to(std, u.shape)
+    if spec["dist"] == "lognormal":
+        cov = np.asarray(spec["cov"], dtype=float)
+        zeta = np.sqrt(np.log(1 + cov ** 2))
+        lam = np.log(spec["mean"]) - zeta ** 2 / 2
+        x = np.exp(lam + zeta * u)
+        return x, zeta * x
+    raise ValueError(f"FORM รองรับเฉพาะการแจกแจง normal และ lognormal (ได้รับ {spec['dist']})")
+
+
+def _limit_state(x, names, n_layers, delta_PSI):
+    """
+    Limit state g = log W₁₈ capacity - log W₁₈ และ gradient เทียบกับ x (เชิงวิเคราะห์)
+    """
+    index = {name: i for i, name in enumerate(names)}
+    a = np.stack([x[..., index[f"a{i+1}"]] for i in range(n_layers)], axis=-1)
+    D = np.stack([x[..., index[f"D{i+1}"]] for i in range(n_layers)], axis=-1)
+    m = np.stack([x[..., index[f"m{i+1}"]] for i in range(n_layers)], axis=-1)
+    W18, MR = x[..., index["W18"]], x[..., index["MR"]]
+
+    SN = calculate_SN_array(a, D, m)
+    g = calculate_log_W18_flexible_array(SN, 0.0, 0.0, MR, delta_PSI) - np.log10(W18)
+    dg_dSN = calculate_dlog_W18_dSN_flexible_array(SN, delta_PSI)
+
+    grad = np.zeros_like(x)
+    grad[..., index["W18"]] = -1 / (W18 * math.log(10))
+    grad[..., index["MR"]] = 2.32 / (MR * math.log(10))
+    for i in range(n_layers):
+        grad[..., index[f"a{i+1}"]] = dg_dSN * D[..., i] * m[..., i]
+        grad[..., index[f"D{i+1}"]] = dg_dSN * a[..., i] * m[..., i]
+        grad[..., index[f"m{i+1}"]] = dg_dSN * a[..., i] * D[..., i]
+    if "model" in index:
+        g = g + x[..., index["model"]]
+        grad[..., index["model"]] = 1.0
+
+    return g, grad
+
+
+def form_reliability(W18, MR, layers, delta_PSI, model_std=0.0, tol=1e-6, max_iter=100):
+    """
+    คำนวณ Reliability Index (β) ด้วยวิธี FORM (Hasofer-Lind / Rackwitz-Fiessler)
+    สำหรับหลายสายทางพร้อมกัน
+
+    Limit state: g = log W₁₈ capacity(SN = Σ aᵢDᵢmᵢ, MR, ΔPSI) - log W₁₈
+    ใช้ gradient เชิงวิเคราะห์ของสมการ AASHTO 1993
+
+    Parameters:
+        W18, MR, layers: การแจกแจงในรูปแบบเดียวกับ monte_carlo_reliability
+            (รองรับ normal และ lognormal; mean/std/cov เป็น array ต่อสายทางได้)
+        delta_PSI: ΔPSI (ค่าคงที่หรือ array ต่อสายทาง)
+
+    Returns:
+        dict:
+        - beta, reliability = Φ(β)
+        - design_point, alpha: dict ชื่อตัวแปร → array (จุดออกแบบและ sensitivity factor)
+          α² ของทุกตัวแปรรวมกันเท่ากับ 1 ค่า α > 0 คือตัวแปรที่เพิ่มขึ้นแล้วทำให้ความน่าเชื่อถือลดลง
+        - converged, iterations
+    """
+    variables = _form_variables(W18, MR, layers, model_std)
+    names = [name for name, _ in variables]
+    specs = [spec for _, spec in variables]
+
+    shape = np.broadcast_shapes(
+        np.shape(delta_PSI),
+        *(np.shape(v) for spec in specs if isinstance(spec, dict) for v in spec.values()
+          if not isinstance(v, str)),
+        *(np.shape(spec) for spec in specs if not isinstance(spec, dict)),
+    )
+    delta_PSI = np.broadcast_to(np.asarray(delta_PSI, dtype=float), shape)
+
+    def evaluate(u):
+        x, dx_du = zip(*(_to_physical(spec, u[..., i]) for i, spec in enumerate(specs)))
+        x = np.stack(x, axis=-1)
+        g, grad_x = _limit_state(x, names, len(layers), delta_PSI)
+        return x, g, grad_x * np.stack(dx_du, axis=-1)
+
+    u = np.zeros(shape + (len(names),))
+    converged = np.zeros(shape, dtype=bool)
+    iterations = np.zeros(shape, dtype=int)
+
+    for _ in range(max_iter):
+        active = ~converged
+        if not active.any():
+            break
+        _, g, grad_u = evaluate(u)
+        norm2 = np.sum(grad_u ** 2, axis=-1)
+        u_next = ((np.sum(grad_u * u, axis=-1) - g) / norm2)[..., None] * grad_u
+        step = np.sqrt(np.sum((u_next - u) ** 2, axis=-1))
+
+        u = np.where(active[..., None], u_next, u)
+        iterations += active
+        converged |= active & (step < tol)
+
+    x, g, grad_u = evaluate(u)
+    alpha = grad_u / np.sqrt(np.sum(grad_u ** 2, axis=-1))[..., None]
+    # ทิศทางของ u* เทียบกับ α บอกเครื่องหมายของ β (β < 0 เมื่อค่าเฉลี่ยอยู่ในบริเวณวิบัติ)
+    beta = -np.sum(alpha * u, axis=-1)
+
+    return {
+        'beta': beta,
+        'reliability': ndtr(beta),
+        'design_point': {name: x[..., i] for i, name in enumerate(names)},
+        'alpha': {name: -alpha[..., i] for i, name in enumerate(names)},
+        'converged': converged,
+        'iterations': iterations,
+    }
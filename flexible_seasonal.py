@@ -0,0 +1,80 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Seasonal Effective Roadbed Resilient Modulus
+คำนวณ MR ประสิทธิผล (Effective MR) จากค่า MR หรือ CBR รายเดือน/รายครึ่งเดือน
+
+Relative damage: u_f = 1.18×10⁸ × MR^-2.32
+Effective MR   : MR_eff = (ū_f / 1.18×10⁸)^(-1/2.32)
+"""
+
+import re
+
+import numpy as np
+
+from flexible_engine import calculate_MR_from_CBR_array
+
+
+# จำนวนช่วงเวลาที่รองรับ (รายเดือน / รายครึ่งเดือน)
+SEASON_COUNTS = (12, 24)
+
+
+def calculate_relative_damage_flexible(MR):
+    """Relative damage u_f = 1.18×10⁸ × MR^-2.32 (MR ในหน่วย psi)"""
+    MR = np.asarray(MR, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(MR > 0, 1.18e8 * MR ** -2.32, np.nan)
+
+
+def calculate_effective_MR_array(MR_seasonal):
+    """
+    คำนวณ MR ประสิทธิผลของหลายสายทางพร้อมกัน
+
+    Parameters:
+        MR_seasonal: array รูปร่าง (..., 12) หรือ (..., 24) ค่า MR (psi) ของแต่ละช่วงเวลา
+
+    Returns:
+        tuple: (MR_eff, u_f เฉลี่ย)
+    """
+    MR_seasonal = np.asarray(MR_seasonal, dtype=float)
+    if MR_seasonal.shape[-1] not in SEASON_COUNTS:
+        raise ValueError(f"ต้องมีค่า MR 12 หรือ 24 ค่าต่อสายทาง (ได้รับ {MR_seasonal.shape[-1]})")
+
+    u_f_mean = calculate_relative_damage_flexible(MR_seasonal).mean(axis=-1)
+    MR_eff = (u_f_mean / 1.18e8) ** (-1 / 2.32)
+    return MR_eff, u_f_mean
+
+
+def calculate_effective_MR_from_CBR_array(CBR_seasonal):
+    """คำนวณ MR ประสิทธิผลจากค่า CBR รายช่วงเวลา (แปลง CBR เป็น MR ก่อน)"""
+    return calculate_effective_MR_array(calculate_MR_from_CBR_array(CBR_seasonal))
+
+
+def get_seasonal_columns(columns):
+    """
+    หาคอลัมน์ค่าตามฤดูกาล MR_1 ... MR_12 (หรือ CBR_1 ... CBR_24)
+
+    Returns:
+        tuple: (ชนิด "MR" / "CBR" หรือ None, รายชื่อคอลัมน์เรียงตามช่วงเวลา)
+    """
+    for kind in ("MR", "CBR"):
+        matches = [(int(m.group(1)), c) for m, c in
+                   ((re.fullmatch(rf"{kind}_(\d+)", c), c) for c in columns) if m]
+        if matches:
+            return kind, [c for _, c in sorted(matches)]
+    return None, []
+
+
+def calculate_effective_MR_frame(df):
+    """
+    คำนวณ MR ประสิทธิผลของทุกแถวในตารางฤดูกาล (DataFrame จากไฟล์ CSV)
+
+    Returns:
+        tuple: (MR_eff, u_f เฉลี่ย) เป็น array หนึ่งค่าต่อแถว
+    """
+    kind, columns = get_seasonal_columns(df.columns)
+    if kind is None:
+        raise ValueError("ไม่พบคอลัมน์ค่าตามฤดูกาล (MR_1 ... MR_12 หรือ CBR_1 ... CBR_12)")
+
+    values = df[columns].to_numpy(dtype=float)
+    if kind == "CBR":
+        return calculate_effective_MR_from_CBR_array(values)
+    return calculate_effective_MR_array(values)
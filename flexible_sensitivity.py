@@ -0,0 +1,119 @@
+"""
+AASHTO 1993 Flexible Pavement Design - Global Sensitivity Analysis
+วิเคราะห์ความไวแบบ Variance-based (Sobol indices) ของ SN ที่ต้องการ
+
+ใช้ Saltelli sampling: สุ่ม matrix A, B และ AB_i (คอลัมน์ i ของ A แทนด้วย B)
+    First-order  Sᵢ  = E[f(B)·(f(AB_i) - f(A))] / V(Y)          (Saltelli 2010)
+    Total-order  STᵢ = E[(f(A) - f(AB_i))²] / (2·V(Y))           (Jansen 1999)
+"""
+
+import numpy as np
+import pandas as pd
+
+from flexible_engine import get_ZR_array, find_required_SN_array
+from flexible_reliability import sample_distribution
+
+
+# ปัจจัยของแบบจำลอง SN ที่ต้องการ และค่าเริ่มต้น
+SOBOL_FACTORS = ("W18", "reliability", "S0", "delta_PSI", "MR")
+
+DEFAULT_SOBOL_FACTORS = {
+    "W18": {"dist": "lognormal", "mean": 10e6, "cov": 0.30},
+    "reliability": {"dist": "uniform", "low": 80, "high": 99},
+    "S0": {"dist": "uniform", "low": 0.40, "high": 0.50},
+    "delta_PSI": {"dist": "uniform", "low": 1.5, "high": 2.2},
+    "MR": {"dist": "lognormal", "mean": 14939, "cov": 0.25},
+}
+
+# จำนวนรอบ bootstrap ที่คำนวณพร้อมกันในแต่ละกลุ่ม
+BOOTSTRAP_BATCH = 20
+
+
+def _required_SN_model(X, SN_range):
+    """แบบจำลอง: คอลัมน์ของ X เรียงตาม SOBOL_FACTORS → SN ที่ต้องการ"""
+    W18, reliability, S0, delta_PSI, MR = np.moveaxis(X, -1, 0)
+    SN, converged, _ = find_required_SN_array(
+        W18, get_ZR_array(reliability), S0, MR, delta_PSI,
+        SN_min=SN_range[0], SN_max=SN_range[1]
+    )
+    return np.where(converged, SN, np.nan)
+
+
+def _sobol_estimates(f_A, f_B, f_AB):
+    """
+    คำนวณ Sᵢ และ STᵢ จากผลของแบบจำลอง
+    f_A, f_B รูปร่าง (..., N) และ f_AB รูปร่าง (..., k, N)
+    """
+    Y_AB = np.concatenate([f_A, f_B], axis=-1)
+    # ลบค่าเฉลี่ยออกก่อน เพื่อลดความแปรปรวนของตัวประมาณ Sᵢ
+    mean = Y_AB.mean(axis=-1, keepdims=True)
+    f_A, f_B, f_AB = f_A - mean, f_B - mean, f_AB - mean[..., None, :]
+    variance = np.var(Y_AB, axis=-1)[..., None]
+    S1 = np.mean(f_B[..., None, :] * (f_AB - f_A[..., None, :]), axis=-1) / variance
+    ST = 0.5 * np.mean((f_A[..., None, :] - f_AB) ** 2, axis=-1) / variance
+    return S1, ST
+
+
+def sobol_indices(factors=None, n_samples=10_000, seed=None, n_bootstrap=200, confidence=0.95,
+                  SN_range=(1.0, 25.0)):
+    """
+    คำนวณ Sobol indices ของ SN ที่ต้องการเทียบกับ W₁₈, Reliability, S₀, ΔPSI และ MR
+
+    จำนวนครั้งที่เรียกแบบจำลอง = n_samples × (k + 2) โดย k = จำนวนปัจจัยที่เป็นตัวแปรสุ่ม
+    ทุกครั้งคำนวณรวมในการเรียก find_required_SN_array ครั้งเดียว
+
+    Parameters:
+        factors: dict ชื่อปัจจัย → การแจกแจง (รูปแบบเดียวกับ flexible_reliability)
+            หรือตัวเลข (ค่าคงที่) ปัจจัยที่ไม่ระบุใช้ค่าจาก DEFAULT_SOBOL_FACTORS
+        n_bootstrap: จำนวนรอบ bootstrap สำหรับช่วงความเชื่อมั่น
+
+    Returns:
+        DataFrame หนึ่งแถวต่อปัจจัยที่เป็นตัวแปรสุ่ม: S1, S1_low, S1_high, ST, ST_low, ST_high
+    """
+    factors = {**DEFAULT_SOBOL_FACTORS, **(factors or {})}
+    unknown = set(factors) - set(SOBOL_FACTORS)
+    if unknown:
+        raise ValueError(f"ไม่รู้จักปัจจัย {sorted(unknown)}")
+
+    rng = np.random.default_rng(seed)
+    A = np.column_stack([sample_distribution(factors[name], n_samples, rng) for name in SOBOL_FACTORS])
+    B = np.column_stack([sample_distribution(factors[name], n_samples, rng) for name in SOBOL_FACTORS])
+
+    random_factors = [i for i, name in enumerate(SOBOL_FACTORS) if isinstance(factors[name], dict)]
+    AB = np.repeat(A[None, :, :], len(random_factors), axis=0)
+    for j, i in enumerate(random_factors):
+        AB[j, :, i] = B[:, i]
+
+    # รวมทุก matrix แล้วคำนวณในการเรียกแบบจำลองครั้งเดียว
+    Y = _required_SN_model(np.concatenate([A[None], B[None], AB], axis=0), SN_range)
+    f_A, f_B, f_AB = Y[0], Y[1], Y[2:]
+
+    # ตัดแถวที่แบบจำลองหาคำตอบไม่ได้ (SN เกินช่วง) ออกจากทุก matrix
+    valid = np.isfinite(Y).all(axis=0)
+    f_A, f_B, f_AB = f_A[valid], f_B[valid], f_AB[:, valid]
+
+    S1, ST = _sobol_estimates(f_A, f_B, f_AB)
+
+    # Bootstrap ทีละกลุ่มเพื่อจำกัดหน่วยความจำ
+    n_valid = f_A.size
+    S1_boot, ST_boot = [], []
+    for start in range(0, n_bootstrap, BOOTSTRAP_BATCH):
+        boot = rng.integers(0, n_valid, size=(min(BOOTSTRAP_BATCH, n_bootstrap - start), n_valid))
+        S1_b, ST_b = _sobol_estimates(f_A[boot], f_B[boot], np.moveaxis(f_AB[:, boot], 0, 1))
+        S1_boot.append(S1_b)
+        ST_boot.append(ST_b)
+    S1_boot = np.concatenate(S1_boot)
+    ST_boot = np.concatenate(ST_boot)
+    q = [(1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100]
+    S1_low, S1_high = np.percentile(S1_boot, q, axis=0)
+    ST_low, ST_high = np.percentile(ST_boot, q, axis=0)
+
+    return pd.DataFrame({
+        "factor": [SOBOL_FACTORS[i] for i in random_factors],
+        "S1": S1,
+        "S1_low": S1_low,
+        "S1_high": S1_high,
+        "ST": ST,
+        "ST_low": ST_low,
+        "ST_high": ST_high,
+    })
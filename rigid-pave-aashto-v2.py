@@ -6,34 +6,57 @@
 สำหรับ: อาจารย์อิทธิพล, ภาควิชาครุศาสตร์โยธา, มจพ.
 """
 
+import io
+import os
+
 import streamlit as st
 import numpy as np
 import math
 import pandas as pd
+from PIL import Image
 
 # Import matplotlib with proper backend
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch
+
+from aashto_reliability import get_ZR_array
+from rigid_cube import (
+    RIGID_CUBE_PATH,
+    open_result_cube,
+    get_axis_index,
+    slice_result_cube,
+    required_thickness_from_cube,
+)
+from rigid_engine import (
+    KSC_TO_PSI,
+    CM_TO_INCH,
+    INCH_TO_CM,
+    MPA_TO_PSI,
+    PCI_TO_MPA_M,
+    MPA_M_TO_PCI,
+    PSI_TO_KSC,
+    PSI_TO_MPA,
+    M_TO_FT,
+)
+from rigid_pipeline import (
+    MATERIAL_TYPES,
+    DEFAULT_MODULUS_MPA,
+    prepare_inputs,
+    call_stage,
+    run_stages,
+)
+from rigid_inverse import (
+    INVERSE_LIMITS,
+    SOLVE_BELOW_RANGE,
+    SOLVE_ABOVE_RANGE,
+    solve_rigid_array,
+)
 
 # Configure matplotlib
 plt.rcParams['font.family'] = 'DejaVu Sans'
 plt.rcParams['axes.unicode_minus'] = False
 
-# =============================================
-# Unit Conversion Constants
-# =============================================
-KSC_TO_PSI = 14.223          # 1 ksc = 14.223 psi
-PSI_TO_KSC = 1 / 14.223      # 1 psi = 0.0703 ksc
-CM_TO_INCH = 1 / 2.54        # 1 cm = 0.3937 inch
-INCH_TO_CM = 2.54            # 1 inch = 2.54 cm
-MPA_TO_PSI = 145.038         # 1 MPa = 145.038 psi
-PSI_TO_MPA = 1 / 145.038     # 1 psi = 0.006895 MPa
-PCI_TO_MPA_M = 0.2714        # 1 pci = 0.2714 MPa/m (MN/m³)
-MPA_M_TO_PCI = 1 / 0.2714    # 1 MPa/m = 3.684 pci
-
 # =============================================
 # Page Configuration
 # =============================================
@@ -112,14 +135,7 @@ W18 = st.sidebar.number_input(
 st.sidebar.subheader("📈 ความน่าเชื่อถือ")
 R = st.sidebar.slider("Reliability (R) %", min_value=50, max_value=99, value=90)
 
-# Standard Normal Deviate (ZR) lookup table
-ZR_table = {
-    50: 0.000, 60: -0.253, 70: -0.524, 75: -0.674,
-    80: -0.841, 85: -1.037, 90: -1.282, 91: -1.340,
-    92: -1.405, 93: -1.476, 94: -1.555, 95: -1.645,
-    96: -1.751, 97: -1.881, 98: -2.054, 99: -2.327
-}
-ZR = ZR_table.get(R, -1.282)
+ZR = float(get_ZR_array(R))
 
 So = st.sidebar.number_input(
     "Standard Deviation (S₀)",
@@ -194,41 +210,31 @@ with col1:
     with col_ls:
         LS = st.number_input("Loss of Support (LS)", min_value=0.0, max_value=3.0, value=1.0, step=0.5)
 
+    use_rigid_foundation = st.checkbox(
+        "มีชั้นหินแข็ง (Rigid Foundation) ลึกไม่เกิน 3 ม.",
+        value=False,
+        help="ปรับ Composite k ตามความลึกถึงชั้นหินแข็ง (AASHTO 1993 Figure 3.4)"
+    )
+    if use_rigid_foundation:
+        rigid_foundation_depth_m = st.number_input(
+            "ความลึกถึงชั้นหินแข็ง (ม.)",
+            min_value=0.3,
+            max_value=3.0,
+            value=1.5,
+            step=0.1,
+            help="วัดจากผิวดินเดิม"
+        )
+        D_SG_ft = rigid_foundation_depth_m * M_TO_FT
+        st.markdown(f'<span class="unit-note">= {D_SG_ft:.1f} ft</span>', unsafe_allow_html=True)
+    else:
+        rigid_foundation_depth_m = None
+        D_SG_ft = math.inf
+
 # =============================================
 # Layer Input Section
 # =============================================
 st.markdown('<div class="sub-header">📚 ข้อมูลชั้นทาง (5 ชั้น)</div>', unsafe_allow_html=True)
 
-# Material Types
-material_types = [
-    "PCC (Portland Cement Concrete)",
-    "Cement Treated Base (CTB)",
-    "Lime Treated Base (LTB)",
-    "Asphalt Treated Base (ATB)",
-    "Crushed Stone Base",
-    "Soil Cement",
-    "Granular Subbase",
-    "Sand Subbase",
-    "Improved Subgrade",
-    "Natural Subgrade",
-    "Not Used"
-]
-
-# Default modulus values in MPa
-default_modulus_mpa = {
-    "PCC (Portland Cement Concrete)": 28000,
-    "Cement Treated Base (CTB)": 7000,
-    "Lime Treated Base (LTB)": 280,
-    "Asphalt Treated Base (ATB)": 2400,
-    "Crushed Stone Base": 200,
-    "Soil Cement": 3500,
-    "Granular Subbase": 140,
-    "Sand Subbase": 100,
-    "Improved Subgrade": 70,
-    "Natural Subgrade": 35,
-    "Not Used": 0
-}
-
 # Default thickness in cm
 default_thickness_cm = {
     0: 25.0,   # PCC
@@ -238,38 +244,8 @@ default_thickness_cm = {
     4: 10.0
 }
 
-# Colors for visualization
-material_colors = {
-    "PCC (Portland Cement Concrete)": "#808080",
-    "Cement Treated Base (CTB)": "#D2B48C",
-    "Lime Treated Base (LTB)": "#F5DEB3",
-    "Asphalt Treated Base (ATB)": "#2C2C2C",
-    "Crushed Stone Base": "#A0522D",
-    "Soil Cement": "#CD853F",
-    "Granular Subbase": "#DEB887",
-    "Sand Subbase": "#F4A460",
-    "Improved Subgrade": "#8B4513",
-    "Natural Subgrade": "#654321",
-    "Not Used": "#FFFFFF"
-}
-
-# Short names for figure
-layer_names_short = {
-    "PCC (Portland Cement Concrete)": "PCC",
-    "Cement Treated Base (CTB)": "CTB",
-    "Lime Treated Base (LTB)": "LTB",
-    "Asphalt Treated Base (ATB)": "ATB",
-    "Crushed Stone Base": "Crushed Stone",
-    "Soil Cement": "Soil Cement",
-    "Granular Subbase": "Granular Subbase",
-    "Sand Subbase": "Sand Subbase",
-    "Improved Subgrade": "Improved Subgrade",
-    "Natural Subgrade": "Natural Subgrade",
-    "Not Used": "-"
-}
-
 # Initialize layer data
-layers = []
+layer_specs = []
 
 st.markdown("#### กำหนดวัสดุและความหนาแต่ละชั้น")
 
@@ -287,7 +263,7 @@ for i in range(5):
             else:
                 default_idx = 10
             
-            material = st.selectbox(f"Material Type", material_types, index=default_idx, key=f"mat_{i}")
+            material = st.selectbox(f"Material Type", MATERIAL_TYPES, index=default_idx, key=f"mat_{i}")
         
         with col_thick:
             if material == "Not Used":
@@ -314,110 +290,61 @@ for i in range(5):
                     "Modulus (MPa)", 
                     min_value=10.0, 
                     max_value=70000.0,
-                    value=float(default_modulus_mpa[material]), 
+                    value=float(DEFAULT_MODULUS_MPA[material]), 
                     step=10.0, 
                     key=f"mod_{i}"
                 )
                 modulus_psi = modulus_mpa * MPA_TO_PSI
                 st.markdown(f'<span class="unit-note">({modulus_psi:,.0f} psi)</span>', unsafe_allow_html=True)
         
-        # Convert to inches and psi for calculations
-        thickness_in = thickness_cm * CM_TO_INCH
-        modulus_psi = modulus_mpa * MPA_TO_PSI
-        
-        layers.append({
-            "material": material,
-            "thickness_cm": thickness_cm,
-            "thickness_in": thickness_in,
-            "modulus_mpa": modulus_mpa,
-            "modulus_psi": modulus_psi,
-            "color": material_colors[material],
-            "name_short": layer_names_short[material]
-        })
+        layer_specs.append({"material": material, "thickness_cm": thickness_cm, "modulus_mpa": modulus_mpa})
+
+# ข้อมูลนำเข้าของ pipeline (หน่วยเดียวกับหน้าโปรแกรม)
+scenario = {
+    "W18": W18, "R": R, "So": So, "Pi": Pi, "Pt": Pt, "Cd": Cd, "J": J,
+    "Sc_ksc": Sc_ksc, "Ec_mpa": Ec_mpa, "k_subgrade_mpa_m": k_subgrade_mpa_m, "LS": LS,
+    "rigid_foundation_depth_m": rigid_foundation_depth_m, "layers": layer_specs,
+}
+inputs = prepare_inputs(scenario)
+layers = inputs["layers"]
+
 
 # =============================================
-# Calculate Composite k-value
+# Staged Calculation (k → thickness → diagram / summary)
 # =============================================
-def calculate_composite_k(k_subgrade_pci, layers, Ec_psi):
-    subbase_layers = [l for l in layers[1:] if l["material"] != "Not Used" and l["thickness_in"] > 0]
-    
-    if not subbase_layers:
-        return k_subgrade_pci
-    
-    total_subbase_thickness = sum(l["thickness_in"] for l in subbase_layers)
-    
-    if total_subbase_thickness > 0:
-        weighted_modulus = sum(l["modulus_psi"] * l["thickness_in"] for l in subbase_layers) / total_subbase_thickness
-    else:
-        weighted_modulus = k_subgrade_pci
-    
-    Dsb = total_subbase_thickness
-    Esb = weighted_modulus
-    
-    improvement_factor = 1 + (Dsb / 20) * (Esb / 30000) ** 0.33
-    k_composite = min(k_subgrade_pci * improvement_factor, 800)
-    
-    return k_composite
+@st.cache_data(max_entries=512, show_spinner=False)
+def run_cached_stage(stage, stage_key, _stage_inputs, _stage_upstream):
+    """
+    คำนวณ stage ของ rigid_pipeline แบบ cache ตาม stage_key (ค่าที่ stage นั้นใช้จริงเท่านั้น)
+    cache ใช้ร่วมกันทุก session จึงคำนวณใหม่เฉพาะ stage ที่ค่าที่ใช้เปลี่ยน
+    """
+    return call_stage(stage, _stage_inputs, _stage_upstream)
+
+
+# st.image ย่อภาพที่กว้างเกิน 2 × 730 px และเข้ารหัสใหม่ทุกครั้งที่ rerun จึงย่อไว้ก่อนใน cache
+DIAGRAM_DISPLAY_WIDTH = 2 * 730
 
-k_composite_pci = calculate_composite_k(k_subgrade_pci, layers, Ec_psi)
-k_effective_pci = k_composite_pci * (10 ** (-LS / 3))
-k_effective_pci = max(k_effective_pci, 25)
 
-# Convert k_effective to MPa/m for display
-k_effective_mpa_m = k_effective_pci * PCI_TO_MPA_M
-k_composite_mpa_m = k_composite_pci * PCI_TO_MPA_M
+@st.cache_data(max_entries=64, show_spinner=False)
+def fit_diagram_width(png_bytes, max_width=DIAGRAM_DISPLAY_WIDTH):
+    """ย่อภาพ PNG ให้กว้างไม่เกิน max_width (วิธีเดียวกับ st.image) ภาพที่แสดงจึงเหมือนเดิม"""
+    image = Image.open(io.BytesIO(png_bytes))
+    if image.width <= max_width:
+        return png_bytes
+    image = image.resize((max_width, int(1.0 * image.height * max_width / image.width)), resample=Image.BILINEAR)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+stage_results = run_stages(inputs, run_stage=run_cached_stage)
 
 # =============================================
-# AASHTO 1993 Design Equation
+# Calculate Composite k-value
 # =============================================
-def calculate_log_W18(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k):
-    """D in inches, Sc in psi, Ec in psi, k in pci"""
-    term1 = ZR * So
-    term2 = 7.35 * np.log10(D + 1) - 0.06
-    
-    numerator3 = np.log10(delta_PSI / (4.5 - 1.5))
-    denominator3 = 1 + (1.624e7) / ((D + 1) ** 8.46)
-    term3 = numerator3 / denominator3
-    
-    Pt_val = 4.5 - delta_PSI
-    coeff4 = 4.22 - 0.32 * Pt_val
-    
-    D_power = D ** 0.75
-    Ec_k_ratio = (Ec / k) ** 0.25
-    
-    numerator4 = Sc * Cd * (D_power - 1.132)
-    denominator4 = 215.63 * J * (D_power - 18.42 / Ec_k_ratio)
-    
-    if denominator4 <= 0 or numerator4 <= 0:
-        return -999
-    
-    term4 = coeff4 * np.log10(numerator4 / denominator4)
-    
-    return term1 + term2 + term3 + term4
-
-def find_required_thickness(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k):
-    """Returns thickness in inches"""
-    target_log_W18 = np.log10(W18)
-    D_min, D_max = 6.0, 16.0
-    tolerance = 0.01
-    
-    for _ in range(100):
-        D_mid = (D_min + D_max) / 2
-        calc_log_W18 = calculate_log_W18(D_mid, ZR, So, delta_PSI, Sc, Cd, J, Ec, k)
-        
-        if calc_log_W18 == -999:
-            D_min = D_mid
-            continue
-        
-        if abs(calc_log_W18 - target_log_W18) < tolerance:
-            return D_mid
-        
-        if calc_log_W18 < target_log_W18:
-            D_min = D_mid
-        else:
-            D_max = D_mid
-    
-    return D_mid
+k_values = stage_results["k"]
+k_composite_pci, k_effective_pci = k_values["k_composite_pci"], k_values["k_effective_pci"]
+k_composite_mpa_m, k_effective_mpa_m = k_values["k_composite_mpa_m"], k_values["k_effective_mpa_m"]
 
 # =============================================
 # Calculate Required Thickness
@@ -425,20 +352,14 @@ def find_required_thickness(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k):
 st.markdown("---")
 st.markdown('<div class="sub-header">📐 ผลการคำนวณ (Design Results)</div>', unsafe_allow_html=True)
 
-# Calculate using psi and inches (AASHTO units)
-D_required_in = find_required_thickness(W18, ZR, So, delta_PSI, Sc_psi, Cd, J, Ec_psi, k_effective_pci)
-D_required_cm = D_required_in * INCH_TO_CM
-
-# Round up to nearest 0.5 cm
-D_design_cm = np.ceil(D_required_cm * 2) / 2
-D_design_in = D_design_cm * CM_TO_INCH
-
-# Update layer 0 (PCC) thickness
-layers[0]["thickness_cm"] = D_design_cm
-layers[0]["thickness_in"] = D_design_in
-
-log_W18_check = calculate_log_W18(D_design_in, ZR, So, delta_PSI, Sc_psi, Cd, J, Ec_psi, k_effective_pci)
-W18_capacity = 10 ** log_W18_check if log_W18_check > 0 else 0
+# Calculate using psi and inches (AASHTO units), design thickness rounded up to 0.5 cm
+thickness = stage_results["thickness"]
+if np.isnan(thickness["D_design_cm"]):
+    st.error("❌ ไม่สามารถหาความหนา PCC ได้ (ต้องการความหนาเกิน 60 นิ้ว หรือพารามิเตอร์ไม่ถูกต้อง)")
+    st.stop()
+D_required_in, D_required_cm = thickness["D_required_in"], thickness["D_required_cm"]
+D_design_in, D_design_cm = thickness["D_design_in"], thickness["D_design_cm"]
+W18_capacity = thickness["W18_capacity"]
 
 col_res1, col_res2, col_res3 = st.columns(3)
 
@@ -483,164 +404,67 @@ with st.expander("📊 รายละเอียดการคำนวณ (C
         st.write(f"- Concrete Modulus (Ec) = {Ec_mpa:,.0f} MPa ({Ec_psi:,.0f} psi)")
         st.write(f"- Subgrade k = {k_subgrade_mpa_m:.1f} MPa/m ({k_subgrade_pci:.1f} pci)")
         st.write(f"- Composite k = {k_composite_mpa_m:.1f} MPa/m ({k_composite_pci:.1f} pci)")
+        if rigid_foundation_depth_m is not None:
+            st.write(f"- Rigid Foundation Depth = {rigid_foundation_depth_m:.1f} m ({D_SG_ft:.1f} ft)")
         st.write(f"- Loss of Support (LS) = {LS}")
         st.write(f"- **k-effective = {k_effective_mpa_m:.1f} MPa/m ({k_effective_pci:.1f} pci)**")
 
-# =============================================
-# Draw Pavement Structure
-# =============================================
-st.markdown("---")
-st.markdown('<div class="sub-header">🎨 Pavement Structure Diagram</div>', unsafe_allow_html=True)
+# Inverse check: ค่าวัสดุ/ฐานรากที่ต้องการสำหรับความหนาที่เลือก
+with st.expander("🔄 Inverse Check (ค่าที่ต้องการเมื่อกำหนดความหนา)"):
+    D_check_cm = st.number_input(
+        "ความหนา PCC ที่ตรวจสอบ (cm)",
+        min_value=10.0,
+        max_value=max(60.0, float(D_design_cm)),
+        value=float(D_design_cm),
+        step=0.5,
+        key="inverse_D_cm"
+    )
+    inverse_params = dict(
+        W18=W18, D=D_check_cm * CM_TO_INCH, ZR=ZR, So=So, delta_PSI=delta_PSI,
+        Sc=Sc_psi, Cd=Cd, J=J, Ec=Ec_psi, k=k_effective_pci
+    )
+    inverse_results = {}
+    for variable in ("W18", "Sc", "k", "Ec"):
+        params = {name: value for name, value in inverse_params.items() if name != variable}
+        value, status = solve_rigid_array(variable, **params)
+        inverse_results[variable] = (float(value), int(status))
 
-active_layers = [l for l in layers if l["material"] != "Not Used" and l["thickness_cm"] > 0]
+    col_inv1, col_inv2, col_inv3, col_inv4 = st.columns(4)
+    W18_check, _ = inverse_results["W18"]
+    col_inv1.metric("W₁₈ ที่รองรับได้", f"{W18_check:,.0f}" if np.isfinite(W18_check) else "-")
 
-fig, ax = plt.subplots(figsize=(14, 10))
-ax.set_xlim(0, 14)
+    Sc_required, Sc_status = inverse_results["Sc"]
+    col_inv2.metric("Sc' ต่ำสุด", f"{Sc_required * PSI_TO_KSC:.1f} ksc" if np.isfinite(Sc_required) else "-")
 
-scale_factor = 0.12  # Scale for cm visualization
-base_y = 9
+    k_required, k_status = inverse_results["k"]
+    col_inv3.metric("k-effective ต่ำสุด", f"{k_required * PCI_TO_MPA_M:.1f} MPa/m" if np.isfinite(k_required) else "-")
 
-# Draw title
-ax.text(7, 9.8, "Rigid Pavement Structure (AASHTO 1993)", 
-        fontsize=16, fontweight='bold', ha='center', va='center')
-ax.text(7, 9.4, f"PCC Thickness = {D_design_cm:.1f} cm ({D_design_in:.2f} in)", 
-        fontsize=12, ha='center', va='center')
+    Ec_required, Ec_status = inverse_results["Ec"]
+    col_inv4.metric("Ec สูงสุด", f"{Ec_required * PSI_TO_MPA:,.0f} MPa" if np.isfinite(Ec_required) else "ไม่จำกัด")
 
-current_y = base_y
+    if k_status == SOLVE_BELOW_RANGE:
+        st.caption(f"k-effective ต่ำสุดของช่วงใช้งาน ({INVERSE_LIMITS['k'][0]:.0f} pci) ก็รองรับได้")
+    if SOLVE_ABOVE_RANGE in (Sc_status, k_status):
+        st.caption("ค่าที่ต้องการเกินช่วงใช้งานปกติ ควรเพิ่มความหนา")
 
-# Draw each layer
-for i, layer in enumerate(active_layers):
-    height = layer["thickness_cm"] * scale_factor
-    
-    rect = FancyBboxPatch(
-        (2, current_y - height), 10, height,
-        boxstyle="round,pad=0.02,rounding_size=0.1",
-        facecolor=layer["color"],
-        edgecolor='black',
-        linewidth=2,
-        alpha=0.9
-    )
-    ax.add_patch(rect)
-    
-    # Add texture patterns
-    if "PCC" in layer["material"]:
-        for j in range(int(10/0.5)):
-            for k in range(max(1, int(height/0.3))):
-                if (j + k) % 2 == 0:
-                    ax.plot(2.2 + j*0.5, current_y - 0.15 - k*0.3, 'o', 
-                           color='darkgray', markersize=2, alpha=0.5)
-    elif "Crushed" in layer["material"] or "Granular" in layer["material"]:
-        np.random.seed(42 + i)
-        for j in range(20):
-            for k in range(max(1, int(height/0.4))):
-                ax.plot(2.5 + j*0.5 + np.random.uniform(-0.1, 0.1), 
-                       current_y - 0.2 - k*0.4 + np.random.uniform(-0.05, 0.05), 
-                       '.', color='saddlebrown', markersize=3, alpha=0.4)
-    
-    mid_y = current_y - height/2
-    
-    # Layer name (left side)
-    ax.annotate(layer['name_short'], xy=(1.8, mid_y), ha='right', va='center',
-                fontsize=11, fontweight='bold')
-    
-    # Dimension lines (right side)
-    ax.annotate('', xy=(12.3, current_y), xytext=(12.3, current_y - height),
-                arrowprops=dict(arrowstyle='<->', color='red', lw=1.5))
-    
-    # Show thickness in cm (in)
-    ax.text(12.8, mid_y, f'{layer["thickness_cm"]:.1f} cm', 
-            fontsize=11, fontweight='bold', va='center', color='red')
-    ax.text(13.6, mid_y, f'({layer["thickness_in"]:.2f} in)', 
-            fontsize=9, va='center', color='darkred')
-    
-    # Modulus annotation in MPa (psi)
-    if layer["modulus_mpa"] > 0:
-        if layer["modulus_mpa"] >= 1000:
-            mod_text = f'E = {layer["modulus_mpa"]/1000:.1f} GPa'
-        else:
-            mod_text = f'E = {layer["modulus_mpa"]:.0f} MPa'
-        ax.text(7, mid_y, mod_text, fontsize=9, ha='center', va='center',
-               style='italic', alpha=0.8,
-               bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.7))
-    
-    current_y -= height
-
-# Draw subgrade
-subgrade_height = 1.5
-rect_sub = FancyBboxPatch(
-    (2, current_y - subgrade_height), 10, subgrade_height,
-    boxstyle="round,pad=0.02,rounding_size=0.1",
-    facecolor='#8B4513',
-    edgecolor='black',
-    linewidth=2,
-    alpha=0.7
-)
-ax.add_patch(rect_sub)
-
-np.random.seed(123)
-for j in range(25):
-    for k in range(3):
-        ax.plot(2.3 + j*0.4 + np.random.uniform(-0.05, 0.05), 
-               current_y - 0.25 - k*0.5 + np.random.uniform(-0.05, 0.05), 
-               '.', color='#654321', markersize=2, alpha=0.5)
-
-ax.text(1.8, current_y - subgrade_height/2, "Subgrade", 
-        ha='right', va='center', fontsize=11, fontweight='bold')
-ax.text(7, current_y - subgrade_height/2, f'k = {k_subgrade_mpa_m:.1f} MPa/m ({k_subgrade_pci:.1f} pci)', 
-        ha='center', va='center', fontsize=9, style='italic',
-        bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.7))
-
-# Total thickness dimension
-ax.annotate('', xy=(0.8, base_y), xytext=(0.8, current_y),
-            arrowprops=dict(arrowstyle='<->', color='blue', lw=2))
-total_cm = sum(l["thickness_cm"] for l in active_layers)
-total_in = total_cm * CM_TO_INCH
-ax.text(0.5, (base_y + current_y)/2, f'Total\n{total_cm:.1f} cm', 
-        fontsize=10, ha='center', va='center', fontweight='bold', color='blue',
-        bbox=dict(boxstyle='round,pad=0.3', facecolor='lightyellow', alpha=0.9))
-
-# Design info box
-info_text = (
-    f"Design Parameters:\n"
-    f"ESAL = {W18:,.0f}\n"
-    f"R = {R}%, ZR = {ZR:.3f}\n"
-    f"Sc' = {Sc_ksc} ksc\n"
-    f"k-eff = {k_effective_mpa_m:.1f} MPa/m\n"
-    f"Cd = {Cd}, J = {J}"
-)
-ax.text(13.8, base_y - 1, info_text, fontsize=8, va='top', ha='left',
-        bbox=dict(boxstyle='round,pad=0.4', facecolor='#E8F4FD', 
-                 edgecolor='#3498db', alpha=0.9))
-
-ax.set_ylim(current_y - subgrade_height - 0.5, 10.2)
-ax.set_aspect('equal')
-ax.axis('off')
-ax.set_facecolor('#FAFAFA')
+# =============================================
+# Draw Pavement Structure
+# =============================================
+st.markdown("---")
+st.markdown('<div class="sub-header">🎨 Pavement Structure Diagram</div>', unsafe_allow_html=True)
 
-plt.tight_layout()
-st.pyplot(fig)
+st.image(fit_diagram_width(stage_results["diagram"]), use_container_width=True)
 
 # =============================================
 # Summary Table
 # =============================================
 st.markdown('<div class="sub-header">📋 Pavement Structure Summary</div>', unsafe_allow_html=True)
 
-summary_data = []
-for i, layer in enumerate(active_layers):
-    summary_data.append({
-        "Layer": i + 1,
-        "Material": layer["name_short"],
-        "Thickness (cm)": f"{layer['thickness_cm']:.1f}",
-        "Thickness (in)": f"{layer['thickness_in']:.2f}",
-        "Modulus (MPa)": f"{layer['modulus_mpa']:,.0f}",
-        "Modulus (psi)": f"{layer['modulus_psi']:,.0f}"
-    })
-
-df_summary = pd.DataFrame(summary_data)
+df_summary = pd.DataFrame(stage_results["summary"]["rows"])
 st.dataframe(df_summary, use_container_width=True, hide_index=True)
 
 # Total Summary
-total_thickness_cm = sum(l['thickness_cm'] for l in active_layers)
+total_thickness_cm = stage_results["summary"]["total_thickness_cm"]
 total_thickness_in = total_thickness_cm * CM_TO_INCH
 
 st.markdown(f"""
@@ -654,6 +478,60 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
+# =============================================
+# What-if Analysis (Precomputed Result Cube)
+# =============================================
+@st.cache_resource
+def load_result_cube(path, modified_time):
+    """เปิด cube แบบ memory-mapped ครั้งเดียวต่อไฟล์ (modified_time ใช้ตรวจว่าไฟล์ถูกสร้างใหม่)"""
+    return open_result_cube(path)
+
+
+with st.expander("🔎 What-if Analysis (Result Cube)"):
+    if not os.path.exists(RIGID_CUBE_PATH):
+        st.info(
+            "ยังไม่มีไฟล์ Result Cube สร้างได้ด้วยคำสั่ง "
+            f"`python rigid_cube.py --So {So} --delta-psi {delta_PSI:.2f} --Cd {Cd}`"
+        )
+    else:
+        cube, cube_meta = load_result_cube(RIGID_CUBE_PATH, os.path.getmtime(RIGID_CUBE_PATH))
+        cube_fixed = cube_meta["fixed"]
+        if not np.allclose([cube_fixed["So"], cube_fixed["delta_PSI"], cube_fixed["Cd"]], [So, delta_PSI, Cd]):
+            st.warning(
+                f"Cube สร้างด้วย S₀ = {cube_fixed['So']}, ΔPSI = {cube_fixed['delta_PSI']}, "
+                f"Cd = {cube_fixed['Cd']} ซึ่งไม่ตรงกับค่าที่กรอก"
+            )
+
+        axes = cube_meta["axes"]
+        current = {"k_eff": k_effective_pci, "Sc": Sc_psi, "Ec": Ec_psi, "J": J, "reliability": R}
+        labels = {
+            "k_eff": "k-effective (pci)", "Sc": "Sc' (psi)", "Ec": "Ec (psi)",
+            "J": "J", "reliability": "Reliability (%)",
+        }
+        whatif_cols = st.columns(len(current))
+        selected = {}
+        for col, (name, value) in zip(whatif_cols, current.items()):
+            with col:
+                options = axes[name].tolist()
+                selected[name] = st.select_slider(
+                    labels[name], options=options,
+                    value=options[get_axis_index(cube_meta, name, value)],
+                    key=f"whatif_{name}"
+                )
+
+        log_W18_D, _ = slice_result_cube(cube, cube_meta, **selected)
+        D_whatif_in = required_thickness_from_cube(cube, cube_meta, W18, **selected)
+        if np.isnan(D_whatif_in):
+            st.warning("W₁₈ อยู่นอกช่วงความหนาของ cube")
+        else:
+            st.metric("ความหนา PCC ที่ต้องการ (What-if)", f"{D_whatif_in * INCH_TO_CM:.2f} cm",
+                      delta=f"{(D_whatif_in - D_required_in) * INCH_TO_CM:+.2f} cm จากค่าออกแบบ",
+                      delta_color="inverse")
+        st.line_chart(
+            pd.DataFrame({"log W18": log_W18_D, "log W18 (design)": np.log10(W18)},
+                         index=pd.Index(axes["D"] * INCH_TO_CM, name="D (cm)"))
+        )
+
 # =============================================
 # Footer
 # =============================================
@@ -0,0 +1,156 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Parametric Result Cube
+คำนวณ log₁₀(W₁₈) บนตารางพารามิเตอร์ D × k_eff × Sc × Ec × J × Reliability ครั้งเดียว
+แล้วเก็บเป็นไฟล์ .npy แบบ memory-mapped พร้อมไฟล์ metadata (.json) ข้างกัน
+
+เปิดไฟล์ด้วย open_result_cube() จะ map ไฟล์ทันทีโดยยังไม่อ่านข้อมูล
+ข้อมูลถูกอ่านจากดิสก์เฉพาะส่วนที่ slice เท่านั้น
+
+ตัวอย่าง:
+    python rigid_cube.py rigid_result_cube.npy --So 0.35 --delta-psi 2.0 --Cd 1.0
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from aashto_reliability import get_ZR_array
+from rigid_engine import calculate_log_W18_rigid_array
+
+
+CUBE_AXES = ("D", "k_eff", "Sc", "Ec", "J", "reliability")
+
+CUBE_VERSION = 1
+
+# ไฟล์ cube เริ่มต้นที่โปรแกรม Streamlit ใช้
+RIGID_CUBE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rigid_result_cube.npy")
+
+# ตารางเริ่มต้น (D นิ้ว, k pci, Sc psi, Ec psi, J, Reliability %)
+DEFAULT_CUBE_AXES = {
+    "D": np.arange(6.0, 20.0 + 1e-9, 0.25),
+    "k_eff": np.arange(25.0, 800.0 + 1e-9, 25.0),
+    "Sc": np.arange(450.0, 950.0 + 1e-9, 25.0),
+    "Ec": np.arange(2.5e6, 6.0e6 + 1e-9, 0.25e6),
+    "J": np.round(np.arange(2.5, 4.4 + 1e-9, 0.1), 2),
+    "reliability": np.array([50, 60, 70, 75, 80, 85, 90, 91, 92, 93, 94, 95, 96, 97, 98, 99], dtype=float),
+}
+
+
+def get_metadata_path(path):
+    """ไฟล์ metadata ของ cube (ชื่อเดียวกัน นามสกุล .json)"""
+    return os.path.splitext(path)[0] + ".json"
+
+
+def build_result_cube(path, So, delta_PSI, Cd, axes=None, Pt=None):
+    """
+    คำนวณและเขียน cube ของ log₁₀(W₁₈) (float32) ลงไฟล์ทีละระนาบของแกน D
+
+    Parameters:
+        So, delta_PSI, Cd: ค่าคงที่ของ cube (บันทึกไว้ใน metadata)
+        axes: dict ชื่อแกน → ค่า (ใช้ DEFAULT_CUBE_AXES สำหรับแกนที่ไม่ระบุ)
+
+    Returns:
+        dict metadata ที่บันทึกลงไฟล์
+    """
+    axes = {name: np.asarray((axes or {}).get(name, DEFAULT_CUBE_AXES[name]), dtype=float)
+            for name in CUBE_AXES}
+    shape = tuple(axes[name].size for name in CUBE_AXES)
+
+    cube = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+    # ระนาบ (k_eff, Sc, Ec, J, Reliability) ของ D แต่ละค่า
+    k, Sc, Ec, J, ZR = np.ix_(axes["k_eff"], axes["Sc"], axes["Ec"], axes["J"],
+                              get_ZR_array(axes["reliability"]))
+    for i, D in enumerate(axes["D"]):
+        cube[i] = calculate_log_W18_rigid_array(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt)
+    cube.flush()
+    del cube
+
+    metadata = {
+        "version": CUBE_VERSION,
+        "quantity": "log_W18",
+        "axes": {name: axes[name].tolist() for name in CUBE_AXES},
+        "fixed": {"So": So, "delta_PSI": delta_PSI, "Cd": Cd, "Pt": Pt},
+        "shape": list(shape),
+    }
+    with open(get_metadata_path(path), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=1)
+    return metadata
+
+
+def open_result_cube(path):
+    """
+    เปิด cube แบบ memory-mapped (อ่านอย่างเดียว)
+
+    Returns:
+        tuple: (cube, metadata) โดย metadata['axes'] เป็น array ของแต่ละแกน
+    """
+    with open(get_metadata_path(path), encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("version") != CUBE_VERSION:
+        raise ValueError(f"ไม่รองรับ cube version {metadata.get('version')}")
+
+    cube = np.load(path, mmap_mode="r")
+    if list(cube.shape) != metadata["shape"]:
+        raise ValueError("ขนาดของ cube ไม่ตรงกับ metadata")
+    metadata["axes"] = {name: np.asarray(values) for name, values in metadata["axes"].items()}
+    return cube, metadata
+
+
+def get_axis_index(metadata, name, value):
+    """ดัชนีของค่าในแกนที่ใกล้ value ที่สุด"""
+    return int(np.abs(metadata["axes"][name] - value).argmin())
+
+
+def slice_result_cube(cube, metadata, **values):
+    """
+    ตัด cube ที่ค่าใกล้เคียงที่สุดของแกนที่ระบุ (เช่น Sc=650, J=3.2) อ่านจากดิสก์เฉพาะส่วนนี้
+
+    Returns:
+        tuple: (array ของ log₁₀W₁₈ เหลือแกนที่ไม่ระบุตามลำดับ CUBE_AXES, ชื่อแกนที่เหลือ)
+    """
+    unknown = set(values) - set(CUBE_AXES)
+    if unknown:
+        raise ValueError(f"ไม่รู้จักแกน {sorted(unknown)}")
+
+    index = tuple(get_axis_index(metadata, name, values[name]) if name in values else slice(None)
+                  for name in CUBE_AXES)
+    remaining = [name for name in CUBE_AXES if name not in values]
+    return np.asarray(cube[index], dtype=float), remaining
+
+
+def required_thickness_from_cube(cube, metadata, W18, **values):
+    """
+    ความหนาที่ต้องการ (นิ้ว) จาก cube โดย interpolation บนแกน D (ค่าอื่นใช้ค่าที่ใกล้ที่สุด)
+    คืนค่า NaN เมื่อ W₁₈ อยู่นอกช่วงของแกน D
+    """
+    log_W18, remaining = slice_result_cube(cube, metadata, **values)
+    if remaining != ["D"]:
+        raise ValueError("ต้องระบุค่าทุกแกนยกเว้น D")
+
+    D_axis = metadata["axes"]["D"]
+    valid = np.isfinite(log_W18)
+    target = np.log10(W18)
+    if not valid.any() or target < log_W18[valid][0] or target > log_W18[valid][-1]:
+        return np.nan
+    return float(np.interp(target, log_W18[valid], D_axis[valid]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AASHTO 1993 Rigid Pavement - build a memory-mapped log W18 result cube"
+    )
+    parser.add_argument("output", nargs="?", default=RIGID_CUBE_PATH, help="ไฟล์ .npy ของ cube")
+    parser.add_argument("--So", type=float, default=0.35)
+    parser.add_argument("--delta-psi", type=float, default=2.0)
+    parser.add_argument("--Cd", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    metadata = build_result_cube(args.output, args.So, args.delta_psi, args.Cd)
+    n_cells = int(np.prod(metadata["shape"]))
+    print(f"{n_cells:,} cells {tuple(metadata['shape'])} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
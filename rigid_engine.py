@@ -0,0 +1,399 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Engine
+ฟังก์ชันคำนวณสำหรับการออกแบบโครงสร้างชั้นทางคอนกรีต (ไม่ต้องใช้ Streamlit)
+
+ใช้ร่วมกันระหว่าง rigid-pave-aashto-v2.py, การวิเคราะห์แบบ sweep และงานคำนวณแบบ batch
+หน่วยในสมการ: D (นิ้ว), Sc และ Ec (psi), k (pci)
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+# =============================================
+# Unit Conversion Constants
+# =============================================
+KSC_TO_PSI = 14.223          # 1 ksc = 14.223 psi
+PSI_TO_KSC = 1 / 14.223      # 1 psi = 0.0703 ksc
+CM_TO_INCH = 1 / 2.54        # 1 cm = 0.3937 inch
+INCH_TO_CM = 2.54            # 1 inch = 2.54 cm
+MPA_TO_PSI = 145.038         # 1 MPa = 145.038 psi
+PSI_TO_MPA = 1 / 145.038     # 1 psi = 0.006895 MPa
+PCI_TO_MPA_M = 0.2714        # 1 pci = 0.2714 MPa/m (MN/m³)
+MPA_M_TO_PCI = 1 / 0.2714    # 1 MPa/m = 3.684 pci
+M_TO_FT = 3.28084            # 1 m = 3.281 ft
+
+
+# =============================================
+# Composite / Effective k
+# =============================================
+
+# ขอบเขตของค่า k (pci)
+K_COMPOSITE_MAX = 800
+K_EFFECTIVE_MIN = 25
+
+
+def calculate_composite_k_array(k_subgrade_pci, thickness_in, modulus_psi):
+    """
+    คำนวณ Composite k ของหลายโครงสร้างพร้อมกัน (N stacks)
+
+    Parameters:
+        k_subgrade_pci: k ของดินเดิม รูปร่าง (...)
+        thickness_in, modulus_psi: ความหนา (นิ้ว) และโมดูลัส (psi) ของชั้นใต้แผ่นคอนกรีต
+            รูปร่าง (..., n_layers) ชั้นที่ไม่ใช้ให้ความหนาเป็น 0
+
+    Esb = Σ(Eᵢ·Dᵢ) / ΣDᵢ,  k_comp = min(k × [1 + (Dsb/20)(Esb/30000)^0.33], 800)
+    โครงสร้างที่ไม่มีชั้นรองพื้นทางใช้ k ของดินเดิม
+    """
+    thickness_in = np.asarray(thickness_in, dtype=float)
+    modulus_psi = np.asarray(modulus_psi, dtype=float)
+    k_subgrade_pci = np.asarray(k_subgrade_pci, dtype=float)
+
+    used = thickness_in > 0
+    Dsb = np.sum(np.where(used, thickness_in, 0.0), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Esb = np.sum(np.where(used, thickness_in * modulus_psi, 0.0), axis=-1) / Dsb
+        improvement_factor = 1 + (Dsb / 20) * (Esb / 30000) ** 0.33
+    k_composite = np.minimum(k_subgrade_pci * improvement_factor, K_COMPOSITE_MAX)
+    return np.where(Dsb > 0, k_composite, k_subgrade_pci)
+
+
+def calculate_effective_k_array(k_composite_pci, LS):
+    """k-effective = max(k_comp × 10^(-LS/3), 25) แบบ Vectorized"""
+    k_composite_pci = np.asarray(k_composite_pci, dtype=float)
+    return np.maximum(k_composite_pci * 10 ** (-np.asarray(LS, dtype=float) / 3), K_EFFECTIVE_MIN)
+
+
+# =============================================
+# Depth to Rigid Foundation (AASHTO 1993 Figure 3.4)
+# =============================================
+#
+# ชั้นหินแข็งที่ลึก D_SG จากผิวดินเดิม ตัดการทรุดตัวของดินที่อยู่ใต้ระดับนั้นออก
+# ค่าอ้างอิงคำนวณจากทฤษฎียืดหยุ่น (Boussinesq) ใต้แผ่นกดเส้นผ่านศูนย์กลาง 30 นิ้ว:
+#     ส่วนของการทรุดตัวที่ผิวซึ่งเกิดใต้ความลึก z:  F(z) = w(z) / w(0)
+#     k = k∞ / (1 - F(z)),   z = hₑ + 12·D_SG (นิ้ว)
+# hₑ คือความหนาเทียบเท่า (Odemark) ของชั้นรองพื้นทางในหน่วยดินเดิม ได้จากสมการของ Figure 3.3
+#     k∞ = (MR/19.4)·(1 + hₑ/38)^2.32  →  hₑ = 38·[(19.4·k∞/MR)^(1/2.32) - 1]
+# จึงใช้เพียง k∞, MR และ D_SG เช่นเดียวกับกราฟ (ตัวอย่างในกราฟ k∞ = 230 pci, MR = 4,000 psi,
+# D_SG = 5 ft ได้ k = 300 pci ค่าอ้างอิงได้ 297 pci)
+#
+# พื้นผิวรูปแบบปิดที่ใช้ในการคำนวณ (A, B ปรับจากค่าอ้างอิงด้วย fit_rigid_foundation_coefficients)
+#     k = k∞ / (1 - [1 + (z/A)²]^(-B))                                      เมื่อ D_SG < 10 ฟุต
+# คลาดเคลื่อนจากค่าอ้างอิงไม่เกิน 1.9% (RMS 0.4%) ในช่วงของกราฟ (MR 1 - 20 ksi, D_SG 1 - 10 ft, k∞ ≤ 2,000 pci)
+# ไม่มีการปรับค่าเมื่อหินแข็งลึกตั้งแต่ 10 ฟุต ตาม AASHTO
+
+RIGID_FOUNDATION_DEPTH_LIMIT_FT = 10.0
+
+RIGID_FOUNDATION_PLATE_RADIUS_IN = 15.0   # แผ่นกด 30 นิ้ว
+RIGID_FOUNDATION_POISSON = 0.45
+
+# ผลจาก fit_rigid_foundation_coefficients(*get_rigid_foundation_reference_points())
+RIGID_FOUNDATION_COEFFICIENTS = (13.76, 0.4899)  # (A นิ้ว, B)
+
+# ตัวอย่างในกราฟ Figure 3.4: (k∞ pci, MR psi, D_SG ft, k pci)
+RIGID_FOUNDATION_CHART_EXAMPLE = (230.0, 4000.0, 5.0, 300.0)
+
+
+def calculate_equivalent_subbase_depth(k_inf_pci, MR_psi):
+    """ความหนาเทียบเท่า hₑ (นิ้ว) ของชั้นรองพื้นทางในหน่วยดินเดิม จาก k∞ และ MR (สมการ Figure 3.3)"""
+    k_inf_pci, MR_psi = np.asarray(k_inf_pci, dtype=float), np.asarray(MR_psi, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = 19.4 * k_inf_pci / MR_psi
+        return 38 * np.maximum(ratio ** (1 / 2.32) - 1, 0)
+
+
+def calculate_rigid_foundation_reference_k(k_inf_pci, MR_psi, D_SG_ft,
+                                           radius_in=RIGID_FOUNDATION_PLATE_RADIUS_IN,
+                                           poisson=RIGID_FOUNDATION_POISSON):
+    """
+    k ที่ปรับด้วยชั้นหินแข็งตามทฤษฎียืดหยุ่น (ค่าอ้างอิงสำหรับปรับสัมประสิทธิ์) แบบ Vectorized
+
+    F(z) = [a/√(a²+z²) + (1-2ν)(√(a²+z²) - z)/a] / (2 - 2ν)  (Boussinesq ใต้แผ่นกดรัศมี a)
+    """
+    D_SG_ft = np.asarray(D_SG_ft, dtype=float)
+    z = calculate_equivalent_subbase_depth(k_inf_pci, MR_psi) + 12 * D_SG_ft
+    a = radius_in
+    s = np.sqrt(a ** 2 + z ** 2)
+    fraction_below = (a / s + (1 - 2 * poisson) * (s - z) / a) / (2 - 2 * poisson)
+    return np.asarray(k_inf_pci, dtype=float) / (1 - fraction_below)
+
+
+def get_rigid_foundation_reference_points(MR_ksi=(1, 2, 3, 5, 7, 10, 15, 20),
+                                          D_SG_ft=(1, 2, 3, 4, 5, 6, 7, 8, 9, 9.9),
+                                          k_ratio=(1, 1.25, 1.5, 2, 3, 4), k_inf_max=2000.0):
+    """
+    จุดอ้างอิงในช่วงของกราฟ Figure 3.4 สำหรับ fit_rigid_foundation_coefficients
+    k_ratio = k∞ / (MR/19.4) (1 = ไม่มีรองพื้นทาง) ใช้เฉพาะจุดที่ k∞ ≤ k_inf_max
+
+    Returns:
+        tuple ของ array: (k∞ pci, MR psi, D_SG ft, k pci)
+    """
+    MR, D_SG, ratio = (x.ravel() for x in np.meshgrid(
+        np.asarray(MR_ksi, dtype=float) * 1000, np.asarray(D_SG_ft, dtype=float),
+        np.asarray(k_ratio, dtype=float), indexing='ij'
+    ))
+    k_inf = ratio * MR / 19.4
+    use = k_inf <= k_inf_max
+    k_inf, MR, D_SG = k_inf[use], MR[use], D_SG[use]
+    return k_inf, MR, D_SG, calculate_rigid_foundation_reference_k(k_inf, MR, D_SG)
+
+
+def calculate_rigid_foundation_k_array(k_inf_pci, MR_psi, D_SG_ft, coefficients=RIGID_FOUNDATION_COEFFICIENTS):
+    """
+    ปรับ k∞ เมื่อมีชั้นหินแข็งอยู่ลึก D_SG ฟุตจากผิวดินเดิม แบบ Vectorized
+
+    D_SG เป็น NaN / inf หรือ ≥ 10 ฟุต = ไม่มีการปรับ
+    """
+    A, B = coefficients
+    k_inf_pci, MR_psi, D_SG_ft = (np.asarray(x, dtype=float) for x in (k_inf_pci, MR_psi, D_SG_ft))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        z = calculate_equivalent_subbase_depth(k_inf_pci, MR_psi) + 12 * np.maximum(D_SG_ft, 0)
+        k_corrected = k_inf_pci / (1 - (1 + (z / A) ** 2) ** (-B))
+    return np.where(np.isfinite(D_SG_ft) & (D_SG_ft < RIGID_FOUNDATION_DEPTH_LIMIT_FT),
+                    k_corrected, k_inf_pci)
+
+
+def fit_rigid_foundation_coefficients(k_inf_pci, MR_psi, D_SG_ft, k_corrected_pci, A_range=(1.0, 60.0), n_A=5901):
+    """
+    หาสัมประสิทธิ์ (A, B) จากจุดอ้างอิง (ค่าจาก calculate_rigid_foundation_reference_k
+    หรือจุดที่อ่านจากกราฟ Figure 3.4)
+
+    เมื่อกำหนด A สมการ log(1 - k∞/k) = -B·log[1 + (z/A)²] เป็นเชิงเส้นใน B จึงหา B ได้โดยตรง
+    แล้วเลือก A ที่ให้ผลรวมกำลังสองของ log(k_fit/k) น้อยที่สุด (ใช้เฉพาะจุดที่ k > k∞ และ D_SG < 10 ฟุต)
+    """
+    k_inf_pci, MR_psi, D_SG_ft, k_corrected_pci = (
+        np.asarray(x, dtype=float).ravel() for x in (k_inf_pci, MR_psi, D_SG_ft, k_corrected_pci)
+    )
+    use = (k_corrected_pci > k_inf_pci) & (D_SG_ft < RIGID_FOUNDATION_DEPTH_LIMIT_FT)
+    if use.sum() < 2:
+        raise ValueError("ต้องมีจุดข้อมูลที่ใช้ได้อย่างน้อย 2 จุด")
+
+    k_inf, k = k_inf_pci[use], k_corrected_pci[use]
+    z = calculate_equivalent_subbase_depth(k_inf, MR_psi[use]) + 12 * D_SG_ft[use]
+    log_q = np.log(1 - k_inf / k)
+
+    A = np.linspace(*A_range, n_A)[:, None]
+    x = np.log1p((z / A) ** 2)
+    B = -np.sum(x * log_q, axis=1, keepdims=True) / np.sum(x * x, axis=1, keepdims=True)
+    error = np.log(k_inf / k) - np.log1p(-(1 + (z / A) ** 2) ** (-B))
+    best = np.argmin(np.sum(error ** 2, axis=1))
+    return float(A[best, 0]), float(B[best, 0])
+
+
+def calculate_k_values_array(k_subgrade_pci, thickness_in, modulus_psi, LS, D_SG_ft=np.inf):
+    """
+    Composite k และ k-effective (รวม Loss of Support) ของหลายโครงสร้างในการเรียกครั้งเดียว
+    D_SG_ft: ความลึกถึงชั้นหินแข็ง (ฟุต) ของแต่ละโครงสร้าง (inf = ไม่มี) ใช้ MR = 19.4 × k ดินเดิม
+
+    Returns:
+        tuple: (k_composite, k_effective) หน่วย pci (k_composite รวมการปรับหินแข็งแล้ว)
+    """
+    k_composite = calculate_composite_k_array(k_subgrade_pci, thickness_in, modulus_psi)
+    k_composite = calculate_rigid_foundation_k_array(
+        k_composite, 19.4 * np.asarray(k_subgrade_pci, dtype=float), D_SG_ft
+    )
+    return k_composite, calculate_effective_k_array(k_composite, LS)
+
+
+def get_layer_signature(layers):
+    """
+    Signature ของชั้นใต้แผ่นคอนกรีต (ชั้นที่ 2 เป็นต้นไปที่ใช้งาน) สำหรับ memoization
+    tuple ของ (ความหนา นิ้ว, โมดูลัส psi)
+    """
+    return tuple(
+        (float(l["thickness_in"]), float(l["modulus_psi"]))
+        for l in layers[1:] if l["material"] != "Not Used" and l["thickness_in"] > 0
+    )
+
+
+@lru_cache(maxsize=1024)
+def calculate_k_values_cached(k_subgrade_pci, layer_signature, LS, D_SG_ft=math.inf):
+    """
+    calculate_k_values_array สำหรับโครงสร้างเดียว จำผลไว้ตาม (k ดินเดิม, layer signature, LS, D_SG)
+
+    Returns:
+        tuple: (k_composite, k_effective) หน่วย pci
+    """
+    if layer_signature:
+        thickness_in, modulus_psi = np.array(layer_signature, dtype=float).T
+    else:
+        thickness_in = modulus_psi = np.zeros(0)
+    k_composite, k_effective = calculate_k_values_array(k_subgrade_pci, thickness_in, modulus_psi, LS, D_SG_ft)
+    return float(k_composite), float(k_effective)
+
+
+def calculate_composite_k(k_subgrade_pci, layers, Ec_psi):
+    """Composite k (pci) ของโครงสร้างเดียวจากรายการชั้นทางของโปรแกรม (Ec_psi ไม่ได้ใช้ในสูตร)"""
+    k_composite, _ = calculate_k_values_cached(k_subgrade_pci, get_layer_signature(layers), 0.0)
+    return k_composite
+
+
+# =============================================
+# AASHTO 1993 Design Equation
+# =============================================
+def calculate_log_W18_rigid_array(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt=None):
+    """
+    คำนวณ log₁₀(W₁₈) ของ Rigid Pavement แบบ Vectorized (NumPy)
+
+    รับทุกพารามิเตอร์เป็น array หรือ scalar ที่ broadcast กันได้
+    Pt = None ใช้ Pt = 4.5 - ΔPSI ตามโปรแกรมเดิม
+    ตำแหน่งที่อยู่นอกโดเมนของสมการ (D ≤ 0, k ≤ 0, Ec ≤ 0, ΔPSI ≤ 0 หรือพจน์ใน log ≤ 0)
+    จะได้ค่า NaN
+    """
+    D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k))
+    )
+    Pt = 4.5 - delta_PSI if Pt is None else np.asarray(Pt, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        ln_D_plus_1 = np.log(D + 1)
+        term2 = (7.35 / math.log(10)) * ln_D_plus_1 - 0.06
+        term3 = np.log10(delta_PSI / (4.5 - 1.5)) / (1 + 1.624e7 * np.exp(-8.46 * ln_D_plus_1))
+
+        D_power = D ** 0.75
+        numerator4 = Sc * Cd * (D_power - 1.132)
+        denominator4 = 215.63 * J * (D_power - 18.42 * (k / Ec) ** 0.25)
+        term4 = (4.22 - 0.32 * Pt) * np.log10(numerator4 / denominator4)
+
+        log_W18 = ZR * So + term2 + term3 + term4
+
+    valid = (D > 0) & (k > 0) & (Ec > 0) & (delta_PSI > 0) & (numerator4 > 0) & (denominator4 > 0)
+    return np.where(valid, log_W18, np.nan)
+
+
+def calculate_log_W18(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k):
+    """
+    D in inches, Sc in psi, Ec in psi, k in pci
+
+    เป็น wrapper ของ calculate_log_W18_rigid_array สำหรับค่าเดี่ยว
+    คืนค่า -999 เมื่ออยู่นอกโดเมนของสมการ
+    """
+    log_W18 = float(calculate_log_W18_rigid_array(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k))
+
+    if math.isnan(log_W18):
+        return -999
+
+    return log_W18
+
+
+# =============================================
+# Required Thickness Solver
+# =============================================
+
+# สถานะผลการหาความหนา
+THICKNESS_OK = 0             # หาคำตอบได้ภายในช่วง
+THICKNESS_BELOW_RANGE = 1    # ความหนาต่ำสุดของช่วงก็รองรับ W₁₈ ได้แล้ว (คืนค่าความหนาต่ำสุด)
+THICKNESS_ABOVE_RANGE = 2    # ต้องการความหนาเกินขอบบนของช่วง (คืนค่า NaN)
+THICKNESS_INVALID = 3        # พารามิเตอร์อยู่นอกโดเมนของสมการ (คืนค่า NaN)
+
+
+def find_required_thickness_array(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt=None,
+                                  D_start=(6.0, 16.0), D_limits=(2.0, 60.0), tol=1e-3,
+                                  max_iter=100):
+    """
+    หาความหนา PCC ที่ต้องการ (นิ้ว) สำหรับหลายกรณีพร้อมกัน
+
+    เริ่มจากช่วง D_start แล้วขยายช่วงอัตโนมัติ (ขยายขึ้นทีละ 2 เท่า / ลดลงทีละครึ่ง)
+    จนคร่อมคำตอบหรือถึง D_limits จากนั้นใช้ bisection จนความกว้างของช่วง < tol (นิ้ว)
+
+    ใกล้ขอบล่างของโดเมน พจน์ log[Sc·Cd·(D^0.75 - 1.132) / (215.63·J·(D^0.75 - 18.42/(Ec/k)^0.25))]
+    พุ่งขึ้นเมื่อตัวส่วนเข้าใกล้ศูนย์ การขยายช่วงลงจึงหยุดเมื่อ log W₁₈ ไม่ลดลงตามความหนาอีก
+    เพื่อให้คำตอบอยู่บนช่วงที่ W₁₈ เพิ่มขึ้นตามความหนาเสมอ
+
+    Returns:
+        tuple: (D, status, iterations)
+        - D ที่ต้องการ (นิ้ว) หรือ NaN เมื่อ status เป็น THICKNESS_ABOVE_RANGE / THICKNESS_INVALID
+        - status ตามค่าคงที่ THICKNESS_* ของแต่ละกรณี
+        - จำนวนรอบที่ใช้ (รวมการขยายช่วง)
+    """
+    arrays = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k))
+    )
+    shape = arrays[0].shape
+    W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k = (x.ravel() for x in arrays)
+    Pt = 4.5 - delta_PSI if Pt is None else np.broadcast_to(np.asarray(Pt, dtype=float), shape).ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_W18_target = np.log10(W18)
+
+    def objective(D, idx):
+        return calculate_log_W18_rigid_array(
+            D, ZR[idx], So[idx], delta_PSI[idx], Sc[idx], Cd[idx], J[idx], Ec[idx], k[idx], Pt[idx]
+        ) - log_W18_target[idx]
+
+    n = log_W18_target.size
+    all_idx = np.arange(n)
+    D_floor, D_ceiling = D_limits
+    D_lo = np.full(n, float(D_start[0]))
+    D_hi = np.full(n, float(D_start[1]))
+    f_lo = objective(D_lo, all_idx)
+    f_hi = objective(D_hi, all_idx)
+    iterations = np.zeros(n, dtype=int)
+
+    # ขยายขอบบนจนคร่อมคำตอบ (ขอบบนเดิมกลายเป็นขอบล่างใหม่)
+    grow = np.flatnonzero((f_hi < 0) & (D_hi < D_ceiling))
+    while grow.size:
+        D_lo[grow], f_lo[grow] = D_hi[grow], f_hi[grow]
+        D_hi[grow] = np.minimum(D_hi[grow] * 2, D_ceiling)
+        f_hi[grow] = objective(D_hi[grow], grow)
+        iterations[grow] += 1
+        grow = grow[(f_hi[grow] < 0) & (D_hi[grow] < D_ceiling)]
+
+    # ขยายขอบล่างลงจนคร่อมคำตอบ ตราบที่ log W₁₈ ยังลดลงตามความหนา
+    shrink = np.flatnonzero((f_lo >= 0) & (D_lo > D_floor))
+    while shrink.size:
+        D_next = np.maximum(D_lo[shrink] / 2, D_floor)
+        f_next = objective(D_next, shrink)
+        iterations[shrink] += 1
+        accept = f_next < f_lo[shrink]
+        moved = shrink[accept]
+        D_hi[moved], f_hi[moved] = D_lo[moved], f_lo[moved]
+        D_lo[moved], f_lo[moved] = D_next[accept], f_next[accept]
+        shrink = moved[(f_lo[moved] >= 0) & (D_lo[moved] > D_floor)]
+
+    status = np.full(n, THICKNESS_OK)
+    status[f_lo >= 0] = THICKNESS_BELOW_RANGE
+    status[f_hi < 0] = THICKNESS_ABOVE_RANGE
+    status[np.isnan(f_lo) | np.isnan(f_hi)] = THICKNESS_INVALID
+
+    D = np.full(n, np.nan)
+    D[status == THICKNESS_BELOW_RANGE] = D_lo[status == THICKNESS_BELOW_RANGE]
+
+    # Bisection บนช่วงที่คร่อมคำตอบ
+    idx = np.flatnonzero(status == THICKNESS_OK)
+    lo, hi = D_lo[idx], D_hi[idx]
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+
+        mid = (lo + hi) / 2
+        f_mid = objective(mid, idx)
+        iterations[idx] += 1
+
+        lo = np.where(f_mid < 0, mid, lo)
+        hi = np.where(f_mid < 0, hi, mid)
+
+        done = hi - lo < tol
+        # ตอบขอบบน เพื่อให้ความหนาที่ได้รองรับ W₁₈ ได้ไม่น้อยกว่าที่ต้องการ
+        D[idx[done]] = hi[done]
+
+        keep = ~done
+        idx, lo, hi = idx[keep], lo[keep], hi[keep]
+
+    return D.reshape(shape), status.reshape(shape), iterations.reshape(shape)
+
+
+def find_required_thickness(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, tol=1e-3):
+    """
+    Returns thickness in inches
+
+    เป็น wrapper ของ find_required_thickness_array สำหรับค่าเดี่ยว
+    คืนค่า None เมื่อต้องการความหนาเกินช่วงที่หาได้หรือพารามิเตอร์ไม่ถูกต้อง
+    """
+    D, status, _ = find_required_thickness_array(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, tol=tol)
+
+    if status in (THICKNESS_ABOVE_RANGE, THICKNESS_INVALID):
+        return None
+
+    return float(D)
@@ -0,0 +1,196 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Inverse Solvers
+แก้สมการ Rigid หาตัวแปรใดตัวแปรหนึ่งเมื่อทราบตัวแปรที่เหลือ แบบ Vectorized
+
+    log₁₀W₁₈ = ZR·So + 7.35·log₁₀(D+1) - 0.06 + log₁₀(ΔPSI/3.0) / (1 + 1.624×10⁷/(D+1)^8.46)
+               + (4.22 - 0.32·Pt) · log₁₀[Sc·Cd·(D^0.75 - 1.132) / (215.63·J·(D^0.75 - 18.42·(k/Ec)^0.25))]
+
+Sc, Cd, J, k และ Ec อยู่ในพจน์ log เดียวกัน เมื่อกำหนด W₁₈ และ D จึงแก้ได้โดยตรง (closed form)
+มีเพียง D ที่ต้องหาด้วย bracket + bisection (find_required_thickness_array)
+
+ทุกฟังก์ชันคืนค่า (ค่าที่ต้องการ, status) ตามค่าคงที่ SOLVE_* ของแต่ละตำแหน่ง
+- SOLVE_OK: คำตอบอยู่ในช่วง limits
+- SOLVE_BELOW_RANGE / SOLVE_ABOVE_RANGE: คำตอบอยู่ต่ำกว่า / สูงกว่าช่วง limits
+  (ค่าที่คืนเป็นคำตอบจริงของสมการ เช่น k = 0 หมายถึง k เท่าใดก็ผ่าน, Ec = inf หมายถึง Ec เท่าใดก็ผ่าน)
+- SOLVE_INVALID: พารามิเตอร์อยู่นอกโดเมนของสมการ (คืนค่า NaN)
+"""
+
+import numpy as np
+
+from rigid_engine import (
+    K_COMPOSITE_MAX,
+    K_EFFECTIVE_MIN,
+    THICKNESS_OK,
+    THICKNESS_BELOW_RANGE,
+    THICKNESS_ABOVE_RANGE,
+    THICKNESS_INVALID,
+    calculate_log_W18_rigid_array,
+    find_required_thickness_array,
+)
+
+
+# สถานะผลการแก้สมการ (ค่าเดียวกับ THICKNESS_* ของ rigid_engine)
+SOLVE_OK = THICKNESS_OK
+SOLVE_BELOW_RANGE = THICKNESS_BELOW_RANGE
+SOLVE_ABOVE_RANGE = THICKNESS_ABOVE_RANGE
+SOLVE_INVALID = THICKNESS_INVALID
+
+# ช่วงค่าที่ใช้งานได้จริงของแต่ละตัวแปร (D นิ้ว, Sc/Ec psi, k pci)
+INVERSE_LIMITS = {
+    "D": (2.0, 60.0),
+    "Sc": (300.0, 1200.0),
+    "Cd": (0.7, 1.25),
+    "J": (2.2, 4.4),
+    "k": (float(K_EFFECTIVE_MIN), float(K_COMPOSITE_MAX)),
+    "Ec": (1.0e6, 8.0e6),
+}
+
+INVERSE_VARIABLES = ("W18",) + tuple(INVERSE_LIMITS)
+
+
+def _get_status(value, limits):
+    """สถานะของคำตอบเทียบกับช่วง limits (NaN = SOLVE_INVALID)"""
+    lo, hi = limits
+    status = np.full(value.shape, SOLVE_OK)
+    status[value < lo] = SOLVE_BELOW_RANGE
+    status[value > hi] = SOLVE_ABOVE_RANGE
+    status[np.isnan(value)] = SOLVE_INVALID
+    return status
+
+
+def _required_log_ratio(W18, D, ZR, So, delta_PSI, Pt):
+    """
+    ค่า Sc·Cd·(D^0.75 - 1.132) / (215.63·J·(D^0.75 - 18.42·(k/Ec)^0.25)) ที่ทำให้ได้ W₁₈ พอดี
+    คืนค่าเป็น log₁₀ ของอัตราส่วน
+    """
+    W18, D, ZR, So, delta_PSI = (np.asarray(x, dtype=float) for x in (W18, D, ZR, So, delta_PSI))
+    Pt = 4.5 - delta_PSI if Pt is None else np.asarray(Pt, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        term2 = 7.35 * np.log10(D + 1) - 0.06
+        term3 = np.log10(delta_PSI / (4.5 - 1.5)) / (1 + 1.624e7 / (D + 1) ** 8.46)
+        return (np.log10(W18) - ZR * So - term2 - term3) / (4.22 - 0.32 * Pt)
+
+
+def calculate_rigid_capacity_array(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt=None):
+    """
+    W₁₈ ที่โครงสร้างรองรับได้ (ESAL)
+
+    Returns:
+        tuple: (W18, status) โดย status เป็น SOLVE_OK หรือ SOLVE_INVALID
+    """
+    log_W18 = calculate_log_W18_rigid_array(D, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt)
+    status = np.where(np.isnan(log_W18), SOLVE_INVALID, SOLVE_OK)
+    return 10 ** log_W18, status
+
+
+def find_required_D_array(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt=None, limits=INVERSE_LIMITS["D"]):
+    """ความหนา PCC ที่ต้องการ (นิ้ว) ด้วย find_required_thickness_array (ขยายช่วงจนคร่อมคำตอบ)"""
+    D, status, _ = find_required_thickness_array(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k, Pt,
+                                                 D_limits=limits)
+    return D, status
+
+
+def _required_strength_product(W18, D, ZR, So, delta_PSI, J, Ec, k, Pt):
+    """Sc × Cd ที่ต้องการ (psi)"""
+    D, J, Ec, k = (np.asarray(x, dtype=float) for x in (D, J, Ec, k))
+    ratio = 10 ** _required_log_ratio(W18, D, ZR, So, delta_PSI, Pt)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        D_power = D ** 0.75
+        denominator = 215.63 * J * (D_power - 18.42 * (k / Ec) ** 0.25)
+        product = ratio * denominator / (D_power - 1.132)
+    valid = (k > 0) & (Ec > 0) & (D_power > 1.132) & (denominator > 0)
+    return np.where(valid, product, np.nan)
+
+
+def find_required_Sc_array(W18, D, ZR, So, delta_PSI, Cd, J, Ec, k, Pt=None, limits=INVERSE_LIMITS["Sc"]):
+    """Modulus of Rupture ต่ำสุด (psi) ที่ทำให้รองรับ W₁₈ ได้ (W₁₈ เพิ่มขึ้นตาม Sc)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Sc = _required_strength_product(W18, D, ZR, So, delta_PSI, J, Ec, k, Pt) / np.asarray(Cd, dtype=float)
+    Sc = np.where(Sc > 0, Sc, np.nan)
+    return Sc, _get_status(Sc, limits)
+
+
+def find_required_Cd_array(W18, D, ZR, So, delta_PSI, Sc, J, Ec, k, Pt=None, limits=INVERSE_LIMITS["Cd"]):
+    """Drainage Coefficient ต่ำสุดที่ทำให้รองรับ W₁₈ ได้ (W₁₈ เพิ่มขึ้นตาม Cd)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Cd = _required_strength_product(W18, D, ZR, So, delta_PSI, J, Ec, k, Pt) / np.asarray(Sc, dtype=float)
+    Cd = np.where(Cd > 0, Cd, np.nan)
+    return Cd, _get_status(Cd, limits)
+
+
+def find_required_J_array(W18, D, ZR, So, delta_PSI, Sc, Cd, Ec, k, Pt=None, limits=INVERSE_LIMITS["J"]):
+    """Load Transfer Coefficient สูงสุดที่ยังรองรับ W₁₈ ได้ (W₁₈ ลดลงเมื่อ J เพิ่มขึ้น)"""
+    D, Sc, Cd, Ec, k = (np.asarray(x, dtype=float) for x in (D, Sc, Cd, Ec, k))
+    ratio = 10 ** _required_log_ratio(W18, D, ZR, So, delta_PSI, Pt)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        D_power = D ** 0.75
+        support = D_power - 18.42 * (k / Ec) ** 0.25
+        J = Sc * Cd * (D_power - 1.132) / (215.63 * ratio * support)
+    valid = (k > 0) & (Ec > 0) & (support > 0) & (J > 0)
+    J = np.where(valid, J, np.nan)
+    return J, _get_status(J, limits)
+
+
+def _required_k_to_Ec(W18, D, ZR, So, delta_PSI, Sc, Cd, J, Pt):
+    """
+    อัตราส่วน k/Ec ที่ทำให้รองรับ W₁₈ ได้พอดี
+
+    ได้ 0 เมื่อแม้ k → 0 ก็ยังรองรับได้ (ตัวส่วนมีค่าสูงสุดที่ D^0.75 แล้ว)
+    """
+    D, Sc, Cd, J = (np.asarray(x, dtype=float) for x in (D, Sc, Cd, J))
+    ratio = 10 ** _required_log_ratio(W18, D, ZR, So, delta_PSI, Pt)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        D_power = D ** 0.75
+        support = Sc * Cd * (D_power - 1.132) / (215.63 * J * ratio)
+        k_to_Ec = (np.maximum(D_power - support, 0.0) / 18.42) ** 4
+    valid = (D_power > 1.132) & (support > 0)
+    return np.where(valid, k_to_Ec, np.nan)
+
+
+def find_required_k_array(W18, D, ZR, So, delta_PSI, Sc, Cd, J, Ec, Pt=None, limits=INVERSE_LIMITS["k"]):
+    """k-effective ต่ำสุด (pci) ที่ทำให้รองรับ W₁₈ ได้ (W₁₈ เพิ่มขึ้นตาม k)"""
+    Ec = np.asarray(Ec, dtype=float)
+    k = _required_k_to_Ec(W18, D, ZR, So, delta_PSI, Sc, Cd, J, Pt) * np.where(Ec > 0, Ec, np.nan)
+    return k, _get_status(k, limits)
+
+
+def find_required_Ec_array(W18, D, ZR, So, delta_PSI, Sc, Cd, J, k, Pt=None, limits=INVERSE_LIMITS["Ec"]):
+    """Ec สูงสุด (psi) ที่ยังรองรับ W₁₈ ได้ (W₁₈ ลดลงเมื่อ Ec เพิ่มขึ้น, inf = Ec เท่าใดก็ผ่าน)"""
+    k = np.asarray(k, dtype=float)
+    k_to_Ec = _required_k_to_Ec(W18, D, ZR, So, delta_PSI, Sc, Cd, J, Pt)
+    with np.errstate(divide='ignore'):
+        Ec = np.where(k > 0, k / k_to_Ec, np.nan)
+    return Ec, _get_status(Ec, limits)
+
+
+def solve_rigid_array(variable, W18=None, D=None, ZR=None, So=None, delta_PSI=None, Sc=None, Cd=None,
+                      J=None, Ec=None, k=None, Pt=None, limits=None):
+    """
+    แก้สมการหาตัวแปร variable ("W18", "D", "Sc", "Cd", "J", "k", "Ec") จากตัวแปรที่เหลือ
+
+    Returns:
+        tuple: (ค่าที่ได้, status)
+    """
+    if variable not in INVERSE_VARIABLES:
+        raise ValueError(f"ไม่รู้จักตัวแปร {variable!r} (ใช้ได้: {', '.join(INVERSE_VARIABLES)})")
+
+    params = {"W18": W18, "D": D, "ZR": ZR, "So": So, "delta_PSI": delta_PSI,
+              "Sc": Sc, "Cd": Cd, "J": J, "Ec": Ec, "k": k}
+    missing = [name for name, value in params.items() if value is None and name != variable]
+    if missing:
+        raise ValueError(f"ต้องระบุ {', '.join(missing)} เพื่อหา {variable}")
+
+    if variable == "W18":
+        del params["W18"]
+        return calculate_rigid_capacity_array(**params, Pt=Pt)
+
+    del params[variable]
+    solver = {
+        "D": find_required_D_array,
+        "Sc": find_required_Sc_array,
+        "Cd": find_required_Cd_array,
+        "J": find_required_J_array,
+        "k": find_required_k_array,
+        "Ec": find_required_Ec_array,
+    }[variable]
+    return solver(**params, Pt=Pt, limits=INVERSE_LIMITS[variable] if limits is None else limits)
@@ -0,0 +1,575 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Design Pipeline
+ขั้นตอนการออกแบบของ rigid-pave-aashto-v2.py ในรูปฟังก์ชันที่ไม่ต้องใช้ Streamlit
+
+    ข้อมูล scenario → Composite k → k-effective → ความหนา PCC → (รูปโครงสร้างชั้นทาง)
+
+แต่ละขั้นเป็นฟังก์ชันที่รับ dict และคืน dict ใหม่ ไม่มี state ภายนอก
+จึงเรียกจากโปรแกรม Streamlit, ตัวรัน scenario แบบขนาน (rigid_scenarios.py) หรือ script อื่นได้
+
+STAGE_GRAPH ระบุข้อมูลนำเข้าและค่าจากขั้นก่อนหน้าที่แต่ละขั้นใช้จริง get_stage_key() จึงให้ key
+ที่เปลี่ยนเฉพาะเมื่อสิ่งที่ขั้นนั้นใช้เปลี่ยน ตัวเรียกใช้ cache ผลแต่ละขั้นตาม key นี้ได้
+(เช่น เปลี่ยน Pt แล้วความหนาออกแบบเท่าเดิม ไม่ต้องวาดรูปใหม่)
+
+Scenario เป็น dict หน่วยเดียวกับหน้าโปรแกรม (ไม่ระบุ = ค่าเริ่มต้นของโปรแกรม):
+    W18, R (%), So, Pi, Pt, Cd, J, Sc_ksc, Ec_mpa, k_subgrade_mpa_m, LS,
+    rigid_foundation_depth_m (None = ไม่มีชั้นหินแข็ง),
+    layers: [{"material": ..., "thickness_cm": ..., "modulus_mpa": ...}, ...] ชั้นแรกคือ PCC
+"""
+
+import io
+import math
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import FancyBboxPatch
+
+from aashto_reliability import get_ZR_array
+from rigid_engine import (
+    KSC_TO_PSI,
+    CM_TO_INCH,
+    INCH_TO_CM,
+    MPA_TO_PSI,
+    PCI_TO_MPA_M,
+    MPA_M_TO_PCI,
+    M_TO_FT,
+    THICKNESS_OK,
+    THICKNESS_BELOW_RANGE,
+    calculate_log_W18,
+    find_required_thickness_array,
+    get_layer_signature,
+    calculate_k_values_cached,
+)
+
+
+# =============================================
+# Design Tables
+# =============================================
+
+MATERIAL_TYPES = [
+    "PCC (Portland Cement Concrete)",
+    "Cement Treated Base (CTB)",
+    "Lime Treated Base (LTB)",
+    "Asphalt Treated Base (ATB)",
+    "Crushed Stone Base",
+    "Soil Cement",
+    "Granular Subbase",
+    "Sand Subbase",
+    "Improved Subgrade",
+    "Natural Subgrade",
+    "Not Used"
+]
+
+# Default modulus values in MPa
+DEFAULT_MODULUS_MPA = {
+    "PCC (Portland Cement Concrete)": 28000,
+    "Cement Treated Base (CTB)": 7000,
+    "Lime Treated Base (LTB)": 280,
+    "Asphalt Treated Base (ATB)": 2400,
+    "Crushed Stone Base": 200,
+    "Soil Cement": 3500,
+    "Granular Subbase": 140,
+    "Sand Subbase": 100,
+    "Improved Subgrade": 70,
+    "Natural Subgrade": 35,
+    "Not Used": 0
+}
+
+# Colors for visualization
+MATERIAL_COLORS = {
+    "PCC (Portland Cement Concrete)": "#808080",
+    "Cement Treated Base (CTB)": "#D2B48C",
+    "Lime Treated Base (LTB)": "#F5DEB3",
+    "Asphalt Treated Base (ATB)": "#2C2C2C",
+    "Crushed Stone Base": "#A0522D",
+    "Soil Cement": "#CD853F",
+    "Granular Subbase": "#DEB887",
+    "Sand Subbase": "#F4A460",
+    "Improved Subgrade": "#8B4513",
+    "Natural Subgrade": "#654321",
+    "Not Used": "#FFFFFF"
+}
+
+# Short names for figure
+LAYER_NAMES_SHORT = {
+    "PCC (Portland Cement Concrete)": "PCC",
+    "Cement Treated Base (CTB)": "CTB",
+    "Lime Treated Base (LTB)": "LTB",
+    "Asphalt Treated Base (ATB)": "ATB",
+    "Crushed Stone Base": "Crushed Stone",
+    "Soil Cement": "Soil Cement",
+    "Granular Subbase": "Granular Subbase",
+    "Sand Subbase": "Sand Subbase",
+    "Improved Subgrade": "Improved Subgrade",
+    "Natural Subgrade": "Natural Subgrade",
+    "Not Used": "-"
+}
+
+# ค่าเริ่มต้นของหน้าโปรแกรม
+DEFAULT_SCENARIO = {
+    "W18": 5e6,
+    "R": 90,
+    "So": 0.35,
+    "Pi": 4.5,
+    "Pt": 2.5,
+    "Cd": 1.0,
+    "J": 3.2,
+    "Sc_ksc": 45.0,
+    "Ec_mpa": 28000.0,
+    "k_subgrade_mpa_m": 40.0,
+    "LS": 1.0,
+    "rigid_foundation_depth_m": None,
+    "layers": [
+        {"material": "PCC (Portland Cement Concrete)", "thickness_cm": 25.0},
+        {"material": "Cement Treated Base (CTB)", "thickness_cm": 15.0},
+        {"material": "Granular Subbase", "thickness_cm": 15.0},
+    ],
+}
+
+# ข้อมูลใน scenario ที่ต้องเป็นตัวเลข (แปลงเป็น float ใน prepare_inputs)
+SCENARIO_NUMBER_FIELDS = ("W18", "R", "So", "Pi", "Pt", "Cd", "J", "Sc_ksc", "Ec_mpa", "k_subgrade_mpa_m", "LS")
+
+
+# =============================================
+# Pipeline Stages
+# =============================================
+def build_layer(material, thickness_cm, modulus_mpa=None):
+    """ข้อมูลชั้นทางในรูปแบบเดียวกับหน้าโปรแกรม (modulus_mpa = None ใช้ค่าเริ่มต้นของวัสดุ)"""
+    if material not in DEFAULT_MODULUS_MPA:
+        raise ValueError(f"ไม่รู้จักวัสดุ {material!r}")
+
+    if material == "Not Used":
+        thickness_cm, modulus_mpa = 0.0, 0
+    elif modulus_mpa is None:
+        modulus_mpa = float(DEFAULT_MODULUS_MPA[material])
+
+    return {
+        "material": material,
+        "thickness_cm": thickness_cm,
+        "thickness_in": thickness_cm * CM_TO_INCH,
+        "modulus_mpa": modulus_mpa,
+        "modulus_psi": modulus_mpa * MPA_TO_PSI,
+        "color": MATERIAL_COLORS[material],
+        "name_short": LAYER_NAMES_SHORT[material]
+    }
+
+
+def get_active_layers(layers):
+    """ชั้นทางที่ใช้งาน (ไม่ใช่ Not Used และหนามากกว่า 0)"""
+    return [l for l in layers if l["material"] != "Not Used" and l["thickness_cm"] > 0]
+
+
+def to_number(name, value):
+    """
+    แปลงค่าจาก scenario เป็น float (เช่น "3.0e7" ที่ PyYAML อ่านเป็นข้อความ)
+    ValueError เมื่อไม่ใช่ตัวเลขหรือไม่เป็นค่าจำกัด
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} ต้องเป็นตัวเลข (ได้รับ {value!r})") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name} ต้องเป็นค่าจำกัด (ได้รับ {value!r})")
+    return number
+
+
+def prepare_inputs(scenario):
+    """
+    รวม scenario กับค่าเริ่มต้น ตรวจสอบชนิดข้อมูล และแปลงหน่วยเป็นหน่วยของสมการ (psi, pci, นิ้ว)
+
+    Returns:
+        dict ข้อมูลนำเข้าของทุกขั้นตอนถัดไป
+    """
+    unknown = set(scenario) - set(DEFAULT_SCENARIO)
+    if unknown:
+        raise ValueError(f"ไม่รู้จักข้อมูล {sorted(unknown)}")
+
+    inputs = {**DEFAULT_SCENARIO, **scenario}
+    for name in SCENARIO_NUMBER_FIELDS:
+        inputs[name] = to_number(name, inputs[name])
+    if inputs["rigid_foundation_depth_m"] is not None:
+        inputs["rigid_foundation_depth_m"] = to_number("rigid_foundation_depth_m", inputs["rigid_foundation_depth_m"])
+    # R ที่เป็นจำนวนเต็มใช้ค่าในตาราง ZR และแสดงผลแบบเดียวกับหน้าโปรแกรม
+    if inputs["R"].is_integer():
+        inputs["R"] = int(inputs["R"])
+
+    R = inputs["R"]
+    inputs["ZR"] = float(get_ZR_array(R))
+    inputs["delta_PSI"] = inputs["Pi"] - inputs["Pt"]
+    inputs["Sc_psi"] = inputs["Sc_ksc"] * KSC_TO_PSI
+    inputs["Ec_psi"] = inputs["Ec_mpa"] * MPA_TO_PSI
+    inputs["k_subgrade_pci"] = inputs["k_subgrade_mpa_m"] * MPA_M_TO_PCI
+
+    depth_m = inputs["rigid_foundation_depth_m"]
+    inputs["D_SG_ft"] = math.inf if depth_m is None else depth_m * M_TO_FT
+
+    if not isinstance(inputs["layers"], list) or not all(isinstance(l, dict) for l in inputs["layers"]):
+        raise ValueError("layers ต้องเป็นรายการของ object ชั้นทาง")
+    inputs["layers"] = [
+        build_layer(
+            l.get("material"),
+            to_number(f"layers[{i}].thickness_cm", l.get("thickness_cm", 0.0)),
+            None if l.get("modulus_mpa") is None else to_number(f"layers[{i}].modulus_mpa", l["modulus_mpa"]),
+        )
+        for i, l in enumerate(inputs["layers"])
+    ]
+    inputs["layer_signature"] = get_layer_signature(inputs["layers"])
+    return inputs
+
+
+def calculate_k_stage(inputs):
+    """Composite k และ k-effective (pci และ MPa/m)"""
+    k_composite_pci, k_effective_pci = calculate_k_values_cached(
+        inputs["k_subgrade_pci"], inputs["layer_signature"], inputs["LS"], inputs["D_SG_ft"]
+    )
+    return {
+        "k_composite_pci": k_composite_pci,
+        "k_effective_pci": k_effective_pci,
+        "k_composite_mpa_m": k_composite_pci * PCI_TO_MPA_M,
+        "k_effective_mpa_m": k_effective_pci * PCI_TO_MPA_M,
+    }
+
+
+def calculate_thickness_stage(inputs, k_values):
+    """
+    ความหนา PCC ที่ต้องการ ความหนาออกแบบ (ปัดขึ้นทีละ 0.5 ซม.) และ W₁₈ ที่รองรับได้
+
+    status ตามค่าคงที่ THICKNESS_* ของ rigid_engine (ความหนาเป็น NaN เมื่อหาไม่ได้)
+    """
+    args = (inputs["ZR"], inputs["So"], inputs["delta_PSI"], inputs["Sc_psi"], inputs["Cd"],
+            inputs["J"], inputs["Ec_psi"], k_values["k_effective_pci"])
+    D_required_in, status, _ = find_required_thickness_array(inputs["W18"], *args)
+    D_required_in, status = float(D_required_in), int(status)
+
+    D_required_cm = D_required_in * INCH_TO_CM
+    D_design_cm = math.ceil(D_required_cm * 2) / 2 if status in (THICKNESS_OK, THICKNESS_BELOW_RANGE) else math.nan
+    D_design_in = D_design_cm * CM_TO_INCH
+
+    log_W18_check = calculate_log_W18(D_design_in, *args) if not math.isnan(D_design_in) else -999
+    return {
+        "status": status,
+        "D_required_in": D_required_in,
+        "D_required_cm": D_required_cm,
+        "D_design_cm": D_design_cm,
+        "D_design_in": D_design_in,
+        "log_W18_check": log_W18_check,
+        "W18_capacity": 10 ** log_W18_check if log_W18_check > 0 else 0,
+    }
+
+
+def get_design_info(inputs, k_values, thickness):
+    """ค่าที่แสดงในรูปโครงสร้างชั้นทาง"""
+    return {
+        "D_design_cm": thickness["D_design_cm"],
+        "D_design_in": thickness["D_design_in"],
+        "k_subgrade_mpa_m": inputs["k_subgrade_mpa_m"],
+        "k_subgrade_pci": inputs["k_subgrade_pci"],
+        "k_effective_mpa_m": k_values["k_effective_mpa_m"],
+        "W18": inputs["W18"],
+        "R": inputs["R"],
+        "ZR": inputs["ZR"],
+        "Sc_ksc": inputs["Sc_ksc"],
+        "Cd": inputs["Cd"],
+        "J": inputs["J"],
+    }
+
+
+def get_design_layers(layers, thickness):
+    """ชั้นทางที่ใช้งาน โดยชั้น PCC ใช้ความหนาออกแบบ"""
+    layers = [dict(l) for l in layers]
+    layers[0]["thickness_cm"] = thickness["D_design_cm"]
+    layers[0]["thickness_in"] = thickness["D_design_in"]
+    return get_active_layers(layers)
+
+
+def render_diagram_stage(inputs, thickness, design_info):
+    """รูปโครงสร้างชั้นทาง (PNG bytes) หรือ None เมื่อหาความหนา PCC ไม่ได้"""
+    if math.isnan(thickness["D_design_cm"]):
+        return None
+    return draw_structure_diagram(get_design_layers(inputs["layers"], thickness), design_info)
+
+
+def build_summary_stage(inputs, thickness):
+    """แถวของตารางสรุปโครงสร้างชั้นทาง และความหนารวม (ซม.)"""
+    active_layers = get_design_layers(inputs["layers"], thickness)
+    rows = [
+        {
+            "Layer": i + 1,
+            "Material": layer["name_short"],
+            "Thickness (cm)": f"{layer['thickness_cm']:.1f}",
+            "Thickness (in)": f"{layer['thickness_in']:.2f}",
+            "Modulus (MPa)": f"{layer['modulus_mpa']:,.0f}",
+            "Modulus (psi)": f"{layer['modulus_psi']:,.0f}"
+        }
+        for i, layer in enumerate(active_layers)
+    ]
+    return {"rows": rows, "total_thickness_cm": sum(l["thickness_cm"] for l in active_layers)}
+
+
+# =============================================
+# Stage Dependency Graph
+# =============================================
+
+# stage → (ฟังก์ชัน, ข้อมูลนำเข้าที่ใช้, {stage ก่อนหน้า: ค่าที่ใช้})
+# ฟังก์ชันได้รับเฉพาะค่าที่ประกาศไว้ ตามลำดับ (inputs, ผลของ stage ก่อนหน้าตามลำดับใน dict)
+# เรียงตามลำดับการคำนวณ (stage ก่อนหน้าอยู่ก่อนเสมอ)
+STAGE_GRAPH = {
+    "k": (
+        calculate_k_stage,
+        ("k_subgrade_pci", "layer_signature", "LS", "D_SG_ft"),
+        {},
+    ),
+    "thickness": (
+        calculate_thickness_stage,
+        ("W18", "ZR", "So", "delta_PSI", "Sc_psi", "Cd", "J", "Ec_psi"),
+        {"k": ("k_effective_pci",)},
+    ),
+    "design_info": (
+        get_design_info,
+        ("k_subgrade_mpa_m", "k_subgrade_pci", "W18", "R", "ZR", "Sc_ksc", "Cd", "J"),
+        {"k": ("k_effective_mpa_m",), "thickness": ("D_design_cm", "D_design_in")},
+    ),
+    "diagram": (
+        render_diagram_stage,
+        ("layers",),
+        {"thickness": ("D_design_cm", "D_design_in"),
+         "design_info": ("D_design_cm", "D_design_in", "k_subgrade_mpa_m", "k_subgrade_pci",
+                         "k_effective_mpa_m", "W18", "R", "ZR", "Sc_ksc", "Cd", "J")},
+    ),
+    "summary": (
+        build_summary_stage,
+        ("layers",),
+        {"thickness": ("D_design_cm", "D_design_in")},
+    ),
+}
+
+
+def _freeze(value):
+    """แปลง list / dict เป็น tuple เพื่อใช้เป็นส่วนหนึ่งของ key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def get_stage_arguments(stage, inputs, results):
+    """ข้อมูลนำเข้าและค่าจาก stage ก่อนหน้าเฉพาะที่ stage ใช้ (dict, [dict, ...])"""
+    _, input_names, upstream = STAGE_GRAPH[stage]
+    stage_inputs = {name: inputs[name] for name in input_names}
+    stage_upstream = [{name: results[up][name] for name in names} for up, names in upstream.items()]
+    return stage_inputs, stage_upstream
+
+
+def get_stage_key(stage, inputs, results):
+    """Key ของ stage ที่เปลี่ยนเฉพาะเมื่อค่าที่ stage ใช้เปลี่ยน (hashable)"""
+    stage_inputs, stage_upstream = get_stage_arguments(stage, inputs, results)
+    return stage, _freeze(stage_inputs), _freeze(stage_upstream)
+
+
+def get_affected_stages(changed_inputs):
+    """
+    Stage ที่อาจต้องคำนวณใหม่เมื่อข้อมูลนำเข้าชื่อ changed_inputs เปลี่ยน
+    (รวม stage ถัดไปทั้งหมด ค่าจริงที่ต้องคำนวณใหม่อาจน้อยกว่านี้เพราะ key ดูที่ค่าผลลัพธ์)
+    """
+    changed_inputs = set(changed_inputs)
+    affected = []
+    for stage, (_, input_names, upstream) in STAGE_GRAPH.items():
+        if changed_inputs & set(input_names) or set(upstream) & set(affected):
+            affected.append(stage)
+    return affected
+
+
+def call_stage(stage, stage_inputs, stage_upstream):
+    """เรียกฟังก์ชันของ stage"""
+    return STAGE_GRAPH[stage][0](stage_inputs, *stage_upstream)
+
+
+def run_stages(inputs, stages=None, run_stage=None):
+    """
+    คำนวณ stage ตามลำดับของ STAGE_GRAPH
+
+    Parameters:
+        stages: stage ที่ต้องการ (None = ทั้งหมด) stage ก่อนหน้าที่จำเป็นจะถูกคำนวณด้วย
+        run_stage: ฟังก์ชัน (stage, key, stage_inputs, stage_upstream) → ผลลัพธ์
+            ใช้แทน call_stage เพื่อ cache ผลตาม key (None = คำนวณทุกครั้ง)
+
+    Returns:
+        dict: stage → ผลลัพธ์
+    """
+    needed = set(STAGE_GRAPH if stages is None else stages)
+    for stage in reversed(list(STAGE_GRAPH)):
+        if stage in needed:
+            needed.update(STAGE_GRAPH[stage][2])
+
+    results = {}
+    for stage in STAGE_GRAPH:
+        if stage not in needed:
+            continue
+        stage_inputs, stage_upstream = get_stage_arguments(stage, inputs, results)
+        if run_stage is None:
+            results[stage] = call_stage(stage, stage_inputs, stage_upstream)
+        else:
+            results[stage] = run_stage(stage, get_stage_key(stage, inputs, results), stage_inputs, stage_upstream)
+    return results
+
+
+def run_rigid_pipeline(scenario, render=False):
+    """
+    รันทุกขั้นตอนของการออกแบบสำหรับ scenario เดียว
+
+    Returns:
+        dict: inputs, k, thickness, design_info และ diagram_png (bytes เมื่อ render = True)
+    """
+    inputs = prepare_inputs(scenario)
+    results = run_stages(inputs, stages=["design_info", "diagram"] if render else ["design_info"])
+
+    result = {"inputs": inputs, **results}
+    if render:
+        if result["diagram"] is None:
+            raise ValueError("ไม่สามารถวาดรูปได้เนื่องจากหาความหนา PCC ไม่ได้")
+        result["diagram_png"] = result.pop("diagram")
+    return result
+
+
+# =============================================
+# Pavement Structure Diagram
+# =============================================
+def _texture_points(x0, n_x, dx, y0, n_y, dy):
+    """ตำแหน่งจุด texture แบบตาราง (n_x × n_y) เรียงตามลำดับเดียวกับ loop เดิม (x นอก, y ใน)"""
+    j, k = np.meshgrid(np.arange(n_x), np.arange(n_y), indexing='ij')
+    return x0 + j * dx, y0 - k * dy, j, k
+
+
+def draw_structure_diagram(active_layers, design_info):
+    """
+    วาดรูปโครงสร้างชั้นทางและคืนค่าเป็นภาพ PNG (bytes)
+
+    Texture ของแต่ละชั้นวาดเป็น Line2D เดียว (marker อย่างเดียว) แทนการ plot ทีละจุด
+    ใช้ Figure โดยตรง (ไม่ผ่าน pyplot) จึงวาดใน process/thread ใดก็ได้โดยไม่ต้องมีหน้าจอ
+    """
+    info = design_info
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
+    ax.set_xlim(0, 14)
+
+    scale_factor = 0.12  # Scale for cm visualization
+    base_y = 9
+
+    # Draw title
+    ax.text(7, 9.8, "Rigid Pavement Structure (AASHTO 1993)",
+            fontsize=16, fontweight='bold', ha='center', va='center')
+    ax.text(7, 9.4, f"PCC Thickness = {info['D_design_cm']:.1f} cm ({info['D_design_in']:.2f} in)",
+            fontsize=12, ha='center', va='center')
+
+    current_y = base_y
+
+    # Draw each layer
+    for i, layer in enumerate(active_layers):
+        height = layer["thickness_cm"] * scale_factor
+
+        rect = FancyBboxPatch(
+            (2, current_y - height), 10, height,
+            boxstyle="round,pad=0.02,rounding_size=0.1",
+            facecolor=layer["color"],
+            edgecolor='black',
+            linewidth=2,
+            alpha=0.9
+        )
+        ax.add_patch(rect)
+
+        # Add texture patterns
+        if "PCC" in layer["material"]:
+            x, y, j, k = _texture_points(2.2, int(10/0.5), 0.5, current_y - 0.15, max(1, int(height/0.3)), 0.3)
+            checker = (j + k) % 2 == 0
+            ax.plot(x[checker], y[checker], 'o', linestyle='none',
+                    color='darkgray', markersize=2, alpha=0.5)
+        elif "Crushed" in layer["material"] or "Granular" in layer["material"]:
+            x, y, _, _ = _texture_points(2.5, 20, 0.5, current_y - 0.2, max(1, int(height/0.4)), 0.4)
+            jitter = np.random.RandomState(42 + i).uniform(size=x.shape + (2,))
+            ax.plot((x + jitter[..., 0] * 0.2 - 0.1).ravel(), (y + jitter[..., 1] * 0.1 - 0.05).ravel(),
+                    '.', linestyle='none', color='saddlebrown', markersize=3, alpha=0.4)
+
+        mid_y = current_y - height/2
+
+        # Layer name (left side)
+        ax.annotate(layer['name_short'], xy=(1.8, mid_y), ha='right', va='center',
+                    fontsize=11, fontweight='bold')
+
+        # Dimension lines (right side)
+        ax.annotate('', xy=(12.3, current_y), xytext=(12.3, current_y - height),
+                    arrowprops=dict(arrowstyle='<->', color='red', lw=1.5))
+
+        # Show thickness in cm (in)
+        ax.text(12.8, mid_y, f'{layer["thickness_cm"]:.1f} cm',
+                fontsize=11, fontweight='bold', va='center', color='red')
+        ax.text(13.6, mid_y, f'({layer["thickness_in"]:.2f} in)',
+                fontsize=9, va='center', color='darkred')
+
+        # Modulus annotation in MPa (psi)
+        if layer["modulus_mpa"] > 0:
+            if layer["modulus_mpa"] >= 1000:
+                mod_text = f'E = {layer["modulus_mpa"]/1000:.1f} GPa'
+            else:
+                mod_text = f'E = {layer["modulus_mpa"]:.0f} MPa'
+            ax.text(7, mid_y, mod_text, fontsize=9, ha='center', va='center',
+                   style='italic', alpha=0.8,
+                   bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.7))
+
+        current_y -= height
+
+    # Draw subgrade
+    subgrade_height = 1.5
+    rect_sub = FancyBboxPatch(
+        (2, current_y - subgrade_height), 10, subgrade_height,
+        boxstyle="round,pad=0.02,rounding_size=0.1",
+        facecolor='#8B4513',
+        edgecolor='black',
+        linewidth=2,
+        alpha=0.7
+    )
+    ax.add_patch(rect_sub)
+
+    x, y, _, _ = _texture_points(2.3, 25, 0.4, current_y - 0.25, 3, 0.5)
+    jitter = np.random.RandomState(123).uniform(size=x.shape + (2,))
+    ax.plot((x + jitter[..., 0] * 0.1 - 0.05).ravel(), (y + jitter[..., 1] * 0.1 - 0.05).ravel(),
+            '.', linestyle='none', color='#654321', markersize=2, alpha=0.5)
+
+    ax.text(1.8, current_y - subgrade_height/2, "Subgrade",
+            ha='right', va='center', fontsize=11, fontweight='bold')
+    ax.text(7, current_y - subgrade_height/2,
+            f"k = {info['k_subgrade_mpa_m']:.1f} MPa/m ({info['k_subgrade_pci']:.1f} pci)",
+            ha='center', va='center', fontsize=9, style='italic',
+            bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.7))
+
+    # Total thickness dimension
+    ax.annotate('', xy=(0.8, base_y), xytext=(0.8, current_y),
+                arrowprops=dict(arrowstyle='<->', color='blue', lw=2))
+    total_cm = sum(l["thickness_cm"] for l in active_layers)
+    ax.text(0.5, (base_y + current_y)/2, f'Total\n{total_cm:.1f} cm',
+            fontsize=10, ha='center', va='center', fontweight='bold', color='blue',
+            bbox=dict(boxstyle='round,pad=0.3', facecolor='lightyellow', alpha=0.9))
+
+    # Design info box
+    info_text = (
+        f"Design Parameters:\n"
+        f"ESAL = {info['W18']:,.0f}\n"
+        f"R = {info['R']}%, ZR = {info['ZR']:.3f}\n"
+        f"Sc' = {info['Sc_ksc']} ksc\n"
+        f"k-eff = {info['k_effective_mpa_m']:.1f} MPa/m\n"
+        f"Cd = {info['Cd']}, J = {info['J']}"
+    )
+    ax.text(13.8, base_y - 1, info_text, fontsize=8, va='top', ha='left',
+            bbox=dict(boxstyle='round,pad=0.4', facecolor='#E8F4FD',
+                     edgecolor='#3498db', alpha=0.9))
+
+    ax.set_ylim(current_y - subgrade_height - 0.5, 10.2)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_facecolor('#FAFAFA')
+
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    # zlib ระดับ 1: ภาพเหมือนเดิมทุก pixel แต่เข้ารหัสเร็วกว่าค่าเริ่มต้นหลายเท่า
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight', pil_kwargs={"compress_level": 1})
+    return buffer.getvalue()
@@ -0,0 +1,154 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Reliability Analysis
+วิเคราะห์ความน่าเชื่อถือของแผ่นพื้นคอนกรีตด้วย Monte Carlo Simulation
+
+ตัวแปรสุ่ม (W18, D, Sc, Ec, k, J, Cd) กำหนดเป็นการแจกแจงรูปแบบเดียวกับ flexible_reliability เช่น
+    {"dist": "normal", "mean": 650, "std": 50}
+    {"dist": "lognormal", "mean": 20e6, "cov": 0.30}
+    {"dist": "uniform", "low": 3.0, "high": 3.4}
+หรือเป็นตัวเลขเดี่ยว (ค่าคงที่) หน่วย: D (นิ้ว), Sc และ Ec (psi), k (pci)
+
+Capacity คำนวณจากสมการเดียวกับ calculate_aashto_rigid_w18 (calculate_log_W18_rigid_array)
+ที่ ZR = 0 ทีละ chunk แบบ Vectorized
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from flexible_reliability import DEFAULT_CHUNK_SIZE, sample_distribution
+from rigid_engine import calculate_log_W18_rigid_array
+
+
+# ลำดับการสุ่มตัวแปร (คงที่ เพื่อให้ผลเหมือนเดิมเมื่อใช้ seed เดิม)
+RIGID_RANDOM_VARIABLES = ("W18", "Sc", "Ec", "k", "J", "Cd")
+
+
+def _simulate_chunk(task):
+    """
+    จำลองหนึ่ง chunk และคืนจำนวนตัวอย่างที่รองรับ W₁₈ ได้ ของแต่ละความหนา
+    (ฟังก์ชันระดับ module เพื่อให้ส่งไปยัง process อื่นได้)
+
+    D_values = None: สุ่ม D จาก D โดยตรง (คืน array 1 ค่า)
+    D_values เป็น array: D = D_values + ค่าที่สุ่มจาก D (ความคลาดเคลื่อนจากความหนาที่กำหนด)
+    ทุกความหนาใช้ตัวอย่างชุดเดียวกัน (common random numbers) เส้นโค้งจึงเรียบ
+    """
+    seed_sequence, size, variables, D, D_values, delta_PSI, Pt, model_std = task
+    rng = np.random.default_rng(seed_sequence)
+
+    W18, Sc, Ec, k, J, Cd = (sample_distribution(variables[name], size, rng) for name in RIGID_RANDOM_VARIABLES)
+    D_sample = sample_distribution(D, size, rng)
+    model_error = rng.normal(0.0, model_std, size) if model_std > 0 else 0.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_W18_demand = np.log10(W18) - model_error
+
+    D_list = [D_sample] if D_values is None else [D_value + D_sample for D_value in D_values]
+    counts = np.empty(len(D_list), dtype=np.int64)
+    for i, D_i in enumerate(D_list):
+        log_W18_capacity = calculate_log_W18_rigid_array(D_i, 0.0, 0.0, delta_PSI, Sc, Cd, J, Ec, k, Pt)
+        # ตำแหน่งที่อยู่นอกโดเมนของสมการ (NaN) นับเป็นไม่ผ่าน
+        counts[i] = np.count_nonzero(log_W18_capacity >= log_W18_demand)
+    return counts
+
+
+def _run_chunks(n_samples, chunk_size, seed, n_workers, task_args):
+    """แบ่งตัวอย่างเป็น chunk รันแบบขนาน และรวมจำนวนที่ผ่านของทุก chunk"""
+    n_samples = int(n_samples)
+    n_chunks = max(1, math.ceil(n_samples / chunk_size))
+    sizes = [chunk_size] * (n_chunks - 1) + [n_samples - chunk_size * (n_chunks - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    tasks = [(s, size) + task_args for s, size in zip(seeds, sizes)]
+
+    if n_workers > 1 and n_chunks > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            return sum(executor.map(_simulate_chunk, tasks))
+    return sum(map(_simulate_chunk, tasks))
+
+
+def _summarize(n_survived, n_samples):
+    """Reliability, std error, ช่วงความเชื่อมั่น 95% และ beta จากจำนวนที่ผ่าน"""
+    reliability = np.asarray(n_survived) / n_samples
+    std_error = np.sqrt(reliability * (1 - reliability) / n_samples)
+    clipped = np.clip(reliability, 1e-300, 1 - 1e-16)
+    beta = np.where((reliability > 0) & (reliability < 1),
+                    np.vectorize(NormalDist().inv_cdf)(clipped),
+                    np.copysign(np.inf, reliability - 0.5))
+    return reliability, std_error, beta
+
+
+def monte_carlo_rigid_reliability(W18, D, Sc, Ec, k, J, Cd, delta_PSI, Pt=None, n_samples=1_000_000,
+                                  chunk_size=DEFAULT_CHUNK_SIZE, seed=None, n_workers=1, model_std=0.0):
+    """
+    ประมาณความน่าจะเป็นที่แผ่นพื้นคอนกรีตรองรับปริมาณจราจรออกแบบได้ P[W₁₈ capacity ≥ W₁₈]
+
+    Parameters:
+        W18, D, Sc, Ec, k, J, Cd: การแจกแจงของแต่ละตัวแปร (หรือค่าคงที่)
+        delta_PSI, Pt: ค่าคงที่ (Pt = None ใช้ 4.5 - ΔPSI)
+        chunk_size: จำนวนตัวอย่างต่อ chunk (จำกัดหน่วยความจำที่ใช้)
+        seed: seed ของ random stream (ผลลัพธ์เหมือนเดิมทุกครั้งไม่ขึ้นกับ n_workers)
+        n_workers: จำนวน process ที่ใช้คำนวณ chunk พร้อมกัน
+        model_std: ส่วนเบี่ยงเบนมาตรฐานของ log W₁₈ จากตัวสมการเอง
+
+    Returns:
+        dict: reliability, std_error, ci_95, beta, n_samples, n_survived
+        (รูปแบบเดียวกับ flexible_reliability.monte_carlo_reliability)
+    """
+    variables = {"W18": W18, "Sc": Sc, "Ec": Ec, "k": k, "J": J, "Cd": Cd}
+    n_survived = int(_run_chunks(n_samples, chunk_size, seed, n_workers,
+                                 (variables, D, None, delta_PSI, Pt, model_std))[0])
+
+    reliability, std_error, beta = (float(x) for x in _summarize(n_survived, int(n_samples)))
+    return {
+        'reliability': reliability,
+        'std_error': std_error,
+        'ci_95': (reliability - 1.96 * std_error, reliability + 1.96 * std_error),
+        'beta': beta,
+        'n_samples': int(n_samples),
+        'n_survived': n_survived,
+    }
+
+
+def rigid_reliability_curve(W18, D_values, Sc, Ec, k, J, Cd, delta_PSI, Pt=None, D_tolerance=0.0,
+                            n_samples=1_000_000, chunk_size=DEFAULT_CHUNK_SIZE, seed=None, n_workers=1,
+                            model_std=0.0):
+    """
+    Reliability เทียบกับความหนาแผ่นพื้น (empirical reliability curve)
+
+    Parameters:
+        D_values: ความหนาที่พิจารณา (นิ้ว)
+        D_tolerance: การแจกแจงของความคลาดเคลื่อนความหนาจากการก่อสร้าง (นิ้ว, ค่าเฉลี่ยควรเป็น 0)
+        พารามิเตอร์อื่นเหมือน monte_carlo_rigid_reliability
+
+    Returns:
+        dict ของ array ตาม D_values: D, reliability, std_error, beta และ n_samples
+    """
+    D_values = np.asarray(D_values, dtype=float).ravel()
+    variables = {"W18": W18, "Sc": Sc, "Ec": Ec, "k": k, "J": J, "Cd": Cd}
+    n_survived = _run_chunks(n_samples, chunk_size, seed, n_workers,
+                             (variables, D_tolerance, D_values, delta_PSI, Pt, model_std))
+
+    reliability, std_error, beta = _summarize(n_survived, int(n_samples))
+    return {
+        'D': D_values,
+        'reliability': reliability,
+        'std_error': std_error,
+        'beta': beta,
+        'n_samples': int(n_samples),
+    }
+
+
+def find_thickness_for_reliability(curve, target_reliability):
+    """
+    ความหนา (นิ้ว) ที่ให้ reliability ตามเป้าหมาย (0 - 1) โดย interpolation บนเส้นโค้ง
+    คืนค่า NaN เมื่อเป้าหมายอยู่นอกช่วงของเส้นโค้ง
+    """
+    D, reliability = curve['D'], curve['reliability']
+    order = np.argsort(D)
+    D, reliability = D[order], np.maximum.accumulate(reliability[order])
+    if target_reliability < reliability[0] or target_reliability > reliability[-1]:
+        return np.nan
+    return float(np.interp(target_reliability, reliability, D))
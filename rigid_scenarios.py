@@ -0,0 +1,155 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Scenario Runner CLI
+รัน rigid_pipeline กับไฟล์ scenario ทั้งหมดในโฟลเดอร์แบบขนาน (ไม่ต้องเปิดหน้าโปรแกรม)
+
+ไฟล์ scenario (.json / .yaml / .yml) หนึ่งไฟล์ต่อหนึ่งทางเลือก มีข้อมูลตาม DEFAULT_SCENARIO
+ของ rigid_pipeline (ไม่ระบุ = ค่าเริ่มต้นของโปรแกรม) เช่น
+
+    {"W18": 2e7, "R": 95, "Sc_ksc": 50,
+     "layers": [{"material": "PCC (Portland Cement Concrete)", "thickness_cm": 25},
+                {"material": "Cement Treated Base (CTB)", "thickness_cm": 20}]}
+
+ผลลัพธ์หนึ่งแถวต่อ scenario เขียนเป็น JSON Lines (.jsonl) หรือ CSV (.csv) ตามนามสกุลไฟล์
+scenario ที่คำนวณไม่ได้จะมีข้อความในคอลัมน์ error แทนการหยุดทั้งชุด
+ไฟล์ YAML ต้องติดตั้ง PyYAML
+
+ตัวอย่าง:
+    python rigid_scenarios.py scenarios/ results.jsonl --workers 8
+    python rigid_scenarios.py scenarios/ results.csv --render figures/
+"""
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from rigid_engine import THICKNESS_OK, THICKNESS_BELOW_RANGE
+from rigid_pipeline import run_rigid_pipeline
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+SCENARIO_EXTENSIONS = (".json", ".yaml", ".yml")
+
+# ค่าที่บันทึกในผลลัพธ์ของแต่ละขั้นตอน
+RECORD_FIELDS = {
+    "inputs": ("W18", "R", "ZR", "So", "delta_PSI", "Cd", "J", "Sc_psi", "Ec_psi", "k_subgrade_pci", "LS", "D_SG_ft"),
+    "k": ("k_composite_pci", "k_effective_pci"),
+    "thickness": ("status", "D_required_cm", "D_design_cm", "W18_capacity"),
+}
+
+
+def find_scenario_files(directory):
+    """ไฟล์ scenario ในโฟลเดอร์ เรียงตามชื่อไฟล์"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(SCENARIO_EXTENSIONS)
+    )
+
+
+def load_scenario(path):
+    """อ่านไฟล์ scenario เป็น dict"""
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            scenario = json.load(f)
+        elif yaml is None:
+            raise ImportError("ต้องติดตั้ง PyYAML เพื่ออ่านไฟล์ YAML: pip install pyyaml")
+        else:
+            scenario = yaml.safe_load(f)
+
+    if not isinstance(scenario, dict):
+        raise ValueError("ไฟล์ scenario ต้องเป็น object ของข้อมูลนำเข้า")
+    return scenario
+
+
+def run_scenario_file(task):
+    """
+    รัน scenario หนึ่งไฟล์และคืนผลหนึ่งแถว
+    (ฟังก์ชันระดับ module เพื่อให้ส่งไปยัง process อื่นได้)
+    """
+    path, render_dir = task
+    name = os.path.splitext(os.path.basename(path))[0]
+    record = {"scenario": name, "file": path}
+
+    try:
+        result = run_rigid_pipeline(load_scenario(path), render=render_dir is not None)
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        return record
+
+    for stage, fields in RECORD_FIELDS.items():
+        record.update({field: result[stage][field] for field in fields})
+    record["passed"] = record["status"] in (THICKNESS_OK, THICKNESS_BELOW_RANGE)
+
+    if render_dir is not None:
+        record["diagram"] = os.path.join(render_dir, f"{name}.png")
+        with open(record["diagram"], "wb") as f:
+            f.write(result["diagram_png"])
+    record["error"] = None
+    return record
+
+
+def run_scenarios(input_dir, output_path, n_workers=1, render_dir=None):
+    """
+    รันทุก scenario ในโฟลเดอร์ด้วย process pool และเขียนผลหนึ่งแถวต่อ scenario
+
+    Parameters:
+        n_workers: จำนวน process (1 = รันใน process ปัจจุบัน)
+        render_dir: โฟลเดอร์สำหรับรูปโครงสร้างชั้นทาง (None = ไม่วาดรูป)
+
+    Returns:
+        tuple: (จำนวน scenario, จำนวนที่หาความหนาได้, จำนวนที่มีข้อผิดพลาด)
+    """
+    paths = find_scenario_files(input_dir)
+    if render_dir is not None:
+        os.makedirs(render_dir, exist_ok=True)
+    tasks = [(path, render_dir) for path in paths]
+
+    if n_workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (n_workers * 4))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            records = list(executor.map(run_scenario_file, tasks, chunksize=chunksize))
+    else:
+        records = list(map(run_scenario_file, tasks))
+
+    if output_path.lower().endswith(".csv"):
+        pd.DataFrame.from_records(records).to_csv(output_path, index=False)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            for record in records:
+                # NaN / inf ไม่ใช่ JSON มาตรฐาน เขียนเป็น null
+                record = {key: None if isinstance(value, float) and not math.isfinite(value) else value
+                          for key, value in record.items()}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    n_failed = sum(record["error"] is not None for record in records)
+    n_passed = sum(bool(record.get("passed")) for record in records)
+    return len(records), n_passed, n_failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="AASHTO 1993 Rigid Pavement - run a directory of design scenarios"
+    )
+    parser.add_argument("input_dir", help="โฟลเดอร์ไฟล์ scenario (.json / .yaml)")
+    parser.add_argument("output", help="ไฟล์ผลลัพธ์ (.jsonl หรือ .csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="จำนวน process (ค่าเริ่มต้น %(default)s)")
+    parser.add_argument("--render", metavar="DIR", default=None,
+                        help="วาดรูปโครงสร้างชั้นทางของแต่ละ scenario เป็น PNG ในโฟลเดอร์นี้")
+    args = parser.parse_args(argv)
+
+    n_scenarios, n_passed, n_failed = run_scenarios(args.input_dir, args.output,
+                                                    n_workers=args.workers, render_dir=args.render)
+    print(f"{n_scenarios:,} scenarios: {n_passed:,} designed, {n_scenarios - n_passed - n_failed:,} "
+          f"out of range, {n_failed:,} errors -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+AASHTO 1993 Rigid Pavement Design - Seasonal Effective Modulus of Subgrade Reaction
+คำนวณ k ประสิทธิผล (Effective k) จาก MR ของดินเดิมรายเดือน/รายครึ่งเดือน (AASHTO Table 3.2)
+
+Composite k∞ : k∞ = (MR/19.4) × [1 + (D_SB/38)(E_SB/MR)^(1/3)]^2.32   (สูตรเดียวกับ Graph-k.py)
+               ปรับด้วยความลึกถึงชั้นหินแข็ง (Figure 3.4) เมื่อกำหนด D_SG
+Relative damage: u_r = (D^0.75 - 0.39 × k^0.25)^3.42
+Effective k    : k_eff = [(D^0.75 - ū_r^(1/3.42)) / 0.39]^4 แล้วปรับด้วย Loss of Support
+
+u_r ขึ้นกับความหนาแผ่นคอนกรีต D จึงต้องคำนวณ k ประสิทธิผลแยกตาม D ที่พิจารณา
+"""
+
+import numpy as np
+
+from rigid_engine import (
+    calculate_effective_k_array,
+    calculate_rigid_foundation_k_array,
+    find_required_thickness_array,
+    THICKNESS_OK,
+    THICKNESS_BELOW_RANGE,
+)
+
+
+# จำนวนช่วงเวลาที่รองรับ (รายเดือน / รายครึ่งเดือน)
+SEASON_COUNTS = (12, 24)
+
+
+def calculate_composite_k_inf_array(MR, D_SB, E_SB):
+    """
+    Composite k∞ (pci) แบบ Vectorized จาก MR ดินเดิม (psi), ความหนา (นิ้ว) และโมดูลัส (psi) ของรองพื้นทาง
+    ถ้าไม่มีรองพื้นทาง (D_SB ≤ 0 หรือ E_SB ≤ 0) ใช้ k = MR/19.4
+    """
+    MR, D_SB, E_SB = (np.asarray(x, dtype=float) for x in (MR, D_SB, E_SB))
+    k_roadbed = MR / 19.4
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = 1 + (D_SB / 38) * (E_SB / MR) ** (1 / 3)
+        k_inf = k_roadbed * factor ** 2.32
+    return np.where((D_SB > 0) & (E_SB > 0), k_inf, k_roadbed)
+
+
+def calculate_relative_damage_rigid(D, k):
+    """Relative damage u_r = (D^0.75 - 0.39 × k^0.25)^3.42 (D นิ้ว, k pci) NaN เมื่อฐานไม่เป็นบวก"""
+    D, k = np.asarray(D, dtype=float), np.asarray(k, dtype=float)
+    with np.errstate(invalid='ignore'):
+        base = D ** 0.75 - 0.39 * k ** 0.25
+        return np.where(base > 0, np.abs(base) ** 3.42, np.nan)
+
+
+def calculate_effective_k_seasonal_array(MR_seasonal, D_SB, E_SB, D, LS=0.0, D_SG=np.inf):
+    """
+    คำนวณ k ประสิทธิผลของหลายสายทางและหลายความหนาพร้อมกัน
+
+    Parameters:
+        MR_seasonal: array รูปร่าง (..., 12) หรือ (..., 24) ค่า MR ดินเดิม (psi) ของแต่ละช่วงเวลา
+        D_SB: ความหนารองพื้นทาง (นิ้ว) รูปร่าง (...)
+        E_SB: โมดูลัสรองพื้นทาง (psi) รูปร่าง (...) หรือ (..., ช่วงเวลา) สำหรับค่าตามฤดูกาล
+        D: ความหนาแผ่นคอนกรีตที่พิจารณา (นิ้ว) รูปร่าง (...)
+            เช่น MR_seasonal[:, None, :] กับ D[None, :] ให้ผลรูปร่าง (สายทาง, ความหนา)
+        LS: Loss of Support
+        D_SG: ความลึกถึงชั้นหินแข็ง (ฟุต) รูปร่าง (...) (inf = ไม่มี)
+
+    Returns:
+        tuple: (k_eff หลังปรับ LS, ū_r)
+    """
+    MR_seasonal = np.asarray(MR_seasonal, dtype=float)
+    if MR_seasonal.shape[-1] not in SEASON_COUNTS:
+        raise ValueError(f"ต้องมีค่า MR 12 หรือ 24 ค่าต่อสายทาง (ได้รับ {MR_seasonal.shape[-1]})")
+
+    D = np.asarray(D, dtype=float)
+    E_SB = np.asarray(E_SB, dtype=float)
+    if E_SB.ndim == 0 or E_SB.shape[-1] != MR_seasonal.shape[-1]:
+        E_SB = E_SB[..., None]
+
+    k_seasonal = calculate_composite_k_inf_array(MR_seasonal, np.asarray(D_SB, dtype=float)[..., None], E_SB)
+    k_seasonal = calculate_rigid_foundation_k_array(k_seasonal, MR_seasonal, np.asarray(D_SG, dtype=float)[..., None])
+    u_r_mean = calculate_relative_damage_rigid(D[..., None], k_seasonal).mean(axis=-1)
+
+    with np.errstate(invalid='ignore'):
+        base = D ** 0.75 - u_r_mean ** (1 / 3.42)
+        k_eff = np.where(base > 0, (np.abs(base) / 0.39) ** 4, np.nan)
+    return calculate_effective_k_array(k_eff, LS), u_r_mean
+
+
+def find_required_thickness_seasonal_array(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, MR_seasonal, D_SB, E_SB,
+                                           LS=0.0, D_SG=np.inf, D_initial=10.0, tol=0.01, max_iter=20):
+    """
+    หาความหนา PCC ที่ต้องการเมื่อ k ประสิทธิผลขึ้นกับความหนา (วนซ้ำ D → k_eff(D) → D)
+
+    k_eff เปลี่ยนช้าตาม D จึงลู่เข้าภายในไม่กี่รอบ ทุกสายทางคำนวณพร้อมกัน
+    พารามิเตอร์การออกแบบมีรูปร่าง (...) และ MR_seasonal รูปร่าง (..., ช่วงเวลา)
+
+    Returns:
+        tuple: (D, k_eff, status, converged)
+        status ตามค่าคงที่ THICKNESS_* ของ rigid_engine, converged = False เมื่อ D ยังไม่นิ่งหรือหาไม่ได้
+    """
+    MR_seasonal = np.asarray(MR_seasonal, dtype=float)
+    D = np.broadcast_to(np.asarray(D_initial, dtype=float), MR_seasonal.shape[:-1]).copy()
+    converged = np.zeros(D.shape, dtype=bool)
+
+    for _ in range(max_iter):
+        k_eff, _ = calculate_effective_k_seasonal_array(MR_seasonal, D_SB, E_SB, D, LS, D_SG)
+        D_next, status, _ = find_required_thickness_array(W18, ZR, So, delta_PSI, Sc, Cd, J, Ec, k_eff)
+        solved = (status == THICKNESS_OK) | (status == THICKNESS_BELOW_RANGE)
+        converged = solved & (np.abs(D_next - D) < tol)
+        D = np.where(solved, D_next, D)
+        if np.all(converged | ~solved):
+            break
+
+    k_eff, _ = calculate_effective_k_seasonal_array(MR_seasonal, D_SB, E_SB, D, LS, D_SG)
+    return np.where(solved, D, np.nan), k_eff, status, converged
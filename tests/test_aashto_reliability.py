@@ -0,0 +1,16 @@
+import numpy as np
+
+import flexible_engine
+import rigid_pipeline
+from aashto_reliability import ZR_TABLE, get_ZR_array
+
+
+def test_ZR_table_is_shared():
+    assert flexible_engine.ZR_TABLE is ZR_TABLE
+
+
+def test_get_ZR_array_matches_table_and_interpolates():
+    levels = sorted(ZR_TABLE)
+    np.testing.assert_array_equal(get_ZR_array(levels), [ZR_TABLE[level] for level in levels])
+    assert get_ZR_array(55) == (ZR_TABLE[50] + ZR_TABLE[60]) / 2
+    assert rigid_pipeline.prepare_inputs({"R": 55})["ZR"] == float(get_ZR_array(55))
@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+
+from flexible_batch import main, run_batch
+
+
+# แถวที่ 1 โครงสร้างเดิมเพียงพอ, แถวที่ 2 ต้องเสริมผิว, แถวที่ 3 จราจรสูงเกินจนหา SN ไม่ได้
+SURVEY = pd.DataFrame({
+    "W18": [1e6, 1e7, 1e30], "reliability": 90, "S0": 0.45, "Pi": 4.2, "pt": 2.5, "MR": 5000,
+    "a1": 0.44, "D1_cm": [30, 5, 5], "CF1": 0.8, "a2": 0.14, "D2_cm": 20,
+})
+
+
+@pytest.mark.parametrize("overlay", [False, True])
+def test_run_batch_counts_unconverged_rows_separately(tmp_path, overlay):
+    SURVEY.to_csv(tmp_path / "in.csv", index=False)
+    assert run_batch(tmp_path / "in.csv", tmp_path / "out.csv", chunksize=2, overlay=overlay) == (3, 1, 1)
+
+
+def test_overlay_summary_excludes_unconverged_rows(tmp_path, capsys):
+    SURVEY.to_csv(tmp_path / "in.csv", index=False)
+    main([str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), "--overlay"])
+    assert "1 need overlay, 1 adequate, 1 not converged" in capsys.readouterr().out
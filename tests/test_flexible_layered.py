@@ -0,0 +1,46 @@
+import numpy as np
+
+from flexible_engine import MATERIAL_DATABASE, calculate_SN, cm_to_inch, get_drainage_coefficient_array
+from flexible_layered import check_layered_design, enumerate_material_combinations, round_up_thickness
+
+
+PARAMS = {'ZR': -1.282, 'S0': 0.45, 'MR': 5000.0, 'delta_PSI': 1.7}
+
+
+def test_layered_check_uses_drainage_coefficient():
+    drainage = {'drainage_quality': 'Poor', 'percent_saturation': 30.0}
+    layers = [
+        {'name': 'AC', 'a': 0.40, 'D_inch': cm_to_inch(10), 'm': 1.0},
+        {'name': 'Base', 'a': 0.13, 'D_inch': cm_to_inch(20), **drainage},
+        {'name': 'Subbase', 'a': 0.10, 'D_inch': cm_to_inch(20), **drainage},
+    ]
+    SN_total, details = calculate_SN(layers)
+    m = float(get_drainage_coefficient_array('Poor', 30.0))
+    assert m < 1.0
+    assert details[1]['m'] == m
+
+    checks = check_layered_design(5e6, PARAMS, layers, 50750, 21750)
+    SN_cumulative = np.cumsum([d['SN_layer'] for d in details])
+    np.testing.assert_allclose([c['SN_provided'] for c in checks], SN_cumulative)
+    assert checks[-1]['SN_provided'] == SN_total
+
+
+def test_catalogue_drainage_override():
+    base = enumerate_material_combinations(5e6, PARAMS)
+    drained = enumerate_material_combinations(5e6, PARAMS, m=(None, 0.8, 0.8))
+
+    key = ["surface", "base", "subbase"]
+    merged = base.merge(drained, on=key, suffixes=("", "_m"))
+    assert len(merged) == len(base)
+    np.testing.assert_array_equal(merged["D1_cm"], merged["D1_cm_m"])
+    assert (merged["total_cm_m"] >= merged["total_cm"]).all()
+    assert (merged["total_cm_m"] > merged["total_cm"]).any()
+    assert len(MATERIAL_DATABASE["surface"]) * len(MATERIAL_DATABASE["base"]) \
+        * len(MATERIAL_DATABASE["subbase"]) == len(base)
+
+
+def test_round_up_thickness_zero_is_not_negative():
+    D = round_up_thickness(np.array([0.0, 1e-12, 2.0, 2.3]), 1.0)
+    np.testing.assert_array_equal(D, [0.0, 0.0, 2.0, 3.0])
+    assert not np.signbit(D).any()
+    assert f"{float(round_up_thickness(0.0, 2.5)):.1f}" == "0.0"
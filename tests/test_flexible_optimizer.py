@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from flexible_engine import MATERIAL_DATABASE, cm_to_inch
+from flexible_layered import check_layered_design
+from flexible_optimizer import (
+    find_layered_SN_by_material,
+    get_structure_candidates,
+    optimize_structure,
+    optimize_structures_batch,
+    select_pairs,
+)
+
+
+PARAMS = {'ZR': -1.282, 'S0': 0.45, 'MR': 5000.0, 'delta_PSI': 1.7}
+
+# ผิวทางราคาสูงมาก: ถ้าตรวจเพียง SN รวม โครงสร้างที่ถูกที่สุดจะใช้ผิวทางบางที่สุดซึ่งไม่ผ่าน SN1
+UNIT_PRICES = {
+    name: {"surface": 50000, "base": 1200, "subbase": 600}[key] * (1 + 0.15 * i)
+    for key in ("surface", "base", "subbase")
+    for i, name in enumerate(MATERIAL_DATABASE[key])
+}
+
+
+def layered_checks(row, W18_design):
+    layers = [
+        {'name': row[key], 'a': MATERIAL_DATABASE[key][row[key]]['a'],
+         'm': MATERIAL_DATABASE[key][row[key]]['m'], 'D_inch': cm_to_inch(row[f"{key}_D_cm"])}
+        for key in ("surface", "base", "subbase")
+    ]
+    return check_layered_design(
+        W18_design, PARAMS, layers,
+        MATERIAL_DATABASE["base"][row["base"]]["MR_psi"], MATERIAL_DATABASE["subbase"][row["subbase"]]["MR_psi"]
+    )
+
+
+@pytest.mark.parametrize("W18_design", [5e5, 5e6, 3e7])
+def test_optimized_structures_pass_layered_check(W18_design):
+    df = optimize_structure(W18_design, PARAMS, UNIT_PRICES)
+    assert len(df) > 0
+    for _, row in df.iterrows():
+        assert all(check['passed'] for check in layered_checks(row, W18_design))
+
+
+def test_batch_matches_single_design():
+    W18_design = np.array([5e5, 5e6, 3e7])
+    batch = optimize_structures_batch(W18_design, PARAMS['ZR'], PARAMS['S0'], PARAMS['MR'],
+                                      PARAMS['delta_PSI'], UNIT_PRICES, chunk_size=2)
+    assert batch["feasible"].all()
+
+    for W18, (_, row) in zip(W18_design, batch.iterrows()):
+        single = optimize_structure(W18, PARAMS, UNIT_PRICES, n_alternatives=0).iloc[0]
+        assert row["cost"] == single["cost"]
+        assert row["SN_required"] == layered_checks(single, W18)[2]['SN_required']
+
+
+def test_batch_matches_single_design_over_traffic_range():
+    W18_design = np.geomspace(1e5, 1e8, 25)
+    batch = optimize_structures_batch(W18_design, PARAMS['ZR'], PARAMS['S0'], PARAMS['MR'],
+                                      PARAMS['delta_PSI'], UNIT_PRICES)
+    single = [optimize_structure(W18, PARAMS, UNIT_PRICES, n_alternatives=0) for W18 in W18_design]
+    expected = [df["cost"].iloc[0] if len(df) else np.nan for df in single]
+    np.testing.assert_array_equal(batch["cost"].to_numpy(), expected)
+
+
+def test_batch_costs_only_frontier_pairs():
+    full = get_structure_candidates(UNIT_PRICES, prune=False)
+    pruned = get_structure_candidates(UNIT_PRICES)
+    SN1, _, _, _ = find_layered_SN_by_material(np.geomspace(1e5, 1e8, 50), PARAMS['ZR'], PARAMS['S0'],
+                                               PARAMS['MR'], PARAMS['delta_PSI'], pruned)
+    # ไม่ตัดคู่ที่ถูกครอบงำ: ทุกสายทางต้องคำนวณราคาทุกคู่ (เวลาเพิ่มขึ้นหลายสิบเท่า)
+    assert select_pairs(SN1, pruned).shape[1] * 10 < full["SN_12"].size
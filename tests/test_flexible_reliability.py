@@ -0,0 +1,23 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from flexible_reliability import form_reliability
+
+
+LAYERS = [
+    {"a": {"dist": "normal", "mean": 0.44, "std": 0.02}, "D_inch": 4.0, "m": 1.0},
+    {"a": 0.14, "D_inch": {"dist": "normal", "mean": 8.0, "std": 0.5}, "m": 1.0},
+    {"a": 0.11, "D_inch": 10.0, "m": 1.0},
+]
+
+
+def test_form_reliability_is_float_array():
+    W18 = {"dist": "lognormal", "mean": np.array([1e6, 5e6, 2e7]), "cov": 0.3}
+    MR = {"dist": "lognormal", "mean": 5000.0, "cov": 0.2}
+    result = form_reliability(W18, MR, LAYERS, 1.7)
+
+    assert result["reliability"].dtype == np.float64
+    assert result["converged"].all()
+    np.testing.assert_allclose(result["reliability"], [NormalDist().cdf(b) for b in result["beta"]],
+                               rtol=1e-12)
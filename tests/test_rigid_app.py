@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+from aashto_reliability import get_ZR_array
+
+
+APP_PATH = Path(__file__).resolve().parent.parent / "rigid-pave-aashto-v2.py"
+
+
+@pytest.mark.parametrize("R", [55, 97])
+def test_reliability_between_table_levels(R):
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120).run()
+    at.sidebar.slider[0].set_value(R).run()
+
+    assert not at.exception
+    assert any(f"(ZR) = {float(get_ZR_array(R)):.3f}" in str(m.value) for m in at.markdown)
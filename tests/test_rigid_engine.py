@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from rigid_engine import (
+    RIGID_FOUNDATION_CHART_EXAMPLE,
+    RIGID_FOUNDATION_COEFFICIENTS,
+    calculate_rigid_foundation_k_array,
+    fit_rigid_foundation_coefficients,
+    get_rigid_foundation_reference_points,
+)
+
+
+def test_rigid_foundation_fit_error():
+    k_inf, MR, D_SG, k_reference = get_rigid_foundation_reference_points()
+    k_fit = calculate_rigid_foundation_k_array(k_inf, MR, D_SG)
+
+    relative_error = np.abs(k_fit / k_reference - 1)
+    assert relative_error.max() < 0.02
+    assert np.sqrt(np.mean(relative_error ** 2)) < 0.005
+
+
+def test_rigid_foundation_coefficients_match_fit():
+    A, B = fit_rigid_foundation_coefficients(*get_rigid_foundation_reference_points())
+    assert (A, B) == pytest.approx(RIGID_FOUNDATION_COEFFICIENTS, abs=1e-4)
+
+
+def test_rigid_foundation_chart_example():
+    k_inf, MR, D_SG, k_chart = RIGID_FOUNDATION_CHART_EXAMPLE
+    assert float(calculate_rigid_foundation_k_array(k_inf, MR, D_SG)) == pytest.approx(k_chart, rel=0.03)
+
+
+def test_rigid_foundation_depth_limit():
+    k = calculate_rigid_foundation_k_array(200.0, 4000.0, [1, 3, 5, 9.9, 10, 15, np.inf, np.nan])
+    np.testing.assert_array_equal(k[4:], 200.0)
+    assert np.all(np.diff(k[:4]) < 0) and np.all(k[:4] > 200.0)
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from rigid_pipeline import prepare_inputs, run_rigid_pipeline
+from rigid_scenarios import run_scenarios
+
+yaml = pytest.importorskip("yaml")
+
+
+SCENARIO_YAML = """\
+W18: 3.0e7
+R: "95"
+Sc_ksc: 50
+layers:
+  - {material: "PCC (Portland Cement Concrete)", thickness_cm: 25}
+  - {material: "Cement Treated Base (CTB)", thickness_cm: "2.0e1"}
+"""
+
+
+def test_yaml_scenario_with_exponent_notation(tmp_path):
+    # PyYAML (YAML 1.1) อ่าน 3.0e7 เป็นข้อความ
+    assert yaml.safe_load(SCENARIO_YAML)["W18"] == "3.0e7"
+
+    scenarios = tmp_path / "scenarios"
+    scenarios.mkdir()
+    (scenarios / "exponent.yaml").write_text(SCENARIO_YAML, encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    n_scenarios, n_passed, n_failed = run_scenarios(str(scenarios), str(output), render_dir=str(tmp_path / "figures"))
+    assert (n_scenarios, n_passed, n_failed) == (1, 1, 0)
+
+    record = json.loads(output.read_text(encoding="utf-8"))
+    assert record["error"] is None
+    assert record["W18"] == 3.0e7
+    assert record["R"] == 95
+
+    expected = run_rigid_pipeline({"W18": 3.0e7, "R": 95, "Sc_ksc": 50, "layers": [
+        {"material": "PCC (Portland Cement Concrete)", "thickness_cm": 25},
+        {"material": "Cement Treated Base (CTB)", "thickness_cm": 20},
+    ]})
+    assert record["D_design_cm"] == expected["thickness"]["D_design_cm"]
+    assert (tmp_path / "figures" / "exponent.png").stat().st_size > 0
+
+
+@pytest.mark.parametrize("scenario", [
+    {"W18": "many"},
+    {"Sc_ksc": None},
+    {"LS": float("nan")},
+    {"layers": [{"material": "Granular Subbase", "thickness_cm": "thick"}]},
+])
+def test_prepare_inputs_rejects_non_numeric_values(scenario):
+    with pytest.raises(ValueError):
+        prepare_inputs(scenario)